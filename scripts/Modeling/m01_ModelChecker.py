@@ -8,4 +8,4 @@
 
 from modelChecker import modelChecker_UI
 
-modelChecker_UI.UI.show_UI()
+modelChecker_UI.run()
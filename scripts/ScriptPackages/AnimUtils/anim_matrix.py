@@ -0,0 +1,182 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   anim_matrix.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   变换矩阵与欧拉角的 numpy 计算，不依赖Maya，供动画工具共用。
+
+矩阵均为 Maya 的行向量约定 (world = local @ parentWorld)，形状为 (帧数, 4, 4)。
+旋转通道使用弧度，旋转顺序使用 Maya rotateOrder 的整数值。
+"""
+
+import numpy as np
+
+# Maya rotateOrder 整数值对应的轴顺序，先作用的轴在前
+ROTATE_ORDERS = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+# 位移和旋转通道顺序
+CHANNELS = ("tx", "ty", "tz", "rx", "ry", "rz")
+# 万向节锁判断阈值
+GIMBAL_EPSILON = 1e-9
+
+
+def axis_rotation(axis: int, angles: np.ndarray) -> np.ndarray:
+    """绕单个轴旋转的矩阵 (N, 3, 3)，axis 为 0/1/2 对应 x/y/z"""
+    c, s = np.cos(angles), np.sin(angles)
+    result = np.zeros((len(angles), 3, 3))
+    i, j = [a for a in range(3) if a != axis]
+    result[:, axis, axis] = 1.0
+    result[:, i, i] = c
+    result[:, j, j] = c
+    # 行向量约定下 x: [0,c,s][0,-s,c]，y: [c,0,-s][s,0,c]，z: [c,s,0][-s,c,0]
+    sign = -1.0 if axis == 1 else 1.0
+    result[:, i, j] = s * sign
+    result[:, j, i] = -s * sign
+    return result
+
+def euler_to_matrix(angles: np.ndarray, rotate_order: int = 0) -> np.ndarray:
+    """欧拉角 (N, 3) 转旋转矩阵 (N, 3, 3)"""
+    order = ["xyz".index(axis) for axis in ROTATE_ORDERS[rotate_order]]
+    result = axis_rotation(order[0], angles[:, order[0]])
+    for axis in order[1:]:
+        result = result @ axis_rotation(axis, angles[:, axis])
+    return result
+
+def matrix_to_euler(rotation: np.ndarray, rotate_order: int = 0) -> np.ndarray:
+    """旋转矩阵 (N, 3, 3) 转欧拉角 (N, 3)，万向节锁时第三个轴取 0"""
+    i, j, k = ["xyz".index(axis) for axis in ROTATE_ORDERS[rotate_order]]
+    sign = 1.0 if ROTATE_ORDERS[rotate_order] in ("xyz", "yzx", "zxy") else -1.0
+    result = np.zeros((len(rotation), 3))
+    result[:, j] = np.arcsin(np.clip(-sign * rotation[:, i, k], -1.0, 1.0))
+    result[:, i] = np.arctan2(sign * rotation[:, j, k], rotation[:, k, k])
+    result[:, k] = np.arctan2(sign * rotation[:, i, j], rotation[:, i, i])
+    # 万向节锁时第一、三轴耦合，全部归到第一个轴
+    locked = np.hypot(rotation[:, j, k], rotation[:, k, k]) < GIMBAL_EPSILON
+    if locked.any():
+        result[locked, k] = 0.0
+        result[locked, i] = np.arctan2(
+            -sign * rotation[locked, k, j], rotation[locked, j, j]
+        )
+    return result
+
+def equivalent_euler(angles: np.ndarray, rotate_order: int = 0) -> np.ndarray:
+    """同一旋转的另一组欧拉角解 (i+180, 180-j, k+180)，i/j/k 为旋转顺序中的轴"""
+    i, j, k = ["xyz".index(axis) for axis in ROTATE_ORDERS[rotate_order]]
+    result = angles.copy()
+    result[:, i] += np.pi
+    result[:, j] = np.pi - result[:, j]
+    result[:, k] += np.pi
+    return result
+
+def continuous_euler(
+    rotation: np.ndarray, rotate_order: int = 0, reference=None
+) -> np.ndarray:
+    """旋转矩阵 (N, 3, 3) 转连续的欧拉角 (N, 3)，相当于欧拉过滤
+
+    每帧在两组等价解及其 360 度倍数中选择最接近上一帧的一组，
+    中间轴越过 ±90 度时不会翻转。万向节锁时第三个轴保持上一帧的数值。
+
+    Args:
+        rotation (np.ndarray): 旋转矩阵
+        rotate_order (int): 旋转顺序
+        reference (np.ndarray): 第一帧参考的欧拉角 (3,)，弧度，
+            为 None 时第一帧使用中间轴在 ±90 度内的解
+
+    Returns:
+        np.ndarray: 欧拉角，弧度
+    """
+    i, j, k = ["xyz".index(axis) for axis in ROTATE_ORDERS[rotate_order]]
+    sign = 1.0 if ROTATE_ORDERS[rotate_order] in ("xyz", "yzx", "zxy") else -1.0
+    base = matrix_to_euler(rotation, rotate_order)
+    candidates = np.stack([base, equivalent_euler(base, rotate_order)], axis=1)
+    locked = np.hypot(rotation[:, j, k], rotation[:, k, k]) < GIMBAL_EPSILON
+    previous = base[0] if reference is None else np.asarray(reference, np.float64)
+    result = np.empty_like(base)
+    for n in range(len(base)):
+        if locked[n]:
+            # 万向节锁时矩阵只取决于 i + sigma * k，保持 k 不变
+            sigma = -sign * np.sign(np.sin(base[n, j]))
+            current = base[n].copy()
+            current[k] = previous[k]
+            current[i] = base[n, i] - sigma * previous[k]
+            options = current[None]
+        else:
+            options = candidates[n]
+        # 每个分量取最接近上一帧的 360 度倍数
+        options = options + 2.0 * np.pi * np.round((previous - options) / (2.0 * np.pi))
+        previous = options[np.argmin(np.abs(options - previous).sum(axis=1))]
+        result[n] = previous
+    return result
+
+def inverse(matrices: np.ndarray) -> np.ndarray:
+    return np.linalg.inv(matrices)
+
+def row_scale(matrices: np.ndarray) -> np.ndarray:
+    """矩阵旋转部分每一行的长度，即 x/y/z 轴缩放 (N, 3)"""
+    return np.linalg.norm(matrices[:, :3, :3], axis=2)
+
+def compose(
+    translate: np.ndarray,
+    rotation: np.ndarray,
+    scale: np.ndarray = None,
+) -> np.ndarray:
+    """由位移 (N, 3)、旋转矩阵 (N, 3, 3) 和缩放 (N, 3) 组合变换矩阵 (N, 4, 4)"""
+    result = np.zeros((len(translate), 4, 4))
+    result[:, :3, :3] = rotation
+    if scale is not None:
+        result[:, :3, :3] *= scale[:, :, None]
+    result[:, 3, :3] = translate
+    result[:, 3, 3] = 1.0
+    return result
+
+def pivot_offset(rotation: np.ndarray, scale: np.ndarray, pivots) -> np.ndarray:
+    """轴心造成的位移 (N, 3)，即局部矩阵位移减去 translate 通道
+
+    Args:
+        rotation (np.ndarray): 归一化的旋转部分 (N, 3, 3)，包含 rotateAxis
+        scale (np.ndarray): 缩放 (N, 3)
+        pivots (tuple): (scalePivot, scalePivotTranslate, rotatePivot, rotatePivotTranslate)
+    """
+    scale_pivot, scale_translate, rotate_pivot, rotate_translate = [
+        np.asarray(pivot, dtype=np.float64) for pivot in pivots
+    ]
+    # [Sp^-1][S][Sp][St][Rp^-1][Ra][R][Rp][Rt] 作用于原点的结果
+    point = scale_pivot - scale_pivot * scale + scale_translate - rotate_pivot
+    return np.einsum("nj,njk->nk", point, rotation) + rotate_pivot + rotate_translate
+
+def local_channels(
+    local: np.ndarray,
+    rotate_order: int = 0,
+    rotate_axis=(0.0, 0.0, 0.0),
+    joint_orient=(0.0, 0.0, 0.0),
+    pivots=None,
+    reference=None,
+) -> tuple:
+    """把局部矩阵分解为 translate/rotate 通道数值
+
+    局部矩阵按 Maya 的 [Sp^-1][S][Sp][St][Rp^-1][Ra][R][Rp][Rt][Jo][T] 分解，
+    不考虑切变，骨骼的轴心默认为 0。
+
+    Args:
+        local (np.ndarray): 局部矩阵 (N, 4, 4)
+        rotate_order (int): 控制器的 rotateOrder
+        rotate_axis (tuple): rotateAxis，弧度
+        joint_orient (tuple): 骨骼的 jointOrient，弧度，普通变换节点为 0
+        pivots (tuple): (scalePivot, scalePivotTranslate, rotatePivot,
+            rotatePivotTranslate)，为 None 时轴心都在原点
+        reference (np.ndarray): 第一帧参考的 rotate 数值 (3,)，弧度，
+            通常为控制器原来的数值，结果选择与它连续的欧拉角解
+
+    Returns:
+        tuple: (位移 (N, 3), 旋转 (N, 3) 弧度)
+    """
+    scale = row_scale(local)
+    rotation = local[:, :3, :3] / scale[:, :, None]
+    axis = euler_to_matrix(np.array([rotate_axis], dtype=np.float64))[0]
+    orient = euler_to_matrix(np.array([joint_orient], dtype=np.float64))[0]
+    rotation = rotation @ orient.T
+    rotate = continuous_euler(axis.T @ rotation, rotate_order, reference)
+    translate = local[:, 3, :3]
+    if pivots is not None:
+        translate = translate - pivot_offset(rotation, scale, pivots)
+    return translate, rotate
@@ -0,0 +1,167 @@
+# -*- encoding: utf-8 -*-
+"""
+@File    :   anim_utils.py
+@Author  :   Charles Tian
+@Version :   1.0
+@Contact :   tianchao0533@gmail.com
+@Desc    :   动画工具共用的Maya函数：按帧采样矩阵、分解通道数值、批量写入关键帧
+"""
+
+import numpy as np
+from maya.api import OpenMaya as om
+import maya.cmds as cmds
+
+from AnimUtils import anim_matrix
+
+
+def get_dag_path(node) -> om.MDagPath:
+    """获取节点的 MDagPath"""
+    selection = om.MSelectionList()
+    selection.add(str(node))
+    return selection.getDagPath(0)
+
+
+def read_matrix(plug: om.MPlug, context: om.MDGContext) -> np.ndarray:
+    """在指定上下文中读取矩阵属性，返回 (4, 4) 数组"""
+    if hasattr(context, "makeCurrent"):
+        # Maya 2022+ 推荐的做法，上下文在调用方切换
+        data = plug.asMObject()
+    else:
+        data = plug.asMObject(context)
+    return np.array(list(om.MFnMatrixData(data).matrix())).reshape(4, 4)
+
+
+def sample_matrix_plugs(plugs: list, frames) -> np.ndarray:
+    """在一次时间循环中采样多个矩阵属性每帧的数值
+
+    不修改当前时间，也不创建任何辅助节点，每帧只求值一次依赖图。
+
+    Args:
+        plugs (list[om.MPlug]): 矩阵属性
+        frames (np.ndarray): 采样的帧
+
+    Returns:
+        np.ndarray: 形状为 (属性数量, 帧数, 4, 4)
+    """
+    result = np.zeros((len(plugs), len(frames), 4, 4))
+    for f, frame in enumerate(frames):
+        context = om.MDGContext(om.MTime(float(frame), om.MTime.uiUnit()))
+        previous = context.makeCurrent() if hasattr(context, "makeCurrent") else None
+        try:
+            for p, plug in enumerate(plugs):
+                result[p, f] = read_matrix(plug, context)
+        finally:
+            if previous is not None:
+                previous.makeCurrent()
+    return result
+
+
+def sample_world_matrices(nodes: list, frames) -> tuple:
+    """在一次时间循环中采样所有节点每帧的世界矩阵和父对象世界矩阵
+
+    Args:
+        nodes (list): 节点列表
+        frames (np.ndarray): 采样的帧
+
+    Returns:
+        tuple: (世界矩阵列表, 父对象世界矩阵列表)，每项形状为 (帧数, 4, 4)
+    """
+    plugs = []
+    for node in nodes:
+        fn_node = om.MFnDependencyNode(get_dag_path(node).node())
+        plugs.append(fn_node.findPlug("worldMatrix", False).elementByLogicalIndex(0))
+        plugs.append(fn_node.findPlug("parentMatrix", False).elementByLogicalIndex(0))
+    result = sample_matrix_plugs(plugs, frames)
+    return list(result[0::2]), list(result[1::2])
+
+
+def linear_factor() -> float:
+    """厘米到界面长度单位的换算系数"""
+    return om.MDistance(1.0).asUnits(om.MDistance.uiUnit())
+
+
+def angle_factor() -> float:
+    """弧度到界面角度单位的换算系数"""
+    return om.MAngle(1.0).asUnits(om.MAngle.uiUnit())
+
+
+def scene_fps() -> float:
+    """场景每秒的帧数"""
+    return om.MTime(1.0, om.MTime.kSeconds).asUnits(om.MTime.uiUnit())
+
+
+def node_channels(node, local: np.ndarray, time=None) -> dict:
+    """把局部矩阵分解为节点 translate/rotate 通道的界面单位数值
+
+    Args:
+        node: 控制器
+        local (np.ndarray): 控制器每帧的局部矩阵
+        time (float): 第一帧的时间，旋转从控制器在这一帧原来的数值连续解出，
+            为 None 时使用当前的数值
+
+    Returns:
+        dict: {"tx": np.ndarray, ..., "rz": np.ndarray}
+    """
+    node = str(node)
+    radians = 1.0 / angle_factor()
+    centimeters = 1.0 / linear_factor()
+    rotate_axis = np.array(cmds.getAttr(f"{node}.rotateAxis")[0]) * radians
+    joint_orient = (0.0, 0.0, 0.0)
+    if cmds.attributeQuery("jointOrient", node=node, exists=True):
+        joint_orient = np.array(cmds.getAttr(f"{node}.jointOrient")[0]) * radians
+    pivots = [
+        np.array(cmds.getAttr(f"{node}.{attr}")[0]) * centimeters
+        for attr in (
+            "scalePivot",
+            "scalePivotTranslate",
+            "rotatePivot",
+            "rotatePivotTranslate",
+        )
+    ]
+    if time is None:
+        reference = cmds.getAttr(f"{node}.rotate")[0]
+    else:
+        reference = cmds.getAttr(f"{node}.rotate", time=time)[0]
+    translate, rotate = anim_matrix.local_channels(
+        local,
+        cmds.getAttr(f"{node}.rotateOrder"),
+        rotate_axis,
+        joint_orient,
+        pivots,
+        np.array(reference) * radians,
+    )
+    values = np.column_stack([translate * linear_factor(), rotate * angle_factor()])
+    return dict(zip(anim_matrix.CHANNELS, values.T))
+
+
+def write_channel_keys(node, channels: dict, frames):
+    """把每帧的通道数值一次性写入动画曲线
+
+    先用 setKeyframe 在整个范围内创建关键帧，再通过 keyTimeValue 的区间
+    setAttr 一次写入所有数值，整个过程可以撤销。锁定或被连接的通道会被跳过。
+
+    Args:
+        node: 控制器
+        channels (dict): 通道名称 -> 每帧数值
+        frames (np.ndarray): 帧
+    """
+    first, last = float(frames[0]), float(frames[-1])
+    times = [(float(frame), float(frame)) for frame in frames]
+    for channel, values in channels.items():
+        attr = f"{node}.{channel}"
+        if not cmds.getAttr(attr, settable=True):
+            continue
+        cmds.cutKey(attr, time=(first, last), clear=True)
+        cmds.setKeyframe(attr, time=times)
+        curve = cmds.listConnections(
+            attr, source=True, destination=False, type="animCurve"
+        )
+        if not curve:
+            continue
+        start = cmds.keyframe(
+            curve[0], query=True, indexValue=True, time=(first, first)
+        )[0]
+        flat = np.column_stack([frames, values]).ravel().tolist()
+        cmds.setAttr(
+            f"{curve[0]}.keyTimeValue[{start}:{start + len(frames) - 1}]", *flat
+        )
@@ -0,0 +1,118 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   test_anim_matrix.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   矩阵与欧拉角计算的测试，不依赖Maya。
+"""
+
+import numpy as np
+import pytest
+
+from AnimUtils import anim_matrix
+
+ORDERS = range(len(anim_matrix.ROTATE_ORDERS))
+
+
+def assert_continuous(angles: np.ndarray, limit: float = 0.2):
+    assert np.abs(np.diff(angles, axis=0)).max() < limit
+
+
+def translation(values) -> np.ndarray:
+    result = np.eye(4)
+    result[3, :3] = values
+    return result
+
+
+def rotation(angles, rotate_order=0) -> np.ndarray:
+    result = np.eye(4)
+    result[:3, :3] = anim_matrix.euler_to_matrix(np.array([angles], np.float64), rotate_order)[0]
+    return result
+
+
+@pytest.mark.parametrize("rotate_order", ORDERS)
+def test_matrix_to_euler_round_trip(rotate_order):
+    rng = np.random.default_rng(rotate_order)
+    angles = rng.uniform(-np.pi, np.pi, (200, 3))
+    matrices = anim_matrix.euler_to_matrix(angles, rotate_order)
+    result = anim_matrix.matrix_to_euler(matrices, rotate_order)
+    np.testing.assert_allclose(anim_matrix.euler_to_matrix(result, rotate_order), matrices, atol=1e-9)
+
+
+@pytest.mark.parametrize("rotate_order", ORDERS)
+def test_equivalent_euler(rotate_order):
+    rng = np.random.default_rng(rotate_order)
+    angles = rng.uniform(-np.pi, np.pi, (50, 3))
+    np.testing.assert_allclose(
+        anim_matrix.euler_to_matrix(anim_matrix.equivalent_euler(angles, rotate_order), rotate_order),
+        anim_matrix.euler_to_matrix(angles, rotate_order),
+        atol=1e-9,
+    )
+
+
+@pytest.mark.parametrize("rotate_order", ORDERS)
+def test_continuous_euler_turns_past_90(rotate_order):
+    # 每个轴都转过 90 度以上，包括中间轴
+    frames = np.linspace(0.0, 1.0, 121)[:, None]
+    angles = frames * np.array([[2.5, 3.0, -4.0]]) + np.array([[0.1, 0.0, 0.2]])
+    matrices = anim_matrix.euler_to_matrix(angles, rotate_order)
+    result = anim_matrix.continuous_euler(matrices, rotate_order, angles[0])
+    np.testing.assert_allclose(result, angles, atol=1e-7)
+
+
+@pytest.mark.parametrize("rotate_order", ORDERS)
+def test_continuous_euler_through_gimbal_lock(rotate_order):
+    i, j, k = ["xyz".index(axis) for axis in anim_matrix.ROTATE_ORDERS[rotate_order]]
+    angles = np.zeros((61, 3))
+    angles[:, i] = 0.4
+    angles[:, j] = np.linspace(0.0, np.pi, 61)  # 第 30 帧正好为 90 度
+    angles[:, k] = -0.3
+    matrices = anim_matrix.euler_to_matrix(angles, rotate_order)
+    result = anim_matrix.continuous_euler(matrices, rotate_order, angles[0])
+    np.testing.assert_allclose(
+        anim_matrix.euler_to_matrix(result, rotate_order), matrices, atol=1e-7
+    )
+    assert_continuous(result)
+
+
+@pytest.mark.parametrize("rotate_order", ORDERS)
+def test_local_channels_with_pivots(rotate_order):
+    rng = np.random.default_rng(rotate_order)
+    for _ in range(20):
+        translate = rng.normal(size=3)
+        rotate = rng.uniform(-3, 3, 3)
+        rotate_axis = rng.uniform(-1, 1, 3)
+        scale = rng.uniform(0.5, 2, 3)
+        pivots = [rng.normal(size=3) for _ in range(4)]
+        scale_pivot, scale_translate, rotate_pivot, rotate_translate = pivots
+        local = (
+            np.linalg.inv(translation(scale_pivot))
+            @ np.diag(np.r_[scale, 1.0])
+            @ translation(scale_pivot)
+            @ translation(scale_translate)
+            @ np.linalg.inv(translation(rotate_pivot))
+            @ rotation(rotate_axis)
+            @ rotation(rotate, rotate_order)
+            @ translation(rotate_pivot)
+            @ translation(rotate_translate)
+            @ translation(translate)
+        )
+        result_translate, result_rotate = anim_matrix.local_channels(
+            local[None], rotate_order, rotate_axis, pivots=pivots, reference=rotate
+        )
+        np.testing.assert_allclose(result_translate[0], translate, atol=1e-9)
+        np.testing.assert_allclose(result_rotate[0], rotate, atol=1e-9)
+
+
+@pytest.mark.parametrize("rotate_order", ORDERS)
+def test_local_channels_turning_control(rotate_order):
+    frames = np.linspace(0.0, 1.0, 100)[:, None]
+    angles = frames * np.array([[-3.5, 2.8, 4.2]])
+    local = anim_matrix.compose(np.zeros((100, 3)), anim_matrix.euler_to_matrix(angles, rotate_order))
+    joint_orient = (0.2, -0.4, 0.1)
+    local[:, :3, :3] = local[:, :3, :3] @ anim_matrix.euler_to_matrix(np.array([joint_orient]))[0]
+    _, rotate = anim_matrix.local_channels(
+        local, rotate_order, joint_orient=joint_orient, reference=angles[0]
+    )
+    np.testing.assert_allclose(rotate, angles, atol=1e-7)
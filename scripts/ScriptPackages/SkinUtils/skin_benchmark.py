@@ -0,0 +1,80 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   skin_benchmark.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   对比逐顶点字典推导与 numpy 向量化权重提取的耗时。
+             不依赖Maya，可直接用 python / mayapy 运行:
+                 mayapy skin_benchmark.py
+"""
+
+import time
+
+import numpy as np
+
+from SkinUtils import skin_pack
+
+VERTEX_COUNTS = (10_000, 100_000, 500_000)
+NUM_INFLUENCE = 32
+MAX_INFLUENCE_PER_VERTEX = 4
+
+
+def make_weights(num_vertices: int, num_influence: int, seed: int = 0):
+    """生成每个顶点最多 MAX_INFLUENCE_PER_VERTEX 个非零权重的扁平权重数组，
+    使用不支持缓冲区协议的 list 模拟 MDoubleArray 的逐项访问开销。"""
+    rng = np.random.default_rng(seed)
+    dense = np.zeros((num_vertices, num_influence), dtype=np.float64)
+    cols = rng.integers(0, num_influence, (num_vertices, MAX_INFLUENCE_PER_VERTEX))
+    vals = rng.random((num_vertices, MAX_INFLUENCE_PER_VERTEX))
+    np.put_along_axis(dense, cols, vals, axis=1)
+    dense /= dense.sum(axis=1, keepdims=True)
+    return dense.ravel().tolist()
+
+
+def legacy_extract(weights, num_influence: int) -> list:
+    """旧版 collectInfluenceWeights 中的逐顶点字典推导"""
+    component_num_perInfluence = int(len(weights) / num_influence)
+    return [
+        {
+            j: weights[j * num_influence + i]
+            for j in range(component_num_perInfluence)
+            if weights[j * num_influence + i] != 0
+        }
+        for i in range(num_influence)
+    ]
+
+
+def vectorized_extract(weights, num_influence: int) -> list:
+    """新版 collectInfluenceWeights 的向量化提取"""
+    dense = skin_pack.as_float_array(weights).reshape(-1, num_influence)
+    return skin_pack.dense_to_influence_dicts(dense)
+
+
+def run(vertex_counts=VERTEX_COUNTS, num_influence=NUM_INFLUENCE) -> list:
+    """运行基准测试并打印结果
+    Returns:
+        list: [(顶点数, 旧版耗时, 新版耗时), ...]
+    """
+    results = []
+    print(f"{'vertices':>10} {'legacy(s)':>12} {'numpy(s)':>12} {'speedup':>9}")
+    for num_vertices in vertex_counts:
+        weights = make_weights(num_vertices, num_influence, seed=num_vertices)
+        start = time.perf_counter()
+        legacy = legacy_extract(weights, num_influence)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        vectorized = vectorized_extract(weights, num_influence)
+        vectorized_time = time.perf_counter() - start
+        # 输出必须与旧版完全一致
+        assert legacy == vectorized, "vectorized output differs from legacy output"
+        print(
+            f"{num_vertices:>10} {legacy_time:>12.3f} {vectorized_time:>12.3f} "
+            f"{legacy_time / max(vectorized_time, 1e-9):>8.1f}x"
+        )
+        results.append((num_vertices, legacy_time, vectorized_time))
+    return results
+
+
+if __name__ == "__main__":
+    run()
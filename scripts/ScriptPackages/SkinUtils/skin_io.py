@@ -1,17 +1,29 @@
+import os
+import re
 import pickle
 import json
+import time
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaAnim as oma
+import maya.cmds as cmds
 import pymel.core as pm
 import pymel.core.nodetypes as nt
 from Qt import QtWidgets
+from SkinUtils import skin_pack
+from SkinUtils import skin_transfer
 
 
 class SkinClusterIO(QtWidgets.QDialog):
     FILE_EXT = ".pSkin"
     FILE_JSON_EXT = ".jSkin"
     PACK_EXT = ".pSkinPack"
+    SKINNABLE_TYPES = ["mesh", "nurbsCurve", "nurbsSurface", "lattice"]
+    # pSkinPack 流水线中编码/解码线程数量
+    PIPELINE_WORKERS = min(4, os.cpu_count() or 1)
 
     _ui_instance = None
 
@@ -23,6 +35,8 @@ class SkinClusterIO(QtWidgets.QDialog):
         self.setWindowTitle("Skin IO")
         self.setObjectName("skinIoWidget")
         self.setMinimumSize(200, 80)
+        # 组件解析缓存 {形状完整路径: 组件信息}，每次导入/导出开始时清空
+        self.component_cache = {}
 
         main_layout = QtWidgets.QVBoxLayout(self)
 
@@ -30,9 +44,24 @@ class SkinClusterIO(QtWidgets.QDialog):
         import_btn.released.connect(self.import_skin)
         export_btn = QtWidgets.QPushButton("Export skin")
         export_btn.released.connect(self.export_skin)
+        update_btn = QtWidgets.QPushButton("Update skin pack")
+        update_btn.released.connect(self.update_skin)
+        self.compress_cb = QtWidgets.QCheckBox("Compress pSkinPack (zlib)")
+        self.selected_vtx_cb = QtWidgets.QCheckBox("Import selected vertices only")
+        self.create_missing_cb = QtWidgets.QCheckBox("Create missing influences")
+        transfer_layout = QtWidgets.QHBoxLayout()
+        transfer_layout.addWidget(QtWidgets.QLabel("Vertex count mismatch:"))
+        self.transfer_combo = QtWidgets.QComboBox()
+        self.transfer_combo.addItems(("skip",) + skin_transfer.TRANSFER_MODES)
+        transfer_layout.addWidget(self.transfer_combo)
 
         main_layout.addWidget(import_btn)
         main_layout.addWidget(export_btn)
+        main_layout.addWidget(update_btn)
+        main_layout.addWidget(self.compress_cb)
+        main_layout.addWidget(self.selected_vtx_cb)
+        main_layout.addWidget(self.create_missing_cb)
+        main_layout.addLayout(transfer_layout)
 
     @staticmethod
     def maya_main_window():
@@ -99,22 +128,17 @@ class SkinClusterIO(QtWidgets.QDialog):
         influences_paths: om.MDagPathArray = skinCluster_fn.influenceObjects()
         # 顶点数量总和 = 权重数量 / 影响（骨骼）数量，float做分母，避免整数除法可能导致的精度问题
         data["vertexCount"] = int(len(weights) / float(num_influence))
-        # 计算每个影响对象的组件（顶点）数量
-        component_num_perInfluence = int(len(weights) / num_influence)
+        # 一次性将权重转换为 (V, I) 矩阵，再按影响对象提取非零项
+        dense = skin_pack.as_float_array(weights).reshape(-1, num_influence)
+        influence_weights = skin_pack.dense_to_influence_dicts(dense)
         # 遍历影响对象数组
         for i in range(len(influences_paths)):
             influence_name = influences_paths[i].partialPathName()
             influence_name_without_namespace = pm.PyNode(
                 influence_name
             ).stripNamespace()
-            # 构建一个字典{vtx_index:weight},跳过0权重值
-            influence_weights = {
-                j: weights[j * num_influence + i]
-                for j in range(component_num_perInfluence)
-                if weights[j * num_influence + i] != 0
-            }
             # 写入数据
-            data["weights"][str(influence_name_without_namespace)] = influence_weights
+            data["weights"][str(influence_name_without_namespace)] = influence_weights[i]
 
     def collectBlendWeights(
         self,
@@ -144,6 +168,7 @@ class SkinClusterIO(QtWidgets.QDialog):
         }
 
     def export_skin(self, file_path=None, objs=None, *args):
+        self.component_cache.clear()
         if not objs:
             if pm.selected():
                 objs = pm.selected()
@@ -156,6 +181,7 @@ class SkinClusterIO(QtWidgets.QDialog):
         if not file_path:
             f1 = f"jSkin ASCII (*{SkinClusterIO.FILE_JSON_EXT})"
             f2 = f";;pSkin Binary (*{SkinClusterIO.FILE_EXT})"
+            f2 += f";;pSkinPack Columnar (*{SkinClusterIO.PACK_EXT})"
             f3 = ";;All Files (*.*)"
             file_filters = f1 + f2 + f3
             #  fileMode=0：表示保存模式,返回用户选择的文件路径（列表）
@@ -165,11 +191,14 @@ class SkinClusterIO(QtWidgets.QDialog):
             else:
                 return False
         # 如果路径参数的扩展名不对，则直接返回
-        if not file_path.endswith(SkinClusterIO.FILE_EXT) and not file_path.endswith(
-            SkinClusterIO.FILE_JSON_EXT
+        if not file_path.endswith(
+            (SkinClusterIO.FILE_EXT, SkinClusterIO.FILE_JSON_EXT, SkinClusterIO.PACK_EXT)
         ):
             pm.displayWarning(f"Not valid file extension for: {file_path}")
             return
+        # 列式二进制格式单独处理
+        if file_path.endswith(SkinClusterIO.PACK_EXT):
+            return self.export_pack(file_path, objs)
         # 遍历选择列表
         for obj in objs:
             # 获取skinCluster节点
@@ -224,14 +253,204 @@ class SkinClusterIO(QtWidgets.QDialog):
             # 表示文件保存成功，返回 True。
             return True
 
-    def import_skin(self, file_path=None, *args):
+    def export_pack(
+        self, file_path, objs, compress=None, max_workers=None, update=False
+    ):
+        """以 pSkinPack 列式二进制格式导出蒙皮权重.
+        流水线执行：Maya API 读取在主线程中逐个进行，读取完成的Mesh交给线程池
+        编码/压缩，再由单独的写入线程按顺序写入文件，与下一个Mesh的读取重叠.
+        Args:
+            file_path (str): 文件路径
+            objs (list): 要导出的对象列表
+            compress (bool, optional): 是否zlib压缩，为空时读取界面选项
+            max_workers (int, optional): 编码线程数量，默认 PIPELINE_WORKERS
+            update (bool): 更新模式，只重写内容哈希发生变化的Mesh
+        Returns:
+            bool: 是否导出成功
+        """
+        self.component_cache.clear()
+        if compress is None:
+            compress = self.compress_cb.isChecked()
+        if update and not skin_pack.is_pack(file_path):
+            update = False
+        timings = []
+        write_futures = []
+        cancelled = False
+        writer = skin_pack.PackWriter(file_path, update=update)
+        old_hashes = {m["objName"]: m.get("hash") for m in writer.index["meshes"]}
+        unchanged = 0
+        encode_pool = ThreadPoolExecutor(max_workers or SkinClusterIO.PIPELINE_WORKERS)
+        # 单线程写入，保证Mesh按读取顺序写入文件
+        write_pool = ThreadPoolExecutor(1)
+        self.progress_begin("Exporting Skin", len(objs))
+        try:
+            for i, obj in enumerate(objs):
+                if self.progress_step(i, f"Reading: {obj.name()}"):
+                    cancelled = True
+                    break
+                skinCluster_node = self.get_skin_cluster(obj)
+                if not skinCluster_node:
+                    pm.displayWarning(
+                        f"{obj.name()}: Skiped because do not have skin cluster"
+                    )
+                    continue
+                timing = {"objName": obj.name(), "start": time.perf_counter()}
+                record = self.collect_pack_record(obj, skinCluster_node)
+                timing["read"] = time.perf_counter() - timing["start"]
+                # 更新模式下跳过内容没有变化的Mesh
+                if update and old_hashes.get(record["objName"]) == record["hash"]:
+                    unchanged += 1
+                    pm.displayInfo(f"Unchanged, skiped: {obj.name()}")
+                    continue
+                encode_future = encode_pool.submit(
+                    self.timed, timing, "encode", skin_pack.encode_mesh, record, compress
+                )
+                write_futures.append(
+                    write_pool.submit(
+                        self.timed,
+                        timing,
+                        "write",
+                        self.write_encoded,
+                        writer,
+                        encode_future,
+                    )
+                )
+                timings.append(timing)
+                export_message = f"Exported skinCluster: {skinCluster_node.name()}: ({len(record['influences'])} influences, {record['vertexCount']} points), {obj.name()}"
+                pm.displayInfo(export_message)
+            if not cancelled:
+                # 等待全部写入完成，并抛出工作线程中的异常
+                for future in write_futures:
+                    future.result()
+        except Exception:
+            cancelled = True
+            traceback.print_exc()
+        finally:
+            if cancelled:
+                for future in write_futures:
+                    future.cancel()
+            encode_pool.shutdown(wait=True)
+            write_pool.shutdown(wait=True)
+            self.progress_end()
+        if cancelled or not timings:
+            writer.abort()
+            if not cancelled and unchanged:
+                pm.displayInfo(f"All {unchanged} objects up to date: {file_path}")
+                return True
+            pm.displayWarning(f"Export canceled, nothing written to: {file_path}")
+            return False
+        writer.close()
+        if update:
+            pm.displayInfo(f"Updated {len(timings)} objects, {unchanged} unchanged")
+            if skin_pack.needs_compaction(file_path):
+                freed = skin_pack.compact_pack(file_path)
+                pm.displayInfo(f"Compacted {file_path}, freed {freed} bytes")
+        self.report_timings("Export", timings)
+        return True
+
+    def update_skin(self, file_path=None, objs=None, *args):
+        """更新已有的 pSkinPack，只重新导出内容发生变化的对象.
+        Args:
+            file_path (str, optional): pSkinPack 文件路径，为空时弹出文件对话框
+            objs (list, optional): 要导出的对象列表，默认当前选择
+        Returns:
+            bool: 是否更新成功
+        """
+        if not objs:
+            if pm.selected():
+                objs = pm.selected()
+            else:
+                pm.displayWarning("Please Select One or more objects")
+                return False
+        if not file_path:
+            file_filters = f"pSkinPack Columnar (*{SkinClusterIO.PACK_EXT})"
+            # fileMode=0：保存模式，允许选择已有文件或新建文件
+            file_path = pm.fileDialog2(fileMode=0, fileFilter=file_filters)
+            if not file_path:
+                return False
+            file_path = file_path[0]
+        if not file_path.endswith(SkinClusterIO.PACK_EXT):
+            pm.displayWarning(f"Not valid file extension for: {file_path}")
+            return False
+        return self.export_pack(file_path, objs, update=True)
+
+    @staticmethod
+    def write_encoded(writer, encode_future):
+        """在写入线程中等待编码结果并写入文件"""
+        writer.add_mesh(encode_future.result())
+
+    def collect_pack_record(self, obj, skinCluster_node: nt.SkinCluster) -> dict:
+        """收集单个对象的 pSkinPack 记录，只做Maya API读取，必须在主线程调用.
+        权重以 (V, I) 稠密矩阵放在 "dense" 中，由 skin_pack.encode_mesh 转换为CSR数组.
+        Args:
+            obj (pm.nodetypes.Transform): 蒙皮对象
+            skinCluster_node (nt.SkinCluster): 蒙皮节点
+        Returns:
+            dict: skin_pack.encode_mesh 所需的Mesh记录
+        """
+        dag_path, components = self.get_geometry_components(skinCluster_node)
+        weights, num_influence = self.get_current_weights(
+            skinCluster_node, dag_path, components
+        )
+        skinCluster_fn = SkinClusterIO.get_skinCluster_fn(skinCluster_node.name())
+        influences_paths = skinCluster_fn.influenceObjects()
+        influences = [
+            str(pm.PyNode(influences_paths[i].partialPathName()).stripNamespace())
+            for i in range(len(influences_paths))
+        ]
+        # 一次性将权重转换为 (V, I) 矩阵
+        dense = skin_pack.as_float_array(weights).reshape(-1, num_influence)
+        blend = skin_pack.as_float_array(
+            skinCluster_fn.getBlendWeights(dag_path, components), np.float32
+        )
+        arrays = {"blend": blend}
+        # 静止姿态顶点位置和三角形，用于顶点数量不一致时传递权重
+        points, triangles = self.get_rest_geometry(skinCluster_node)
+        if points is not None:
+            arrays["points"] = points
+        if triangles is not None:
+            arrays["triangles"] = triangles
+        record = {
+            "objName": obj.name(),
+            "nameSpace": obj.namespace(),
+            "skinClsName": skinCluster_node.name(),
+            "skinningMethod": int(skinCluster_node.skinningMethod.get()),
+            "normalizeWeights": int(skinCluster_node.normalizeWeights.get()),
+            "vertexCount": int(dense.shape[0]),
+            "influences": influences,
+            "dense": dense,
+            "arrays": arrays,
+        }
+        record["hash"] = skin_pack.content_hash(record)
+        return record
+
+    def import_skin(
+        self,
+        file_path=None,
+        *args,
+        remap_rules=None,
+        namespace=None,
+        create_missing=None,
+    ):
+        """导入蒙皮权重，pSkin/jSkin 与 pSkinPack 使用相同的影响对象重命名和补全规则.
+        Args:
+            file_path (str, optional): 文件路径，为空时弹出文件对话框
+            remap_rules (list, optional): 影响对象重命名规则 [(正则, 替换), ...]，按顺序执行
+            namespace (str, optional): 替换影响对象的命名空间，"" 表示去掉命名空间
+            create_missing (bool, optional): 是否批量创建缺失的影响对象，为空时读取界面选项
+        """
+        self.component_cache.clear()
         # 获取路径
         if not file_path:
-            f1 = "export Skin (*{0} *{1})".format(
-                SkinClusterIO.FILE_EXT, SkinClusterIO.FILE_JSON_EXT
+            f1 = "export Skin (*{0} *{1} *{2})".format(
+                SkinClusterIO.FILE_EXT,
+                SkinClusterIO.FILE_JSON_EXT,
+                SkinClusterIO.PACK_EXT,
             )
-            f2 = ";;pSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
-                SkinClusterIO.FILE_EXT, SkinClusterIO.FILE_JSON_EXT
+            f2 = ";;pSkin Binary (*{0});;jSkin ASCII  (*{1});;pSkinPack Columnar (*{2})".format(
+                SkinClusterIO.FILE_EXT,
+                SkinClusterIO.FILE_JSON_EXT,
+                SkinClusterIO.PACK_EXT,
             )
             f3 = ";;All Files (*.*)"
             fileFilters = f1 + f2 + f3
@@ -242,6 +461,16 @@ class SkinClusterIO(QtWidgets.QDialog):
         if not isinstance(file_path, str):
             file_path = file_path[0]
         pm.displayInfo(f"file_path: {file_path}")
+        # 列式二进制格式单独处理
+        if file_path.endswith(SkinClusterIO.PACK_EXT):
+            return self.import_pack(
+                file_path,
+                remap_rules=remap_rules,
+                namespace=namespace,
+                create_missing=create_missing,
+            )
+        if create_missing is None:
+            create_missing = self.create_missing_cb.isChecked()
         # 读取数据
         if file_path.endswith(SkinClusterIO.FILE_EXT):
             with open(file_path, "rb") as fp:
@@ -262,20 +491,8 @@ class SkinClusterIO(QtWidgets.QDialog):
                 obj_node = pm.PyNode(obj_name)
                 assert isinstance(obj_node, nt.Transform)
                 try:
-                    # 获取形状节点
-                    shapes = obj_node.getShapes(noIntermediate=True)
                     # 根据类型获取其组件数量
-                    if isinstance(obj_node.getShape(), pm.nodetypes.Mesh):
-                        mesh_vertices = pm.polyEvaluate(shapes, vertex=True)
-                    elif isinstance(obj_node.getShape(), pm.nodetypes.NurbsSurface):
-                        # if nurbs, count the cvs instead of the vertices.
-                        mesh_vertices = sum([len(shape.cv) for shape in shapes])
-                    elif isinstance(obj_node.getShape(), pm.nodetypes.NurbsCurve):
-                        # meshVertices = sum([len(shape.cv) for shape in objShapes])
-                        mesh_vertices = sum(1 for _ in shapes[0].cv)
-                    else:
-                        # TODO: Implement other skinnable objs like lattices.
-                        mesh_vertices = 0
+                    mesh_vertices = self.get_component_count(obj_node)
 
                     if compressed:
                         imported_vertics = data["vertexCount"]
@@ -291,51 +508,374 @@ class SkinClusterIO(QtWidgets.QDialog):
                         continue
                 except Exception:
                     pass
+                influences = self.remap_influence_names(
+                    list(data["weights"].keys()), remap_rules, namespace
+                )
+                if create_missing:
+                    self.create_missing_joints(influences)
                 # 如果当前Mesh已经存在skin cluster，则获取skinCluster
                 if self.get_skin_cluster(obj_node):
                     skinCluster = self.get_skin_cluster(obj_node)
+                    if create_missing:
+                        self.add_missing_influences(skinCluster, influences)
                 # 如果当前Mesh没有skinCluster，则创建skinCluster
                 else:
-                    try:
-                        joints = list(data["weights"].keys())
-                        skin_name = data["skinClsName"].replace("|", "")
-                        # nw=2:后归一化（在操作完成后归一化）
-                        skinCluster = pm.skinCluster(
-                            joints,
-                            obj_node,
-                            toSelectedBones=True,
-                            normalizeWeights=2,
-                            name=skin_name,
-                        )
-                    except Exception:
-                        scene_joints = set(
-                            [pm.PyNode(x).name() for x in pm.ls(type="joint")]
-                        )
-                        not_found = []
-                        for j in data["weights"].keys():
-                            if j not in scene_joints:
-                                not_found.append(str(j))
-                        pm.displayWarning(
-                            f"Object: {obj_name} skiped. can not found corresponding deformer for the following joints: {str(not_found)}"
-                        )
+                    skinCluster = self.create_skin_cluster(
+                        obj_node, influences, data["skinClsName"]
+                    )
+                    if not skinCluster:
                         continue
                 if isinstance(skinCluster, list):
                     skinCluster = skinCluster[0]
                 if skinCluster:
-                    self.set_data(skinCluster, data, compressed)
+                    self.set_data(skinCluster, data, compressed, influences)
                     print("Imported skin for: {}".format(obj_name))
             except Exception as e:
                 traceback.print_exc()
                 pm.displayWarning(e)
 
-    def set_data(self, skinCluster, data, compressed):
+    def import_pack(
+        self,
+        file_path,
+        max_workers=None,
+        remap_rules=None,
+        namespace=None,
+        vertex_ids=None,
+        create_missing=None,
+        transfer_mode=None,
+    ):
+        """导入 pSkinPack 列式二进制格式的蒙皮权重.
+        流水线执行：线程池预取并解码（解压）后续Mesh的数组，
+        主线程只负责 Maya API 写入.
+        Args:
+            file_path (str): 文件路径
+            max_workers (int, optional): 解码线程数量，默认 PIPELINE_WORKERS
+            remap_rules (list, optional): 影响对象重命名规则 [(正则, 替换), ...]，按顺序执行
+            namespace (str, optional): 替换影响对象的命名空间，"" 表示去掉命名空间
+            vertex_ids (dict, optional): {objName: 顶点索引数组}，只写入这些顶点；
+                为空且界面勾选 "Import selected vertices only" 时使用当前选择的组件
+            create_missing (bool, optional): 是否批量创建缺失的影响对象，为空时读取界面选项
+            transfer_mode (str, optional): 顶点数量不一致时的处理方式:
+                "skip" / "nearest" / "barycentric"，为空时读取界面选项
+        """
+        self.component_cache.clear()
+        max_workers = max_workers or SkinClusterIO.PIPELINE_WORKERS
+        if create_missing is None:
+            create_missing = self.create_missing_cb.isChecked()
+        if transfer_mode is None:
+            transfer_mode = self.transfer_combo.currentText()
+        if vertex_ids is None and self.selected_vtx_cb.isChecked():
+            vertex_ids = self.get_selected_vertex_ids()
+            if not vertex_ids:
+                pm.displayWarning("Please Select vertices or faces to import")
+                return
+        timings = []
+        with skin_pack.SkinPackReader(file_path) as pack:
+            meshes = pack.meshes
+            if vertex_ids is not None:
+                meshes = [m for m in meshes if m["objName"] in vertex_ids]
+            pending = deque()
+            pool = ThreadPoolExecutor(max_workers)
+            self.progress_begin("Importing Skin", len(meshes))
+            try:
+                for i, mesh in enumerate(meshes):
+                    # 预取窗口：最多提前解码 max_workers * 2 个Mesh
+                    while len(pending) < max_workers * 2 and i + len(pending) < len(
+                        meshes
+                    ):
+                        next_mesh = meshes[i + len(pending)]
+                        timing = {
+                            "objName": next_mesh["objName"],
+                            "start": time.perf_counter(),
+                        }
+                        future = pool.submit(
+                            self.timed, timing, "decode", pack.decode_mesh, next_mesh
+                        )
+                        pending.append((future, timing))
+                    future, timing = pending.popleft()
+                    obj_name = mesh["objName"]
+                    if self.progress_step(i, f"Importing: {obj_name}"):
+                        pm.displayWarning("Import canceled by user")
+                        break
+                    try:
+                        influences = self.remap_influence_names(
+                            pack.influences(mesh), remap_rules, namespace
+                        )
+                        skinCluster, transfer = self.prepare_pack_target(
+                            mesh, influences, create_missing, transfer_mode
+                        )
+                        if not skinCluster:
+                            continue
+                        arrays = future.result()
+                        start = time.perf_counter()
+                        if transfer:
+                            arrays = self.transfer_pack_arrays(
+                                skinCluster, mesh, arrays, transfer_mode
+                            )
+                        self.set_pack_data(
+                            skinCluster,
+                            mesh,
+                            arrays,
+                            influences,
+                            None if vertex_ids is None else vertex_ids[obj_name],
+                        )
+                        timing["end"] = time.perf_counter()
+                        timing["write"] = timing["end"] - start
+                        timings.append(timing)
+                        print("Imported skin for: {}".format(obj_name))
+                    except Exception as e:
+                        traceback.print_exc()
+                        pm.displayWarning(e)
+            finally:
+                for future, _ in pending:
+                    future.cancel()
+                pool.shutdown(wait=True)
+                self.progress_end()
+        self.report_timings("Import", timings)
+
+    @staticmethod
+    def remap_influence_names(names, remap_rules=None, namespace=None) -> list:
+        """按规则重命名影响对象.
+        Args:
+            names (list): 文件中的影响对象名称
+            remap_rules (list, optional): [(正则, 替换), ...]，按顺序执行 re.sub
+            namespace (str, optional): 替换命名空间，"" 表示去掉命名空间
+        Returns:
+            list: 重命名后的名称
+        Examples:
+            remap_influence_names(["L_arm"], [(r"^L_", "left_")], "rig")
+            # ["rig:left_arm"]
+        """
+        compiled = [(re.compile(p), r) for p, r in remap_rules or ()]
+        result = []
+        for name in names:
+            for pattern, repl in compiled:
+                name = pattern.sub(repl, name)
+            if namespace is not None:
+                name = name.rsplit(":", 1)[-1]
+                if namespace:
+                    name = f"{namespace.rstrip(':')}:{name}"
+            result.append(name)
+        return result
+
+    @staticmethod
+    def get_selected_vertex_ids() -> dict:
+        """将当前选择的组件（点/边/面）转换为顶点，按对象分组.
+        Returns:
+            dict: {transform名称: np.ndarray 顶点索引}
+        """
+        selection = cmds.ls(selection=True) or []
+        # 转换结果保持 vtx[10:400] 这样的范围形式，不会逐点展开
+        vertices = cmds.polyListComponentConversion(selection, toVertex=True) or []
+        sel_list = om.MSelectionList()
+        for vtx in vertices:
+            sel_list.add(vtx)
+        vertex_ids = {}
+        for i in range(sel_list.length()):
+            dag_path, component = sel_list.getComponent(i)
+            if component.isNull():
+                continue
+            ids = om.MFnSingleIndexedComponent(component).getElements()
+            name = om.MFnDagNode(dag_path.transform()).partialPathName()
+            vertex_ids.setdefault(name, []).extend(ids)
+        return {k: np.unique(np.asarray(v, dtype=np.int64)) for k, v in vertex_ids.items()}
+
+    def prepare_pack_target(
+        self, mesh, influences, create_missing=False, transfer_mode="skip"
+    ):
+        """检查 pSkinPack 中Mesh对应的场景对象，获取或创建其蒙皮节点.
+        Args:
+            mesh (dict): pack.meshes 中的Mesh记录
+            influences (list): 重命名后的影响对象名称
+            create_missing (bool): 是否批量创建缺失的影响对象
+            transfer_mode (str): 顶点数量不一致时的处理方式
+        Returns:
+            tuple: (蒙皮节点, 是否需要传递权重)，对象不可导入时蒙皮节点为None
+        """
+        obj_name = mesh["objName"]
+        if not pm.objExists(obj_name):
+            pm.displayWarning(f"Object: {obj_name} skiped. does not exist")
+            return None, False
+        obj_node = pm.PyNode(obj_name)
+        mesh_vertices = self.get_component_count(obj_node)
+        transfer = mesh_vertices != mesh["vertexCount"]
+        if transfer:
+            warning_message = "Vertex counts on {} do not match.{} != {}"
+            warning_message = warning_message.format(
+                obj_name, mesh_vertices, mesh["vertexCount"]
+            )
+            if (
+                transfer_mode not in skin_transfer.TRANSFER_MODES
+                or "points" not in mesh["arrays"]
+            ):
+                pm.displayWarning(warning_message)
+                return None, False
+            pm.displayInfo(f"{warning_message} Transfer weights by {transfer_mode}")
+        if create_missing:
+            self.create_missing_joints(influences)
+        skinCluster = self.get_skin_cluster(obj_node)
+        if not skinCluster:
+            skinCluster = self.create_skin_cluster(
+                obj_node, influences, mesh["skinClsName"]
+            )
+        elif create_missing:
+            self.add_missing_influences(skinCluster, influences)
+        return skinCluster, transfer
+
+    def transfer_pack_arrays(self, skinCluster, mesh, arrays, transfer_mode):
+        """将pSkinPack中的权重按静止姿态位置传递到当前拓扑.
+        Args:
+            skinCluster (nt.SkinCluster): 目标蒙皮节点
+            mesh (dict): pack.meshes 中的Mesh记录
+            arrays (dict): SkinPackReader.decode_mesh 返回的数组
+            transfer_mode (str): "nearest" 或 "barycentric"
+        Returns:
+            dict: 按目标顶点排列的数组
+        """
+        target_points, _ = self.get_rest_geometry(skinCluster)
+        return skin_transfer.transfer_arrays(
+            arrays, target_points, transfer_mode, len(mesh["influences"])
+        )
+
+    @staticmethod
+    def create_missing_joints(influences) -> list:
+        """为场景中不存在的影响对象批量创建骨骼（位于原点），避免权重丢失.
+        Returns:
+            list: 新创建的骨骼名称
+        """
+        missing = [name for name in influences if not cmds.objExists(name)]
+        created = []
+        # cmds.joint 会成为当前选择对象的子级，创建前清空选择，结束后恢复
+        selection = cmds.ls(selection=True) or []
+        try:
+            for name in missing:
+                namespace = name.rpartition(":")[0]
+                if namespace and not cmds.namespace(exists=namespace):
+                    cmds.namespace(add=namespace)
+                cmds.select(clear=True)
+                created.append(cmds.joint(name=name))
+        finally:
+            if selection:
+                cmds.select(selection, replace=True)
+            else:
+                cmds.select(clear=True)
+        if created:
+            pm.displayWarning(f"Created {len(created)} missing joints: {created}")
+        return created
+
+    def add_missing_influences(self, skinCluster, influences) -> list:
+        """将场景中存在但不在蒙皮节点中的影响对象一次性添加到蒙皮节点（权重为0）.
+        Returns:
+            list: 新添加的影响对象名称
+        """
+        skin_fn = self.get_skinCluster_fn(skinCluster.name())
+        # 与写入权重时相同的匹配规则，忽略命名空间后已存在的影响对象不再添加
+        columns = skin_pack.match_influences(influences, self.influence_names(skin_fn))
+        missing = [
+            n for n, c in zip(influences, columns) if c < 0 and cmds.objExists(n)
+        ]
+        if missing:
+            cmds.skinCluster(
+                skinCluster.name(), edit=True, addInfluence=missing, weight=0.0
+            )
+            pm.displayInfo(f"{skinCluster.name()}: added influences {missing}")
+        return missing
+
+    def create_skin_cluster(self, obj_node, joints, skin_name):
+        """为对象创建蒙皮节点，找不到骨骼时给出警告并返回None.
+        Args:
+            obj_node (pm.nodetypes.Transform): 蒙皮对象
+            joints (list): 影响骨骼名称列表
+            skin_name (str): 蒙皮节点名称
+        Returns:
+            nt.SkinCluster | None: 蒙皮节点
+        """
+        try:
+            # nw=2:后归一化（在操作完成后归一化）
+            skinCluster = pm.skinCluster(
+                joints,
+                obj_node,
+                toSelectedBones=True,
+                normalizeWeights=2,
+                name=skin_name.replace("|", ""),
+            )
+        except Exception:
+            scene_joints = set([pm.PyNode(x).name() for x in pm.ls(type="joint")])
+            not_found = [str(j) for j in joints if j not in scene_joints]
+            pm.displayWarning(
+                f"Object: {obj_node.name()} skiped. can not found corresponding deformer for the following joints: {str(not_found)}"
+            )
+            return None
+        if isinstance(skinCluster, list):
+            skinCluster = skinCluster[0]
+        return skinCluster
+
+    def set_data(self, skinCluster, data, compressed, influences=None):
         dagPath, components = self.get_geometry_components(skinCluster)
-        self.set_influence_weight(skinCluster, dagPath, components, data, compressed)
+        self.set_influence_weight(
+            skinCluster, dagPath, components, data, compressed, influences
+        )
         for attr in ["skinningMethod", "normalizeWeights"]:
             skinCluster.attr(attr).set(data[attr])
         self.set_blend_weights(skinCluster, dagPath, components, data, compressed)
 
-    def set_influence_weight(self, skinCluster, dagPath, components, data, compressed):
+    def set_pack_data(
+        self, skinCluster, mesh, arrays, file_influences, vertex_ids=None
+    ):
+        """将 pSkinPack 中单个Mesh的数据写入蒙皮节点.
+        权重直接从mmap数组视图散射到稠密矩阵，再整体交给 setWeights.
+        Args:
+            skinCluster (nt.SkinCluster): 蒙皮节点
+            mesh (dict): pack.meshes 中的Mesh记录
+            arrays (dict): SkinPackReader.decode_mesh 返回的数组
+            file_influences (list): 该Mesh的影响对象名称（已重命名）
+            vertex_ids (np.ndarray, optional): 只读写这些顶点，为空时写入全部顶点
+        """
+        dagPath, components = self.get_geometry_components(skinCluster)
+        if vertex_ids is not None:
+            components = self.get_subset_components(skinCluster, vertex_ids)
+        weights, num_influence = self.get_current_weights(
+            skinCluster, dagPath, components
+        )
+        skin_fn = self.get_skinCluster_fn(skinCluster.name())
+        # 文件局部影响索引 -> 当前蒙皮影响索引，-1表示场景中不存在
+        # 导出的名称不带命名空间，找不到完整名称时忽略命名空间匹配
+        columns = skin_pack.match_influences(
+            file_influences, self.influence_names(skin_fn)
+        )
+        unused_imports = [n for n, c in zip(file_influences, columns) if c < 0]
+        if unused_imports:
+            pm.displayWarning(
+                f"{mesh['objName']}: influences not found in skinCluster: {unused_imports}"
+            )
+        dense = skin_pack.as_float_array(weights).reshape(-1, num_influence)
+        skin_pack.scatter_csr(
+            dense,
+            arrays["offsets"],
+            arrays["indices"],
+            arrays["weights"],
+            columns,
+            rows=arrays["rows"],
+            vertex_ids=vertex_ids,
+        )
+        influence_indices = om.MIntArray(list(range(num_influence)))
+        skin_fn.setWeights(
+            dagPath,
+            components,
+            influence_indices,
+            self.to_double_array(dense),
+            False,
+        )
+        skinCluster.skinningMethod.set(mesh["skinningMethod"])
+        skinCluster.normalizeWeights.set(mesh["normalizeWeights"])
+        blend = arrays["blend"].astype(np.float64)
+        if vertex_ids is not None:
+            blend = blend[vertex_ids]
+        skin_fn.setBlendWeights(dagPath, components, self.to_double_array(blend))
+
+    def set_influence_weight(
+        self, skinCluster, dagPath, components, data, compressed, influences=None
+    ):
         """为提供的蒙皮节点设置权重.
         Args:
             skinCls (PyNode): 蒙皮节点.
@@ -343,6 +883,7 @@ class SkinClusterIO(QtWidgets.QDialog):
             components (MObject): 蒙皮组件（顶点集合）.
             dataDic (dict): 蒙皮数据.
             compressed (bool): 是否压缩权重.
+            influences (list, optional): 重命名后的影响对象名称，与 data["weights"] 的键一一对应
         """
         # 没有用到的导入信息
         unused_imports = []
@@ -352,38 +893,38 @@ class SkinClusterIO(QtWidgets.QDialog):
         )
         # 获取蒙皮函数集
         skin_fn = self.get_skinCluster_fn(skinCluster.name())
-        # 获取影响对象DagPath列表
-        influence_paths = skin_fn.influenceObjects()
         # 获取每个印象对象影响的点数量（几何体顶点数量）
         num_components_perInfluence = int(len(weights) / num_influence)
 
-        # 获取影响对象映射(骨骼名称：索引)
-        influence_map = {
-            om.MFnDependencyNode(influence_paths[i].node()).name(): i
-            for i in range(len(influence_paths))
-        }
+        if influences is None:
+            influences = list(data["weights"].keys())
+        # 导入的影响对象 -> 当前蒙皮影响索引，与 pSkinPack 使用相同的命名空间匹配规则
+        columns = skin_pack.match_influences(influences, self.influence_names(skin_fn))
+        # 一次性将当前权重转换为 (V, I) 矩阵
+        dense = skin_pack.as_float_array(weights).reshape(-1, num_influence)
         # 遍历导入数据的权重列表: joint_name : weight_list
-        for imported_influence, weight_val in data["weights"].items():
-            # 根据导入数据的骨骼名称获取当前蒙皮的影响索引
-            influence_index = influence_map.get(imported_influence)
-            if influence_index is not None:
+        for imported_influence, influence_index, weight_val in zip(
+            influences, columns.tolist(), data["weights"].values()
+        ):
+            if influence_index >= 0:
                 if compressed:
-                    # 遍历几何体顶点数量
-                    for j in range(num_components_perInfluence):
-                        # 字典的get方法，参数1：要获取值的键；参数2：当键不存在时返回的默认值
-                        weight = weight_val.get(j, weight_val.get(str(j), 0.0))
-                        # 设置权重值,weights是一个全局权重字典，需要计算权重索引位置
-                        weights[j * num_influence + influence_index] = weight
+                    # 整列写入，缺失的顶点权重为 0.0
+                    dense[:, influence_index] = skin_pack.influence_dict_to_column(
+                        weight_val, num_components_perInfluence
+                    )
                 else:
-                    for j, weight in enumerate(weight_val):
-                        weights[j * num_influence + influence_index] = weight
+                    values = np.asarray(weight_val, dtype=np.float64)
+                    values = values[:num_components_perInfluence]
+                    dense[: len(values), influence_index] = values
             else:
                 unused_imports.append(imported_influence)
+        if unused_imports:
+            pm.displayWarning(
+                f"{skinCluster.name()}: influences not found in skinCluster: {unused_imports}"
+            )
+        weights = self.to_double_array(dense)
         # 权重分配
-        influence_indices = om.MIntArray()
-        influence_indices.setLength(num_influence)
-        for i in range(num_influence):
-            influence_indices[i] = i
+        influence_indices = om.MIntArray(list(range(num_influence)))
         """最终设置权重
         setWeights(
             shape, components, influences, weights, normalize=True, returnOldWeights=False
@@ -413,6 +954,57 @@ class SkinClusterIO(QtWidgets.QDialog):
             dagPath, components, blendWeights
         )
 
+    @staticmethod
+    def timed(timing: dict, key: str, func, *args):
+        """执行函数并将耗时记录到 timing[key]"""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            timing[key] = time.perf_counter() - start
+            timing["end"] = time.perf_counter()
+
+    @staticmethod
+    def report_timings(label: str, timings: list):
+        """输出每个Mesh的耗时汇总"""
+        if not timings:
+            return
+        keys = [k for k in ("read", "encode", "decode", "write") if k in timings[0]]
+        header = f"{'object':<40}" + "".join(f"{k:>10}" for k in keys) + f"{'total':>10}"
+        lines = [f"{label} timing summary (seconds):", header]
+        for timing in timings:
+            row = f"{timing['objName']:<40}"
+            row += "".join(f"{timing.get(k, 0.0):>10.3f}" for k in keys)
+            row += f"{timing.get('end', timing['start']) - timing['start']:>10.3f}"
+            lines.append(row)
+        wall = max(t.get("end", t["start"]) for t in timings) - timings[0]["start"]
+        lines.append(f"{len(timings)} objects, wall time {wall:.3f}s")
+        print("\n".join(lines))
+        pm.displayInfo(f"{label}ed {len(timings)} objects in {wall:.3f}s")
+
+    @staticmethod
+    def progress_begin(title: str, count: int):
+        """创建可中断进度窗口"""
+        try:
+            pm.progressWindow(endProgress=True)
+        except Exception:
+            pass  # 如果没有窗口，则忽略错误
+        pm.progressWindow(
+            title=title, isInterruptable=True, maxValue=max(count, 1), status="Starting..."
+        )
+
+    @staticmethod
+    def progress_step(step: int, status: str) -> bool:
+        """更新进度窗口，返回用户是否按下 Esc 取消"""
+        if pm.progressWindow(query=True, isCancelled=True):
+            return True
+        pm.progressWindow(edit=True, progress=step, status=status)
+        return False
+
+    @staticmethod
+    def progress_end():
+        pm.progressWindow(endProgress=True)
+
     @staticmethod
     def get_skin_cluster(obj: pm.nodetypes.Transform, first_sc: bool = False):
         """
@@ -426,7 +1018,7 @@ class SkinClusterIO(QtWidgets.QDialog):
         skin_cluster = None  # 用于储存蒙皮节点
         try:
             # 如果节点的形状节点支持蒙皮
-            if pm.nodeType(obj.getShape()) in ["mesh", "nurbsCurve", "nurbsSurface"]:
+            if pm.nodeType(obj.getShape()) in SkinClusterIO.SKINNABLE_TYPES:
                 # 遍历所有的形状节点
                 for shape in obj.getShapes():
                     # 获取蒙皮节点
@@ -445,6 +1037,50 @@ class SkinClusterIO(QtWidgets.QDialog):
             pm.displayWarning(f"{obj.name()} is not supported.")
         return skin_cluster
 
+    @staticmethod
+    def get_component_count(obj_node: nt.Transform) -> int:
+        """获取对象可蒙皮组件（顶点/CV）的数量"""
+        # 获取形状节点
+        shapes = obj_node.getShapes(noIntermediate=True)
+        # 根据类型获取其组件数量
+        if isinstance(obj_node.getShape(), pm.nodetypes.Mesh):
+            return pm.polyEvaluate(shapes, vertex=True)
+        elif isinstance(obj_node.getShape(), pm.nodetypes.NurbsSurface):
+            # if nurbs, count the cvs instead of the vertices.
+            return sum([len(shape.cv) for shape in shapes])
+        elif isinstance(obj_node.getShape(), pm.nodetypes.NurbsCurve):
+            return sum(1 for _ in shapes[0].cv)
+        elif isinstance(obj_node.getShape(), pm.nodetypes.Lattice):
+            lattice = shapes[0]
+            return (
+                lattice.sDivisions.get()
+                * lattice.tDivisions.get()
+                * lattice.uDivisions.get()
+            )
+        return 0
+
+    @staticmethod
+    def to_double_array(values: np.ndarray) -> om.MDoubleArray:
+        """将 numpy 数组按行优先顺序转换为 MDoubleArray，不构建中间的 float 列表.
+        Maya API 2.0 的 MDoubleArray 不提供缓冲区协议，无法整块拷贝内存；
+        通过 memoryview 传入时由C层逐项读取，省去 tolist() 的整份列表.
+        """
+        view = memoryview(np.ascontiguousarray(values, dtype=np.float64).ravel())
+        try:
+            return om.MDoubleArray(view)
+        except TypeError:
+            # 只接受 list/tuple 的 Maya 版本
+            return om.MDoubleArray(view.tolist())
+
+    @staticmethod
+    def influence_names(skin_fn: oma.MFnSkinCluster) -> list:
+        """获取蒙皮节点的影响对象名称，按影响索引排列"""
+        influence_paths = skin_fn.influenceObjects()
+        return [
+            om.MFnDependencyNode(influence_paths[i].node()).name()
+            for i in range(len(influence_paths))
+        ]
+
     @staticmethod
     def get_skinCluster_fn(skinCluster_name: str):
         """获取蒙皮节点函数集"""
@@ -454,29 +1090,121 @@ class SkinClusterIO(QtWidgets.QDialog):
         return oma.MFnSkinCluster(skinCluster_obj)
 
     def get_geometry_components(self, skinCluster_node: nt.SkinCluster):
-        # 获取与skin cluster连接的最近几何体
-        geo_types = ["mesh", "nurbsSurface", "nurbsCurve"]
-        for type in geo_types:
-            # 找到与蒙皮节点连接的对应属性对象
-            # 参数 et=True 表示精确类型匹配，t=t 指定几何体类型
-            objs = skinCluster_node.listConnections(exactType=True, type=type)
-            # 如果对象存在，获取其第一个形状节点名称
-            if objs:
-                geo_name = objs[0].getShape().name()
-            # 获取几何体DagPath
-            sel_list = om.MSelectionList()
-            sel_list.add(geo_name)
-            geo_dagpath = sel_list.getDagPath(0)
-            # 获取几何体组件（所有顶点）
-            mesh_fn = om.MFnMesh(geo_dagpath)  # 创建Mesh函数集
-            # 创建单索引组件函数集
+        """获取蒙皮节点输出几何体的DagPath和全部可蒙皮组件.
+        Returns:
+            tuple: (om.MDagPath, om.MObject)
+        """
+        info = self.resolve_components(skinCluster_node)
+        return info["dag_path"], info["components"]
+
+    def resolve_components(self, skinCluster_node: nt.SkinCluster) -> dict:
+        """按几何体类型一次性创建完整的单/双/三索引组件，并按形状节点缓存.
+        Returns:
+            dict: {"dag_path", "components", "type", "dims", "count"}
+        """
+        skin_fn = self.get_skinCluster_fn(skinCluster_node.name())
+        # 蒙皮节点的第一个输出几何体
+        dag_path = skin_fn.getPathAtIndex(0)
+        key = dag_path.fullPathName()
+        info = self.component_cache.get(key)
+        if info is not None:
+            return info
+        api_type = dag_path.apiType()
+        if api_type == om.MFn.kMesh:
+            dims = (om.MFnMesh(dag_path).numVertices,)
             components_fn = om.MFnSingleIndexedComponent()
-            # 创建单索引组件对象（空顶点集合），类型为Mesh顶点组件，返回MObject
             components = components_fn.create(om.MFn.kMeshVertComponent)
-            # 往这个组件对象里添加具体的顶点 ID。
-            components_fn.addElements(range(mesh_fn.numVertices))
-        # 返回
-        return geo_dagpath, components
+        elif api_type == om.MFn.kNurbsCurve:
+            dims = (om.MFnNurbsCurve(dag_path).numCVs,)
+            components_fn = om.MFnSingleIndexedComponent()
+            components = components_fn.create(om.MFn.kCurveCVComponent)
+        elif api_type == om.MFn.kNurbsSurface:
+            surface_fn = om.MFnNurbsSurface(dag_path)
+            dims = (surface_fn.numCVsInU, surface_fn.numCVsInV)
+            components_fn = om.MFnDoubleIndexedComponent()
+            components = components_fn.create(om.MFn.kSurfaceCVComponent)
+        elif api_type == om.MFn.kLattice:
+            node_fn = om.MFnDependencyNode(dag_path.node())
+            dims = tuple(
+                node_fn.findPlug(f"{axis}Divisions", False).asInt()
+                for axis in "stu"
+            )
+            components_fn = om.MFnTripleIndexedComponent()
+            components = components_fn.create(om.MFn.kLatticeComponent)
+        else:
+            raise RuntimeError(
+                f"{dag_path.partialPathName()}: unsupported skin geometry type {dag_path.apiTypeStr}"
+            )
+        # 标记为完整组件，无需逐个添加元素
+        components_fn.setCompleteData(*dims)
+        info = {
+            "dag_path": dag_path,
+            "components": components,
+            "type": api_type,
+            "dims": dims,
+            "count": int(np.prod(dims)),
+        }
+        self.component_cache[key] = info
+        return info
+
+    def get_subset_components(self, skinCluster_node, vertex_ids) -> om.MObject:
+        """根据扁平的组件索引（与权重顺序一致）创建部分组件.
+        Args:
+            skinCluster_node (nt.SkinCluster): 蒙皮节点
+            vertex_ids (np.ndarray): 扁平组件索引
+        Returns:
+            om.MObject: 组件
+        """
+        info = self.resolve_components(skinCluster_node)
+        ids = np.asarray(vertex_ids, dtype=np.int64)
+        dims = info["dims"]
+        if info["type"] == om.MFn.kNurbsSurface:
+            # CV 扁平索引 = u * numCVsInV + v
+            components_fn = om.MFnDoubleIndexedComponent()
+            components = components_fn.create(om.MFn.kSurfaceCVComponent)
+            elements = np.stack([ids // dims[1], ids % dims[1]], axis=1)
+        elif info["type"] == om.MFn.kLattice:
+            # 晶格点扁平索引 = s + t * sDiv + u * sDiv * tDiv
+            components_fn = om.MFnTripleIndexedComponent()
+            components = components_fn.create(om.MFn.kLatticeComponent)
+            elements = np.stack(
+                [ids % dims[0], (ids // dims[0]) % dims[1], ids // (dims[0] * dims[1])],
+                axis=1,
+            )
+        else:
+            components_fn = om.MFnSingleIndexedComponent()
+            component_type = (
+                om.MFn.kMeshVertComponent
+                if info["type"] == om.MFn.kMesh
+                else om.MFn.kCurveCVComponent
+            )
+            components = components_fn.create(component_type)
+            elements = ids
+        components_fn.addElements(elements.tolist())
+        return components
+
+    def get_rest_geometry(self, skinCluster_node: nt.SkinCluster):
+        """获取蒙皮节点的输入（静止姿态）几何体的顶点位置和三角形（仅Mesh）.
+        Returns:
+            tuple: (points (V, 3) float32 | None, triangles (T, 3) int32 | None)
+        """
+        skin_fn = self.get_skinCluster_fn(skinCluster_node.name())
+        input_geos = skin_fn.getInputGeometry()
+        if not len(input_geos):
+            return None, None
+        if not input_geos[0].hasFn(om.MFn.kMesh):
+            # 曲线/曲面/晶格只记录控制点位置，传递权重时使用最近点模式
+            positions = om.MItGeometry(input_geos[0]).allPositions(om.MSpace.kObject)
+            points = np.array(positions, dtype=np.float32).reshape(-1, 4)[:, :3]
+            return points, None
+        mesh_fn = om.MFnMesh(input_geos[0])
+        # MFloatPoint 为 (x, y, z, w) 序列
+        raw_points = mesh_fn.getFloatPoints(om.MSpace.kObject)
+        points = np.array(raw_points, dtype=np.float32).reshape(-1, 4)[:, :3]
+        _, tri_vertices = mesh_fn.getTriangles()
+        triangles = np.fromiter(tri_vertices, np.int32, len(tri_vertices))
+        triangles = triangles.reshape(-1, 3)
+        return points, triangles
 
     def get_current_weights(
         self,
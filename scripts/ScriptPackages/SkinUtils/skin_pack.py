@@ -0,0 +1,558 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   skin_pack.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   .pSkinPack 列式二进制蒙皮权重容器的读写。
+
+文件布局（小端序）:
+    [0:16)      文件头: MAGIC(8) + 版本号 uint32 + 保留 uint32
+    [16:...)    数据块: 每个数组按 ALIGN 字节对齐连续存放
+    [...:-24)   索引: utf-8 JSON，记录字符串表、每个Mesh的元数据与数组位置
+    [-24:]      文件尾: 索引偏移 uint64 + 索引长度 uint64 + INDEX_MAGIC(8)
+
+每个Mesh的权重以CSR稀疏格式存放:
+    offsets  (int64,   V+1)  第 v 个顶点的权重位于 [offsets[v], offsets[v+1])
+    indices  (int32,   nnz)  影响对象在该Mesh影响列表中的局部索引
+    weights  (float32, nnz)  权重值
+    blend    (float32, V)    双四元数混合权重
+影响对象名称统一存放在字符串表中，Mesh只记录字符串表索引（influences）。
+读取时通过 mmap + numpy.frombuffer 直接得到数组视图，不做任何逐顶点的Python对象构建。
+数组也可以用 zlib 压缩存放（codec="zlib"），此时读取会解压出一份拷贝。
+
+每个Mesh记录一个内容哈希（hash），更新模式下只重写哈希变化的Mesh:
+新数据块、新索引和文件尾都追加在文件末尾，旧数据块和旧索引成为废弃空间（deadBytes），
+废弃空间超过有效数据时自动压缩整理。旧索引在新文件尾写完之前保持完整，
+更新中途中断时，读取会向前查找最后一个完整的文件尾。
+早期版本写入的数组描述没有 size 和 codec，按未压缩处理并由 dtype 和 shape 计算长度。
+"""
+
+import copy
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b"PSKNPACK"
+INDEX_MAGIC = b"PSKNIDX\0"
+VERSION = 1
+ALIGN = 16
+COMPRESS_LEVEL = 6
+
+_HEADER = struct.Struct("<8sII")
+_TRAILER = struct.Struct("<QQ8s")
+
+
+class SkinPackError(RuntimeError):
+    """pSkinPack 文件格式错误"""
+
+
+def _align(fp) -> int:
+    """将文件指针补零对齐到 ALIGN 字节，返回对齐后的位置"""
+    pos = fp.tell()
+    pad = (-pos) % ALIGN
+    if pad:
+        fp.write(b"\0" * pad)
+    return pos + pad
+
+
+def encode_array(array: np.ndarray, compress: bool = False) -> tuple:
+    """将数组编码为字节块，返回 (payload, 描述)。
+    zlib 压缩时会释放GIL，可以放在线程池中执行。
+    """
+    array = np.ascontiguousarray(array)
+    payload = array.tobytes()
+    codec = "raw"
+    if compress:
+        payload = zlib.compress(payload, COMPRESS_LEVEL)
+        codec = "zlib"
+    desc = {
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+        "codec": codec,
+        "size": len(payload),
+    }
+    return payload, desc
+
+
+def _array_size(desc: dict) -> int:
+    """数组数据块的字节数，早期版本的描述没有 size 时按未压缩数组计算"""
+    if "size" in desc:
+        return desc["size"]
+    return np.dtype(desc["dtype"]).itemsize * int(np.prod(desc["shape"], dtype=np.int64))
+
+
+def content_hash(record: dict) -> str:
+    """计算Mesh记录的内容哈希：顶点数量、影响对象列表、蒙皮属性与权重摘要。
+    Args:
+        record (dict): 含 "dense" 权重矩阵的Mesh记录
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    meta = [
+        record["vertexCount"],
+        record["influences"],
+        record.get("skinningMethod"),
+        record.get("normalizeWeights"),
+    ]
+    digest.update(json.dumps(meta).encode("utf-8"))
+    digest.update(np.ascontiguousarray(record["dense"], dtype=np.float64).tobytes())
+    for key in sorted(record["arrays"]):
+        digest.update(key.encode("utf-8"))
+        digest.update(np.ascontiguousarray(record["arrays"][key]).tobytes())
+    return digest.hexdigest()
+
+
+def encode_mesh(record: dict, compress: bool = False) -> dict:
+    """编码单个Mesh记录，纯 numpy/zlib 计算，不访问Maya，可在工作线程中执行。
+    记录中若包含 "dense" (V, I) 权重矩阵，会先转换为CSR数组。
+    Args:
+        record (dict): Mesh记录，格式见 write_pack
+        compress (bool): 是否使用 zlib 压缩数组
+    Returns:
+        dict: arrays 的值被替换为 (payload, 描述) 的记录
+    """
+    encoded = dict(record)
+    arrays = dict(record["arrays"])
+    dense = encoded.pop("dense", None)
+    if dense is not None:
+        arrays["offsets"], arrays["indices"], arrays["weights"] = dense_to_csr(dense)
+    encoded["arrays"] = {
+        key: encode_array(array, compress) for key, array in arrays.items()
+    }
+    return encoded
+
+
+def as_float_array(values, dtype=np.float64) -> np.ndarray:
+    """将 MDoubleArray 等序列一次性转换为可写的 numpy 数组。
+    支持缓冲区协议的对象（numpy 数组、array.array、bytes）按内存整块拷贝；
+    Maya API 2.0 的 MDoubleArray 不提供缓冲区协议，只能在C层逐项读取一次。
+    """
+    try:
+        buffer = memoryview(values)
+    except TypeError:
+        return np.fromiter(values, dtype=dtype, count=len(values))
+    return np.array(buffer, dtype=dtype)
+
+
+def strip_namespace(name: str) -> str:
+    """去掉名称中的DAG路径和命名空间"""
+    return name.rsplit("|", 1)[-1].rsplit(":", 1)[-1]
+
+
+def match_influences(file_influences, scene_influences) -> np.ndarray:
+    """将文件中的影响对象匹配到蒙皮节点的影响索引。
+    先按完整名称匹配，找不到时两边都去掉命名空间再匹配，
+    导出时名称不带命名空间，导入到带命名空间的绑定时也能找到。
+    Args:
+        file_influences (list): 文件中的影响对象名称
+        scene_influences (list): 蒙皮节点的影响对象名称，按影响索引排列
+    Returns:
+        np.ndarray: 每个文件影响对象的影响索引，-1 表示找不到
+    """
+    exact = {}
+    stripped = {}
+    for i, name in enumerate(scene_influences):
+        exact.setdefault(name, i)
+        stripped.setdefault(strip_namespace(name), i)
+    return np.array(
+        [
+            exact.get(name, stripped.get(strip_namespace(name), -1))
+            for name in file_influences
+        ],
+        dtype=np.int64,
+    )
+
+
+def dense_to_csr(dense: np.ndarray):
+    """将 (V, I) 的稠密权重矩阵转换为CSR数组，跳过 0 权重。
+    Args:
+        dense (np.ndarray): (V, I) 权重矩阵
+    Returns:
+        tuple: (offsets int64, indices int32, weights float32)
+    """
+    mask = dense != 0
+    # 按行优先顺序取出非零项，天然满足CSR的顶点顺序
+    inf_ids = np.nonzero(mask)[1]
+    offsets = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.count_nonzero(mask, axis=1), out=offsets[1:])
+    return offsets, inf_ids.astype(np.int32), dense[mask].astype(np.float32)
+
+
+def scatter_csr(
+    dense: np.ndarray, offsets, indices, weights, columns, rows=None, vertex_ids=None
+) -> np.ndarray:
+    """将CSR数组散射到 (V, I) 的稠密矩阵中。
+    被映射到的列会先清零，未映射的列保持原值。
+    Args:
+        dense (np.ndarray): 目标权重矩阵，原地修改
+        offsets (np.ndarray): 顶点偏移
+        indices (np.ndarray): 文件中的局部影响索引
+        weights (np.ndarray): 权重值
+        columns (np.ndarray): 局部影响索引 -> 目标列的映射，-1 表示丢弃
+        rows (np.ndarray, optional): 每个非零项所属的顶点，为空时由 offsets 计算
+        vertex_ids (np.ndarray, optional): 只写入这些顶点，dense 的第 k 行对应 vertex_ids[k]
+    Returns:
+        np.ndarray: dense
+    """
+    columns = np.asarray(columns, dtype=np.int64)
+    mapped = columns[columns >= 0]
+    dense[:, mapped] = 0.0
+    if rows is None:
+        # 每个非零项所属的顶点
+        rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    cols = columns[indices]
+    if vertex_ids is not None:
+        # 文件顶点 -> dense 行号，不在子集中的顶点为 -1
+        row_map = np.full(len(offsets) - 1, -1, dtype=np.int64)
+        row_map[np.asarray(vertex_ids, dtype=np.int64)] = np.arange(len(vertex_ids))
+        rows = row_map[rows]
+        keep = (cols >= 0) & (rows >= 0)
+    else:
+        keep = cols >= 0
+    dense[rows[keep], cols[keep]] = weights[keep]
+    return dense
+
+
+def dense_to_influence_dicts(dense: np.ndarray) -> list:
+    """将 (V, I) 的稠密权重矩阵按影响对象拆分为 {vtx_index: weight} 字典，跳过 0 权重。
+    与逐顶点的字典推导结果完全一致（键升序、值为原始 float64）。
+    Args:
+        dense (np.ndarray): (V, I) 权重矩阵
+    Returns:
+        list: 长度为 I 的字典列表
+    """
+    # 转置后一次性取出非零项，结果按 影响对象 -> 顶点 的顺序排列
+    dense_t = dense.T
+    mask_t = dense_t != 0
+    vtx_ids = np.nonzero(mask_t)[1]
+    values = dense_t[mask_t]
+    splits = np.cumsum(np.count_nonzero(mask_t, axis=1))[:-1]
+    return [
+        dict(zip(vtx.tolist(), val.tolist()))
+        for vtx, val in zip(np.split(vtx_ids, splits), np.split(values, splits))
+    ]
+
+
+def influence_dict_to_column(weight_val: dict, num_vertices: int) -> np.ndarray:
+    """将单个影响对象的压缩权重 {vtx_index: weight} 散射为列向量。
+    Args:
+        weight_val (dict): 压缩格式权重，json读取时键为字符串
+        num_vertices (int): 顶点数量
+    Returns:
+        np.ndarray: float64 列向量，缺失的顶点为 0
+    """
+    column = np.zeros(num_vertices, dtype=np.float64)
+    vtx_ids = np.fromiter(map(int, weight_val.keys()), np.int64, len(weight_val))
+    values = np.fromiter(weight_val.values(), np.float64, len(weight_val))
+    keep = (vtx_ids >= 0) & (vtx_ids < num_vertices)
+    column[vtx_ids[keep]] = values[keep]
+    return column
+
+
+def write_pack(file_path: str, meshes: list, compress: bool = False) -> None:
+    """写入 pSkinPack 文件。
+    Args:
+        file_path (str): 文件路径
+        meshes (list): 每个元素为一个Mesh的记录字典:
+            {
+                "objName": str, "nameSpace": str, "skinClsName": str,
+                "skinningMethod": int, "normalizeWeights": int,
+                "vertexCount": int, "influences": [str, ...],
+                "arrays": {"offsets": ndarray, "indices": ndarray,
+                           "weights": ndarray, "blend": ndarray},
+            }
+        compress (bool): 是否使用 zlib 压缩数组
+    """
+    with PackWriter(file_path) as writer:
+        for mesh in meshes:
+            writer.add_mesh(encode_mesh(mesh, compress))
+
+
+class PackWriter:
+    """按顺序流式写入 pSkinPack 文件，Mesh数据块写完即落盘，关闭时写入索引。
+    新文件先写入 file_path + ".tmp"，关闭时替换目标文件，放弃写入只删除临时文件。
+    update=True 时打开已有文件，新写入的同名Mesh会替换旧记录，其余Mesh保持不动。
+    更新只在文件末尾追加，关闭时新索引落盘后旧索引才失效，不会覆盖任何旧数据。
+
+    Examples:
+        with PackWriter(path) as writer:
+            writer.add_mesh(encode_mesh(record))
+    """
+
+    def __init__(self, file_path: str, update: bool = False):
+        self.file_path = file_path
+        self.update = update
+        self._original_size = None
+        self._changed = False
+        if update:
+            with SkinPackReader(file_path) as pack:
+                self.index = copy.deepcopy(pack.index)
+                index_offset = pack.index_offset
+            self._string_ids = {name: i for i, name in enumerate(self.index["strings"])}
+            # 在文件末尾追加，旧索引和文件尾保持完整，直到新文件尾写完
+            self._fp = open(file_path, "r+b")
+            self._original_size = self._fp.seek(0, os.SEEK_END)
+            # 新索引写入后，旧索引、旧文件尾（以及中断留下的尾部数据）都成为废弃空间
+            self.index["deadBytes"] = (
+                self.index.get("deadBytes", 0) + self._original_size - index_offset
+            )
+        else:
+            self._string_ids = {}
+            self.index = {"version": VERSION, "strings": [], "meshes": [], "deadBytes": 0}
+            # 先写入临时文件，关闭时再替换目标文件，取消或失败时已有文件保持不变
+            self._fp = open(self._tmp_path, "wb")
+            self._fp.write(_HEADER.pack(MAGIC, VERSION, 0))
+
+    @property
+    def _tmp_path(self) -> str:
+        return self.file_path + ".tmp"
+
+    def add_mesh(self, encoded: dict) -> None:
+        """写入一个由 encode_mesh 编码的Mesh记录"""
+        entry = {k: v for k, v in encoded.items() if k not in ("arrays", "influences")}
+        # 影响对象名称写入字符串表，Mesh只记录索引
+        entry["influences"] = [
+            self._string_ids.setdefault(name, len(self._string_ids))
+            for name in encoded["influences"]
+        ]
+        entry["arrays"] = {}
+        for key, (payload, desc) in encoded["arrays"].items():
+            entry["arrays"][key] = dict(desc, offset=_align(self._fp))
+            self._fp.write(payload)
+        self._changed = True
+        meshes = self.index["meshes"]
+        for i, old in enumerate(meshes):
+            if self.update and old["objName"] == entry["objName"]:
+                # 替换旧记录，旧数据块计入废弃空间
+                self.index["deadBytes"] += sum(
+                    _array_size(d) for d in old["arrays"].values()
+                )
+                meshes[i] = entry
+                break
+        else:
+            meshes.append(entry)
+
+    def close(self) -> None:
+        if self._fp is None:
+            return
+        if self.update and not self._changed:
+            # 没有任何改动，原文件保持不变
+            self._fp.close()
+            self._fp = None
+            return
+        strings = sorted(self._string_ids, key=self._string_ids.get)
+        self.index["strings"] = strings
+        _write_index(self._fp, self.index)
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._fp.close()
+        self._fp = None
+        if not self.update:
+            os.replace(self._tmp_path, self.file_path)
+
+    def abort(self) -> None:
+        """放弃写入：删除临时文件，更新模式下截掉追加的数据，原索引仍是文件尾"""
+        if self._fp is None:
+            return
+        if self.update:
+            self._fp.truncate(self._original_size)
+            self._fp.close()
+            self._fp = None
+            return
+        self._fp.close()
+        self._fp = None
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def compact_pack(file_path: str) -> int:
+    """去掉更新模式留下的废弃数据块，原样拷贝有效数据块重写文件。
+    Returns:
+        int: 释放的字节数
+    """
+    # 写入器在读取器关闭之后才替换原文件，Windows 下不能替换仍被映射的文件
+    writer = PackWriter(file_path)
+    try:
+        with SkinPackReader(file_path) as pack:
+            freed = pack.index.get("deadBytes", 0)
+            _copy_meshes(pack, writer)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return freed
+
+
+def _copy_meshes(pack, writer) -> None:
+    """原样拷贝全部Mesh的数据块，不解压也不重新编码"""
+    for mesh in pack.meshes:
+        encoded = {k: v for k, v in mesh.items() if k != "arrays"}
+        encoded["influences"] = pack.influences(mesh)
+        encoded["arrays"] = {
+            key: (
+                pack.raw(mesh, key),
+                dict(
+                    {k: v for k, v in desc.items() if k != "offset"},
+                    codec=desc.get("codec", "raw"),
+                    size=_array_size(desc),
+                ),
+            )
+            for key, desc in mesh["arrays"].items()
+        }
+        writer.add_mesh(encoded)
+
+
+def needs_compaction(file_path: str) -> bool:
+    """废弃空间超过有效数据时需要压缩整理"""
+    with SkinPackReader(file_path) as pack:
+        dead = pack.index.get("deadBytes", 0)
+        live = sum(_array_size(d) for m in pack.meshes for d in m["arrays"].values())
+    return dead > live
+
+
+def _write_index(fp, index: dict) -> None:
+    """在当前位置写入索引和文件尾，并截断其后的旧数据"""
+    index_offset = _align(fp)
+    payload = json.dumps(index, sort_keys=True).encode("utf-8")
+    fp.write(payload)
+    fp.write(_TRAILER.pack(index_offset, len(payload), INDEX_MAGIC))
+    fp.truncate()
+
+
+class SkinPackReader:
+    """以内存映射方式读取 pSkinPack 文件。
+
+    Examples:
+        with SkinPackReader(path) as pack:
+            for mesh in pack.meshes:
+                offsets = pack.array(mesh, "offsets")
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._fp = open(file_path, "rb")
+        try:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+            self.index = self._read_index()
+        except Exception:
+            self.close()
+            raise
+        self.strings = self.index["strings"]
+        self.meshes = self.index["meshes"]
+
+    def _read_index(self) -> dict:
+        size = len(self._mm)
+        if size < _HEADER.size + _TRAILER.size:
+            raise SkinPackError(f"File too small: {self.file_path}")
+        magic, version, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SkinPackError(f"Not a pSkinPack file: {self.file_path}")
+        if version > VERSION:
+            raise SkinPackError(f"Unsupported pSkinPack version {version}")
+        self.recovered = False
+        index = self._parse_index(size)
+        # 更新中途中断时文件末尾是未完成的数据，向前查找最后一个完整的文件尾
+        end = size
+        while index is None:
+            found = self._mm.rfind(INDEX_MAGIC, 0, end - 1)
+            if found < 0:
+                raise SkinPackError(f"Corrupted pSkinPack index: {self.file_path}")
+            end = found + len(INDEX_MAGIC)
+            index = self._parse_index(end)
+            self.recovered = True
+        return index
+
+    def _parse_index(self, end: int):
+        """解析结束于 end 的文件尾及其索引，不完整时返回 None"""
+        trailer_pos = end - _TRAILER.size
+        if trailer_pos < _HEADER.size:
+            return None
+        index_offset, index_size, index_magic = _TRAILER.unpack_from(
+            self._mm, trailer_pos
+        )
+        if index_magic != INDEX_MAGIC or index_offset < _HEADER.size:
+            return None
+        if index_offset + index_size != trailer_pos:
+            return None
+        try:
+            index = json.loads(self._mm[index_offset:trailer_pos].decode("utf-8"))
+        except ValueError:
+            return None
+        self.index_offset = index_offset
+        return index
+
+    def influences(self, mesh: dict) -> list:
+        """获取Mesh的影响对象名称列表"""
+        return [self.strings[i] for i in mesh["influences"]]
+
+    def raw(self, mesh: dict, key: str) -> bytes:
+        """获取数组的原始（可能已压缩的）字节块"""
+        desc = mesh["arrays"][key]
+        return self._mm[desc["offset"] : desc["offset"] + _array_size(desc)]
+
+    def array(self, mesh: dict, key: str) -> np.ndarray:
+        """获取Mesh数组，未压缩时为只读视图（不拷贝），压缩时为解压后的拷贝"""
+        desc = mesh["arrays"][key]
+        dtype = np.dtype(desc["dtype"])
+        count = int(np.prod(desc["shape"], dtype=np.int64))
+        offset = desc["offset"]
+        if desc.get("codec", "raw") == "zlib":
+            raw = zlib.decompress(self._mm[offset : offset + desc["size"]])
+            view = np.frombuffer(raw, dtype=dtype, count=count)
+        else:
+            view = np.frombuffer(self._mm, dtype=dtype, count=count, offset=offset)
+        return view.reshape(desc["shape"])
+
+    def decode_mesh(self, mesh: dict) -> dict:
+        """读取Mesh的全部数组，并预先计算每个非零权重所属的顶点（rows）。
+        纯 numpy/zlib 计算，可在工作线程中预取。
+        Returns:
+            dict: {key: ndarray, ..., "rows": ndarray}
+        """
+        arrays = {key: self.array(mesh, key) for key in mesh["arrays"]}
+        offsets = arrays["offsets"]
+        arrays["rows"] = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        return arrays
+
+    def close(self) -> None:
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                # 仍有numpy视图引用该映射，交给垃圾回收释放
+                pass
+            self._mm = None
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def is_pack(file_path: str) -> bool:
+    """判断文件是否为 pSkinPack 格式"""
+    if not os.path.isfile(file_path):
+        return False
+    with open(file_path, "rb") as fp:
+        return fp.read(len(MAGIC)) == MAGIC
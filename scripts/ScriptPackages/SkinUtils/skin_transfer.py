@@ -0,0 +1,242 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   skin_transfer.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   顶点数量不一致时，根据 pSkinPack 中储存的静止姿态顶点位置传递权重。
+
+支持两种模式:
+    nearest      每个目标顶点直接复制最近源顶点的权重
+    barycentric  在最近源顶点的一环三角形中找到最近点，按重心坐标插值权重
+最近点查询优先使用 scipy.spatial.cKDTree，没有scipy时（Maya默认不带）使用
+numpy 实现的均匀网格，全部计算对目标顶点向量化。
+"""
+
+import numpy as np
+
+from SkinUtils import skin_pack
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+TRANSFER_MODES = ("nearest", "barycentric")
+# 分块处理目标顶点，限制 (块大小, 3, 影响数量) 中间数组的内存
+CHUNK_SIZE = 32768
+
+
+class UniformGrid:
+    """均匀网格最近点查询，按网格环逐层向外搜索，结果与暴力搜索一致。"""
+
+    def __init__(self, points: np.ndarray):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.lower = self.points.min(axis=0)
+        extent = self.points.max(axis=0) - self.lower
+        # 每个轴约 N^(1/3) 个格子
+        divisions = max(1, int(np.ceil(len(self.points) ** (1.0 / 3.0))))
+        self.cell_size = max(float(extent.max()) / divisions, 1e-6)
+        coords = self._cell_coords(self.points)
+        self.dims = coords.max(axis=0) + 1
+        keys = self._keys(coords)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def _cell_coords(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self.lower) / self.cell_size).astype(np.int64)
+
+    def _keys(self, coords: np.ndarray) -> np.ndarray:
+        return (coords[:, 0] * self.dims[1] + coords[:, 1]) * self.dims[2] + coords[:, 2]
+
+    @staticmethod
+    def _shell_offsets(radius: int) -> np.ndarray:
+        """返回切比雪夫距离恰好为 radius 的网格偏移"""
+        r = np.arange(-radius, radius + 1)
+        offsets = np.stack(np.meshgrid(r, r, r, indexing="ij"), axis=-1).reshape(-1, 3)
+        return offsets[np.abs(offsets).max(axis=1) == radius]
+
+    def query(self, targets: np.ndarray):
+        """查询每个目标点的最近源点
+        Returns:
+            tuple: (距离, 源点索引)
+        """
+        targets = np.asarray(targets, dtype=np.float64)
+        num = len(targets)
+        best_d2 = np.full(num, np.inf)
+        best_idx = np.zeros(num, dtype=np.int64)
+        # 网格外的目标点夹到边界格子，环搜索的下界依然成立
+        centers = np.clip(self._cell_coords(targets), 0, self.dims - 1)
+        active = np.arange(num)
+        radius = 0
+        max_radius = int(self.dims.max())
+        while len(active) and radius <= max_radius:
+            for offset in self._shell_offsets(radius):
+                cells = centers[active] + offset
+                valid = np.all((cells >= 0) & (cells < self.dims), axis=1)
+                if not valid.any():
+                    continue
+                rows = active[valid]
+                keys = self._keys(cells[valid])
+                start = np.searchsorted(self.sorted_keys, keys, side="left")
+                count = np.searchsorted(self.sorted_keys, keys, side="right") - start
+                for j in range(int(count.max())):
+                    has = count > j
+                    src = self.order[start[has] + j]
+                    tgt = rows[has]
+                    d2 = np.sum((self.points[src] - targets[tgt]) ** 2, axis=1)
+                    better = d2 < best_d2[tgt]
+                    best_d2[tgt[better]] = d2[better]
+                    best_idx[tgt[better]] = src[better]
+            # 未搜索的格子距离目标点至少 radius * cell_size
+            bound = radius * self.cell_size
+            active = active[best_d2[active] > bound * bound]
+            radius += 1
+        return np.sqrt(best_d2), best_idx
+
+
+def nearest_indices(source_points: np.ndarray, target_points: np.ndarray) -> np.ndarray:
+    """获取每个目标点最近的源点索引"""
+    if cKDTree is not None:
+        return cKDTree(source_points).query(target_points)[1]
+    return UniformGrid(source_points).query(target_points)[1]
+
+
+def closest_point_on_triangles(p, a, b, c):
+    """向量化计算点到三角形的最近点（平面内投影或三条边上的最近点）。
+    Args:
+        p, a, b, c (np.ndarray): (M, 3) 查询点与三角形顶点
+    Returns:
+        tuple: (距离平方 (M,), 重心坐标 (M, 3))
+    """
+    ab = b - a
+    ac = c - a
+    ap = p - a
+    d00 = np.einsum("ij,ij->i", ab, ab)
+    d01 = np.einsum("ij,ij->i", ab, ac)
+    d11 = np.einsum("ij,ij->i", ac, ac)
+    d20 = np.einsum("ij,ij->i", ap, ab)
+    d21 = np.einsum("ij,ij->i", ap, ac)
+    denom = d00 * d11 - d01 * d01
+    safe = np.where(np.abs(denom) > 1e-12, denom, 1.0)
+    v = (d11 * d20 - d01 * d21) / safe
+    w = (d00 * d21 - d01 * d20) / safe
+    u = 1.0 - v - w
+    bary = np.stack([u, v, w], axis=1)
+    inside = (u >= 0) & (v >= 0) & (w >= 0) & (np.abs(denom) > 1e-12)
+    proj = u[:, None] * a + v[:, None] * b + w[:, None] * c
+    dist2 = np.where(inside, np.sum((p - proj) ** 2, axis=1), np.inf)
+    # 投影落在三角形外时，最近点位于某条边上
+    verts = (a, b, c)
+    for i0, i1 in ((0, 1), (1, 2), (2, 0)):
+        e0 = verts[i0]
+        edge = verts[i1] - e0
+        length2 = np.maximum(np.einsum("ij,ij->i", edge, edge), 1e-12)
+        t = np.clip(np.einsum("ij,ij->i", p - e0, edge) / length2, 0.0, 1.0)
+        d2 = np.sum((p - (e0 + t[:, None] * edge)) ** 2, axis=1)
+        better = d2 < dist2
+        dist2 = np.where(better, d2, dist2)
+        edge_bary = np.zeros_like(bary)
+        edge_bary[:, i0] = 1.0 - t
+        edge_bary[:, i1] = t
+        bary = np.where(better[:, None], edge_bary, bary)
+    return dist2, bary
+
+
+def barycentric_lookup(source_points, triangles, target_points):
+    """在最近源顶点的一环三角形中寻找最近点。
+    Args:
+        source_points (np.ndarray): (N, 3) 源顶点
+        triangles (np.ndarray): (T, 3) 源三角形顶点索引
+        target_points (np.ndarray): (M, 3) 目标顶点
+    Returns:
+        tuple: (三角形顶点索引 (M, 3), 重心坐标 (M, 3))
+    """
+    source_points = np.asarray(source_points, dtype=np.float64)
+    target_points = np.asarray(target_points, dtype=np.float64)
+    triangles = np.asarray(triangles, dtype=np.int64)
+    nearest = nearest_indices(source_points, target_points)
+    # 顶点 -> 三角形 的CSR邻接表
+    flat = triangles.ravel()
+    tri_of = np.argsort(flat, kind="stable") // 3
+    counts = np.bincount(flat, minlength=len(source_points))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    num = len(target_points)
+    # 默认退化为最近顶点
+    best_tri = np.repeat(nearest[:, None], 3, axis=1)
+    best_bary = np.zeros((num, 3))
+    best_bary[:, 0] = 1.0
+    best_d2 = np.sum((source_points[nearest] - target_points) ** 2, axis=1)
+    valence = counts[nearest]
+    for k in range(int(valence.max()) if num else 0):
+        rows = np.nonzero(valence > k)[0]
+        tris = triangles[tri_of[starts[nearest[rows]] + k]]
+        d2, bary = closest_point_on_triangles(
+            target_points[rows],
+            source_points[tris[:, 0]],
+            source_points[tris[:, 1]],
+            source_points[tris[:, 2]],
+        )
+        better = d2 <= best_d2[rows]
+        rows = rows[better]
+        best_d2[rows] = d2[better]
+        best_tri[rows] = tris[better]
+        best_bary[rows] = bary[better]
+    return best_tri, best_bary
+
+
+def transfer_arrays(
+    arrays: dict,
+    target_points: np.ndarray,
+    mode: str = "barycentric",
+    num_influence: int = None,
+):
+    """将 SkinPackReader.decode_mesh 返回的数组传递到新的拓扑上。
+    Args:
+        arrays (dict): 源Mesh的数组，需包含 points，barycentric 模式还需 triangles
+        target_points (np.ndarray): (M, 3) 目标静止姿态顶点位置
+        mode (str): "nearest" 或 "barycentric"
+        num_influence (int, optional): 文件中该Mesh的影响对象数量
+    Returns:
+        dict: 与 decode_mesh 格式相同、按目标顶点排列的数组
+    """
+    if mode not in TRANSFER_MODES:
+        raise ValueError(f"Unknown transfer mode: {mode}")
+    source_points = np.asarray(arrays["points"], dtype=np.float64)
+    target_points = np.asarray(target_points, dtype=np.float64)
+    offsets = arrays["offsets"]
+    num_source = len(offsets) - 1
+    if num_influence is None:
+        indices = arrays["indices"]
+        num_influence = int(indices.max()) + 1 if len(indices) else 0
+    source_dense = np.zeros((num_source, num_influence), dtype=np.float32)
+    source_dense[arrays["rows"], arrays["indices"]] = arrays["weights"]
+    source_blend = np.asarray(arrays["blend"], dtype=np.float32)
+
+    if mode == "barycentric" and "triangles" in arrays and len(arrays["triangles"]):
+        tri, bary = barycentric_lookup(source_points, arrays["triangles"], target_points)
+    else:
+        nearest = nearest_indices(source_points, target_points)
+        tri = nearest[:, None]
+        bary = np.ones((len(target_points), 1))
+    bary = bary.astype(np.float32)
+
+    target_dense = np.empty((len(target_points), num_influence), dtype=np.float32)
+    for start in range(0, len(target_points), CHUNK_SIZE):
+        chunk = slice(start, start + CHUNK_SIZE)
+        target_dense[chunk] = np.einsum(
+            "mk,mki->mi", bary[chunk], source_dense[tri[chunk]]
+        )
+    target_blend = np.sum(bary * source_blend[tri], axis=1)
+
+    result = dict(arrays)
+    result["offsets"], result["indices"], result["weights"] = skin_pack.dense_to_csr(
+        target_dense
+    )
+    result["rows"] = np.repeat(
+        np.arange(len(target_points)), np.diff(result["offsets"])
+    )
+    result["blend"] = target_blend
+    result["points"] = target_points.astype(np.float32)
+    result.pop("triangles", None)
+    return result
@@ -0,0 +1,275 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   test_skin_pack.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   pSkinPack 文件格式与CSR转换的测试，不依赖Maya。
+"""
+
+import array
+
+import numpy as np
+import pytest
+
+from SkinUtils import skin_pack
+
+
+def sparse_weights(vertices: int, influences: int, seed: int = 0) -> np.ndarray:
+    """每个顶点最多 3 个非零权重、且和为 1 的权重矩阵"""
+    rng = np.random.default_rng(seed)
+    dense = np.zeros((vertices, influences))
+    for v in range(vertices):
+        count = rng.integers(1, min(influences, 3) + 1)
+        ids = rng.choice(influences, size=count, replace=False)
+        values = rng.random(len(ids)) + 0.1
+        dense[v, ids] = values / values.sum()
+    return dense
+
+
+def mesh_record(name: str, dense: np.ndarray, influences: list) -> dict:
+    return {
+        "objName": name,
+        "nameSpace": "",
+        "skinClsName": name + "_skinCluster",
+        "skinningMethod": 0,
+        "normalizeWeights": 1,
+        "vertexCount": dense.shape[0],
+        "influences": influences,
+        "dense": dense,
+        "arrays": {"blend": np.linspace(0, 1, dense.shape[0], dtype=np.float32)},
+    }
+
+
+def read_dense(pack, mesh: dict) -> np.ndarray:
+    arrays = pack.decode_mesh(mesh)
+    dense = np.zeros((mesh["vertexCount"], len(mesh["influences"])))
+    columns = np.arange(len(mesh["influences"]))
+    return skin_pack.scatter_csr(
+        dense, arrays["offsets"], arrays["indices"], arrays["weights"], columns,
+        rows=arrays["rows"],
+    )
+
+
+def assert_weights(pack, mesh: dict, dense: np.ndarray):
+    np.testing.assert_allclose(read_dense(pack, mesh), dense, atol=1e-7)
+
+
+def test_csr_round_trip():
+    dense = sparse_weights(50, 6)
+    dense[7] = 0.0
+    offsets, indices, weights = skin_pack.dense_to_csr(dense)
+    assert offsets[-1] == np.count_nonzero(dense)
+    assert offsets[8] == offsets[7]
+    restored = skin_pack.scatter_csr(
+        np.zeros_like(dense), offsets, indices, weights, np.arange(6)
+    )
+    np.testing.assert_allclose(restored, dense, atol=1e-7)
+
+
+def test_scatter_csr_columns_and_vertex_subset():
+    dense = sparse_weights(20, 4, seed=1)
+    offsets, indices, weights = skin_pack.dense_to_csr(dense)
+    # 文件第 2 个影响对象不在场景中，其余按倒序映射；未映射的第 4 列保持原值
+    columns = np.array([2, -1, 1, 0])
+    target = np.full((20, 5), 0.5)
+    skin_pack.scatter_csr(target, offsets, indices, weights, columns)
+    np.testing.assert_allclose(target[:, [2, 1, 0]], dense[:, [0, 2, 3]], atol=1e-7)
+    np.testing.assert_array_equal(target[:, [3, 4]], 0.5)
+
+    vertex_ids = np.array([3, 11, 19])
+    subset = skin_pack.scatter_csr(
+        np.zeros((3, 4)), offsets, indices, weights, np.arange(4), vertex_ids=vertex_ids
+    )
+    np.testing.assert_allclose(subset, dense[vertex_ids], atol=1e-7)
+
+
+def test_dense_to_influence_dicts_matches_legacy():
+    dense = sparse_weights(30, 5, seed=2)
+    expected = [
+        {v: dense[v, i] for v in range(dense.shape[0]) if dense[v, i] != 0}
+        for i in range(dense.shape[1])
+    ]
+    result = skin_pack.dense_to_influence_dicts(dense)
+    assert result == expected
+    assert all(list(d) == sorted(d) for d in result)
+    for i, weight_val in enumerate(result):
+        json_val = {str(k): v for k, v in weight_val.items()}
+        np.testing.assert_array_equal(
+            skin_pack.influence_dict_to_column(json_val, 30), dense[:, i]
+        )
+
+
+def test_as_float_array():
+    values = [0.25, 0.5, 0.0, 1.0]
+    expected = np.array(values)
+    # 缓冲区对象按内存拷贝，普通序列（MDoubleArray）逐项读取
+    for source in (array.array("d", values), np.array(values), values, tuple(values)):
+        result = skin_pack.as_float_array(source)
+        np.testing.assert_array_equal(result, expected)
+        assert result.dtype == np.float64
+        result[0] = 2.0
+    assert array.array("d", values)[0] == 0.25
+    np.testing.assert_array_equal(
+        skin_pack.as_float_array(array.array("f", values)), expected
+    )
+
+
+def test_match_influences_ignores_namespaces():
+    scene = ["rig:root", "rig:spine", "arm_L", "other:arm_L", "head"]
+    file_names = ["root", "arm_L", "spine", "head", "missing", "anim:head"]
+    assert skin_pack.match_influences(file_names, scene).tolist() == [0, 2, 1, 4, -1, 4]
+    # 完整名称优先于去掉命名空间的匹配
+    assert skin_pack.match_influences(["other:arm_L"], scene).tolist() == [3]
+    assert skin_pack.strip_namespace("|grp|rig:sub:jnt") == "jnt"
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_pack_round_trip(tmp_path, compress):
+    path = str(tmp_path / "skin.pSkinPack")
+    body = sparse_weights(40, 5, seed=3)
+    head = sparse_weights(12, 3, seed=4)
+    records = [
+        mesh_record("body", body, ["root", "spine", "arm_L", "arm_R", "head"]),
+        mesh_record("head", head, ["spine", "head", "jaw"]),
+    ]
+    skin_pack.write_pack(path, records, compress=compress)
+    assert skin_pack.is_pack(path)
+
+    with skin_pack.SkinPackReader(path) as pack:
+        # 影响对象名称在字符串表中只存一份
+        assert pack.strings == ["root", "spine", "arm_L", "arm_R", "head", "jaw"]
+        assert [m["objName"] for m in pack.meshes] == ["body", "head"]
+        for mesh, record in zip(pack.meshes, records):
+            assert pack.influences(mesh) == record["influences"]
+            assert mesh["vertexCount"] == record["vertexCount"]
+            codecs = {desc["codec"] for desc in mesh["arrays"].values()}
+            assert codecs == {"zlib" if compress else "raw"}
+            assert_weights(pack, mesh, record["dense"])
+            np.testing.assert_array_equal(
+                pack.array(mesh, "blend"), record["arrays"]["blend"]
+            )
+
+
+def test_not_a_pack(tmp_path):
+    path = tmp_path / "skin.json"
+    path.write_text("{}" + " " * 64)
+    assert not skin_pack.is_pack(str(path))
+    with pytest.raises(skin_pack.SkinPackError):
+        skin_pack.SkinPackReader(str(path))
+
+
+def test_failed_export_keeps_existing_file(tmp_path):
+    path = str(tmp_path / "skin.pSkinPack")
+    records = write_two_meshes(path)
+    with open(path, "rb") as fp:
+        original = fp.read()
+    with pytest.raises(RuntimeError):
+        with skin_pack.PackWriter(path) as writer:
+            writer.add_mesh(skin_pack.encode_mesh(records[1]))
+            raise RuntimeError("export canceled")
+    with open(path, "rb") as fp:
+        assert fp.read() == original
+    assert not (tmp_path / "skin.pSkinPack.tmp").exists()
+    # 正常关闭时替换目标文件
+    skin_pack.write_pack(path, records[1:])
+    with skin_pack.SkinPackReader(path) as pack:
+        assert [m["objName"] for m in pack.meshes] == ["head"]
+    assert not (tmp_path / "skin.pSkinPack.tmp").exists()
+
+
+def write_two_meshes(path: str) -> list:
+    records = [
+        mesh_record("body", sparse_weights(40, 3, seed=5), ["root", "spine", "head"]),
+        mesh_record("head", sparse_weights(12, 2, seed=6), ["head", "jaw"]),
+    ]
+    skin_pack.write_pack(path, records)
+    return records
+
+
+def test_update_appends_and_replaces(tmp_path):
+    path = str(tmp_path / "skin.pSkinPack")
+    records = write_two_meshes(path)
+    with open(path, "rb") as fp:
+        original = fp.read()
+    changed = mesh_record("head", sparse_weights(12, 3, seed=7), ["head", "jaw", "eye"])
+    writer = skin_pack.PackWriter(path, update=True)
+    writer.add_mesh(skin_pack.encode_mesh(changed))
+    # 新索引写入之前，原文件内容完全不变，仍可正常读取
+    with open(path, "rb") as fp:
+        assert fp.read(len(original)) == original
+    writer.close()
+
+    with skin_pack.SkinPackReader(path) as pack:
+        assert not pack.recovered
+        assert pack.index_offset > len(original)
+        assert [m["objName"] for m in pack.meshes] == ["body", "head"]
+        assert_weights(pack, pack.meshes[0], records[0]["dense"])
+        assert_weights(pack, pack.meshes[1], changed["dense"])
+        assert pack.influences(pack.meshes[1]) == ["head", "jaw", "eye"]
+        assert pack.index["deadBytes"] > 0
+
+    freed = skin_pack.compact_pack(path)
+    assert freed > 0
+    with skin_pack.SkinPackReader(path) as pack:
+        assert pack.index["deadBytes"] == 0
+        assert_weights(pack, pack.meshes[1], changed["dense"])
+
+
+def test_update_abort_and_no_change_keep_file(tmp_path):
+    path = str(tmp_path / "skin.pSkinPack")
+    write_two_meshes(path)
+    with open(path, "rb") as fp:
+        original = fp.read()
+    with skin_pack.PackWriter(path, update=True):
+        pass
+    writer = skin_pack.PackWriter(path, update=True)
+    record = mesh_record("head", sparse_weights(12, 2), ["a", "b"])
+    writer.add_mesh(skin_pack.encode_mesh(record))
+    writer.abort()
+    with open(path, "rb") as fp:
+        assert fp.read() == original
+
+
+def test_interrupted_update_reads_last_complete_index(tmp_path):
+    path = str(tmp_path / "skin.pSkinPack")
+    records = write_two_meshes(path)
+    # 追加了数据块和半个索引后中断，文件尾不完整
+    with open(path, "ab") as fp:
+        fp.write(b"\x01" * 100 + skin_pack.INDEX_MAGIC + b'{"meshes": [')
+    with skin_pack.SkinPackReader(path) as pack:
+        assert pack.recovered
+        assert_weights(pack, pack.meshes[0], records[0]["dense"])
+    # 在恢复出的索引上继续更新，中断留下的数据计入废弃空间
+    with skin_pack.PackWriter(path, update=True) as writer:
+        writer.add_mesh(skin_pack.encode_mesh(records[1]))
+    with skin_pack.SkinPackReader(path) as pack:
+        assert not pack.recovered
+        assert pack.index["deadBytes"] > 100
+        assert_weights(pack, pack.meshes[1], records[1]["dense"])
+
+
+def test_pack_without_size_and_codec(tmp_path):
+    # 早期版本的数组描述只有 dtype、shape 和 offset
+    path = str(tmp_path / "skin.pSkinPack")
+    records = write_two_meshes(path)
+    with skin_pack.SkinPackReader(path) as pack:
+        index = pack.index
+        data_end = pack.index_offset
+    for mesh in index["meshes"]:
+        for desc in mesh["arrays"].values():
+            del desc["size"], desc["codec"]
+    with open(path, "r+b") as fp:
+        fp.seek(data_end)
+        skin_pack._write_index(fp, index)
+
+    assert not skin_pack.needs_compaction(path)
+    with skin_pack.SkinPackReader(path) as pack:
+        blend = pack.meshes[0]["arrays"]["blend"]
+        assert len(pack.raw(pack.meshes[0], "blend")) == 4 * blend["shape"][0]
+    with skin_pack.PackWriter(path, update=True) as writer:
+        writer.add_mesh(skin_pack.encode_mesh(records[1], compress=True))
+    skin_pack.compact_pack(path)
+    with skin_pack.SkinPackReader(path) as pack:
+        for mesh, record in zip(pack.meshes, records):
+            assert_weights(pack, mesh, record["dense"])
@@ -0,0 +1,142 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   test_skin_transfer.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   顶点数量不一致时权重传递的测试，不依赖Maya。
+"""
+
+import numpy as np
+import pytest
+
+from SkinUtils import skin_pack
+from SkinUtils import skin_transfer
+
+
+@pytest.fixture(autouse=True)
+def uniform_grid(monkeypatch):
+    """始终测试 numpy 实现的均匀网格，与是否安装 scipy 无关"""
+    monkeypatch.setattr(skin_transfer, "cKDTree", None)
+
+
+def grid_mesh(size: int, seed: int = 0):
+    """(size+1)^2 个顶点的起伏网格，返回 (顶点, 三角形)"""
+    rng = np.random.default_rng(seed)
+    row = size + 1
+    x, y = np.meshgrid(np.arange(row, dtype=float), np.arange(row, dtype=float))
+    points = np.column_stack([x.ravel(), y.ravel(), rng.normal(0, 0.1, row * row)])
+    cx, cy = np.meshgrid(np.arange(size), np.arange(size))
+    corner = (cy * row + cx).ravel()
+    triangles = np.concatenate(
+        [
+            np.column_stack([corner, corner + 1, corner + row + 1]),
+            np.column_stack([corner, corner + row + 1, corner + row]),
+        ]
+    )
+    return points, triangles
+
+
+def source_arrays(points: np.ndarray, triangles: np.ndarray, influences: int = 4):
+    """与 SkinPackReader.decode_mesh 格式相同的源数组，每个顶点的权重和为 1"""
+    rng = np.random.default_rng(len(points))
+    dense = np.zeros((len(points), influences), dtype=np.float32)
+    for v in range(len(points)):
+        ids = rng.choice(influences, size=2, replace=False)
+        value = rng.random()
+        dense[v, ids] = [value, 1.0 - value]
+    offsets, indices, weights = skin_pack.dense_to_csr(dense)
+    arrays = {
+        "offsets": offsets,
+        "indices": indices,
+        "weights": weights,
+        "rows": np.repeat(np.arange(len(points)), np.diff(offsets)),
+        "blend": rng.random(len(points)).astype(np.float32),
+        "points": points.astype(np.float32),
+        "triangles": triangles,
+    }
+    return arrays, dense
+
+
+def to_dense(arrays: dict, num_influence: int) -> np.ndarray:
+    dense = np.zeros((len(arrays["offsets"]) - 1, num_influence))
+    dense[arrays["rows"], arrays["indices"]] = arrays["weights"]
+    return dense
+
+
+def test_uniform_grid_matches_brute_force():
+    rng = np.random.default_rng(1)
+    # 非均匀分布的源点，含重复点；目标点部分落在包围盒外
+    source = np.concatenate(
+        [rng.normal(0, 1, (400, 3)), rng.normal(5, 0.1, (100, 3)), np.zeros((3, 3))]
+    )
+    targets = rng.uniform(-4, 9, (600, 3))
+    distance, index = skin_transfer.UniformGrid(source).query(targets)
+    all_d = np.linalg.norm(targets[:, None, :] - source[None, :, :], axis=2)
+    np.testing.assert_allclose(distance, all_d.min(axis=1))
+    np.testing.assert_allclose(all_d[np.arange(len(targets)), index], distance)
+
+
+def test_uniform_grid_flat_and_single_point():
+    # 所有点在同一平面、以及只有一个源点时网格退化
+    rng = np.random.default_rng(2)
+    flat = np.column_stack([rng.random((50, 2)), np.zeros(50)])
+    targets = rng.random((30, 3))
+    _, index = skin_transfer.UniformGrid(flat).query(targets)
+    expected = np.linalg.norm(targets[:, None] - flat[None], axis=2).argmin(axis=1)
+    np.testing.assert_array_equal(index, expected)
+    _, index = skin_transfer.UniformGrid(flat[:1]).query(targets)
+    assert not index.any()
+
+
+def test_barycentric_weights_sum_to_one():
+    points, triangles = grid_mesh(6)
+    rng = np.random.default_rng(3)
+    targets = np.column_stack(
+        [rng.uniform(-1, 7, (300, 2)), rng.normal(0, 0.5, 300)]
+    )
+    tri, bary = skin_transfer.barycentric_lookup(points, triangles, targets)
+    np.testing.assert_allclose(bary.sum(axis=1), 1.0)
+    assert (bary >= -1e-9).all()
+    # 插值点不会比最近顶点更远
+    found = np.einsum("mk,mkj->mj", bary, points[tri])
+    nearest = np.linalg.norm(targets[:, None] - points[None], axis=2).min(axis=1)
+    assert (np.linalg.norm(found - targets, axis=1) <= nearest + 1e-9).all()
+
+
+@pytest.mark.parametrize("mode", skin_transfer.TRANSFER_MODES)
+def test_identical_geometry_returns_source_weights(mode):
+    points, triangles = grid_mesh(5)
+    arrays, dense = source_arrays(points, triangles)
+    result = skin_transfer.transfer_arrays(arrays, points, mode, dense.shape[1])
+    np.testing.assert_allclose(to_dense(result, dense.shape[1]), dense, atol=1e-6)
+    np.testing.assert_allclose(result["blend"], arrays["blend"], atol=1e-6)
+    assert "triangles" not in result
+
+
+def test_transfer_to_different_vertex_count():
+    points, triangles = grid_mesh(5)
+    arrays, dense = source_arrays(points, triangles)
+    # 目标为源顶点加上每条横向边的中点
+    row = 6
+    first = np.array([y * row + x for y in range(row) for x in range(row - 1)])
+    midpoints = 0.5 * (points[first] + points[first + 1])
+    targets = np.concatenate([points, midpoints])
+    result = skin_transfer.transfer_arrays(arrays, targets, "barycentric", 4)
+    assert len(result["offsets"]) == len(targets) + 1
+    assert len(result["blend"]) == len(targets)
+    weights = to_dense(result, 4)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0, atol=1e-6)
+    np.testing.assert_allclose(weights[: len(points)], dense, atol=1e-6)
+    expected = 0.5 * (dense[first] + dense[first + 1])
+    np.testing.assert_allclose(weights[len(points) :], expected, atol=1e-5)
+
+    nearest = skin_transfer.transfer_arrays(arrays, targets, "nearest", 4)
+    np.testing.assert_allclose(to_dense(nearest, 4).sum(axis=1), 1.0, atol=1e-6)
+
+
+def test_unknown_mode():
+    points, triangles = grid_mesh(2)
+    arrays, _ = source_arrays(points, triangles)
+    with pytest.raises(ValueError):
+        skin_transfer.transfer_arrays(arrays, points, "skip")
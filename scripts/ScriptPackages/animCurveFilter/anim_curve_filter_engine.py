@@ -0,0 +1,194 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   anim_curve_filter_engine.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   动画曲线过滤器的 numpy 计算内核，不依赖Maya。
+
+逐曲线过滤函数的签名为 f(times, values, param) -> new_values:
+    times  (np.ndarray): 关键帧时间
+    values (np.ndarray): 关键帧数值
+    param  (float): 滑条 remap 后的参数
+首尾两帧保持不变，与逐帧实现的结果一致。
+
+频域过滤函数的签名为 f(data, cutoff_hz, fps) -> new_data:
+    data      (np.ndarray): (曲线数量, 采样数量) 重采样到均匀网格的数值
+    cutoff_hz (float): 截止频率（Hz）
+    fps       (float): 采样频率，即场景帧率
+"""
+
+import numpy as np
+
+def three_frame_average(values: np.ndarray) -> np.ndarray:
+    """计算每个中间帧与前后帧的平均值，返回长度为 n-2 的数组。
+    求和顺序与逐帧的 (pre + cur + nex) / 3.0 相同，结果逐位一致。
+    """
+    return (values[:-2] + values[1:-1] + values[2:]) / 3.0
+
+
+def soften(times: np.ndarray, values: np.ndarray, scale: float) -> np.ndarray:
+    """对每相邻的三帧求平均值，以此为轴心对中间帧进行值缩放。"""
+    result = values.copy()
+    if len(values) < 3:
+        return result
+    cur = values[1:-1]
+    result[1:-1] = cur + (three_frame_average(values) - cur) * scale
+    return result
+
+
+def dampen(times: np.ndarray, values: np.ndarray, scale: float) -> np.ndarray:
+    """将首尾两帧连线，以每一帧投射到连线上的值为轴心进行缩放。"""
+    result = values.copy()
+    if len(values) < 2:
+        return result
+    time_diff = times[-1] - times[0]
+    # 避免除以零
+    if abs(time_diff) < 1e-6:
+        return result
+    tangent = (values[-1] - values[0]) / time_diff
+    pivot = values[0] + tangent * (times[1:-1] - times[0])
+    cur = values[1:-1]
+    result[1:-1] = cur + (pivot - cur) * scale
+    return result
+
+
+def smooth(times: np.ndarray, values: np.ndarray, iterations: int) -> np.ndarray:
+    """对每相邻的三帧求平均值直接赋给中间帧，重复 iterations 次。"""
+    result = values.copy()
+    if len(values) < 3:
+        return result
+    for _ in range(int(iterations)):
+        result[1:-1] = three_frame_average(result)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# 频域过滤器：在均匀采样网格上对 (曲线数量, 采样数量) 的二维数组整体计算
+# ---------------------------------------------------------------------------
+BUTTERWORTH_ORDER = 2
+SAVGOL_POLYORDER = 2
+
+
+def make_grid(times_list: list, step: float = 1.0) -> np.ndarray:
+    """生成覆盖所有曲线时间范围的均匀采样网格"""
+    start = min(float(t[0]) for t in times_list)
+    end = max(float(t[-1]) for t in times_list)
+    count = int(np.floor((end - start) / step + 1e-6)) + 1
+    return start + np.arange(count) * step
+
+
+def keys_on_grid(times: np.ndarray, grid: np.ndarray) -> bool:
+    """判断曲线是否在其时间范围内的每个网格点上都有关键帧（如动捕曲线）"""
+    step = grid[1] - grid[0] if len(grid) > 1 else 1.0
+    offsets = (times - grid[0]) / step
+    return bool(
+        np.allclose(offsets, np.round(offsets), atol=1e-4)
+        and np.allclose(np.diff(offsets), 1.0, atol=1e-4)
+    )
+
+
+def sample_rows(grid: np.ndarray, data: np.ndarray, times_list: list) -> list:
+    """从网格数据中取回每条曲线关键帧时间上的数值"""
+    return [np.interp(times, grid, row) for times, row in zip(times_list, data)]
+
+
+def _pad_rows(data: np.ndarray, pad: int) -> np.ndarray:
+    """对每行两端做镜像填充，数据过短时使用边缘值填充"""
+    mode = "reflect" if pad < data.shape[1] else "edge"
+    return np.pad(data, ((0, 0), (pad, pad)), mode=mode)
+
+
+def _correlate_rows(data: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """对每一行做对称卷积核的相关运算，长度不变"""
+    radius = len(kernel) // 2
+    padded = _pad_rows(data, radius)
+    num = data.shape[1]
+    result = np.zeros_like(data)
+    # 循环卷积核的每个抽头，对所有曲线同时计算
+    for k, weight in enumerate(kernel):
+        result += weight * padded[:, k : k + num]
+    return result
+
+
+def butterworth_sections(cutoff_hz: float, fps: float, order: int = BUTTERWORTH_ORDER):
+    """用双线性变换设计偶数阶 Butterworth 低通滤波器，返回二阶节 [(b, a), ...]"""
+    k = np.tan(np.pi * cutoff_hz / fps)
+    sections = []
+    for i in range(max(order // 2, 1)):
+        q = 1.0 / (2.0 * np.cos(np.pi * (2 * i + 1) / (2 * order)))
+        norm = 1.0 / (1.0 + k / q + k * k)
+        b0 = k * k * norm
+        sections.append(
+            (
+                (b0, 2.0 * b0, b0),
+                (2.0 * (k * k - 1.0) * norm, (1.0 - k / q + k * k) * norm),
+            )
+        )
+    return sections
+
+
+def _biquad_rows(data: np.ndarray, b, a) -> np.ndarray:
+    """直接II型转置结构的二阶IIR滤波，初始状态为首个采样的稳态"""
+    b0, b1, b2 = b
+    a1, a2 = a
+    x0 = data[:, 0]
+    z2 = (b2 - a2) * x0
+    z1 = (b1 - a1) * x0 + z2
+    result = np.empty_like(data)
+    # 递归滤波只能按时间顺序循环，但对所有曲线同时计算
+    for n in range(data.shape[1]):
+        x = data[:, n]
+        y = b0 * x + z1
+        z1 = b1 * x - a1 * y + z2
+        z2 = b2 * x - a2 * y
+        result[:, n] = y
+    return result
+
+
+def butterworth_filtfilt(data: np.ndarray, cutoff_hz: float, fps: float) -> np.ndarray:
+    """零相位 Butterworth 低通：正向滤波后再反向滤波。
+    Args:
+        data (np.ndarray): (曲线数量, 采样数量) 均匀采样数据
+        cutoff_hz (float): 截止频率（Hz）
+        fps (float): 采样频率，即场景帧率
+    """
+    sections = butterworth_sections(cutoff_hz, fps)
+    num = data.shape[1]
+    pad = 3 * (2 * len(sections) + 1)
+    # 奇对称延拓，减少首尾的过渡；数据短于延拓长度时重复延拓，
+    # 让滤波器的初始过渡落在延拓部分，不影响只有几帧的曲线
+    work = np.pad(data, ((0, 0), (pad, pad)), mode="reflect", reflect_type="odd")
+    for _ in range(2):
+        for b, a in sections:
+            work = _biquad_rows(work, b, a)
+        work = work[:, ::-1]
+    return work[:, pad : pad + num]
+
+
+def gaussian_filter(data: np.ndarray, cutoff_hz: float, fps: float) -> np.ndarray:
+    """高斯低通：时域标准差 sigma = fps / (2 * pi * cutoff)，频率响应在截止频率处衰减到 e^-0.5"""
+    sigma = fps / (2.0 * np.pi * cutoff_hz)
+    radius = max(int(np.ceil(3.0 * sigma)), 1)
+    x = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (x / sigma) ** 2)
+    return _correlate_rows(data, kernel / kernel.sum())
+
+
+def savgol_coefficients(window: int, polyorder: int = SAVGOL_POLYORDER) -> np.ndarray:
+    """Savitzky-Golay 平滑系数：窗口内最小二乘多项式在中心点的取值"""
+    half = window // 2
+    x = np.arange(-half, half + 1)
+    vander = np.vander(x, polyorder + 1, increasing=True)
+    return np.linalg.pinv(vander)[0]
+
+
+def savgol_filter(data: np.ndarray, cutoff_hz: float, fps: float) -> np.ndarray:
+    """Savitzky-Golay 平滑：窗口长度取截止频率对应的一个周期（奇数帧）"""
+    window = int(round(fps / cutoff_hz)) | 1
+    window = max(window, SAVGOL_POLYORDER + 3 - (SAVGOL_POLYORDER % 2))
+    max_window = data.shape[1] if data.shape[1] % 2 else data.shape[1] - 1
+    window = min(window, max_window)
+    if window <= SAVGOL_POLYORDER:
+        return data.copy()
+    return _correlate_rows(data, savgol_coefficients(window))
@@ -10,10 +10,14 @@
 
 """
 
+import numpy as np
 from maya.api import OpenMaya as om
 from maya.api import OpenMayaAnim as oma
+import maya.cmds as cmds
 import pymel.core as pm
 
+from animCurveFilter import anim_curve_filter_engine as engine
+
 
 class AnimCurveFilterLogic:
     """
@@ -21,9 +25,17 @@ class AnimCurveFilterLogic:
     所有功能均使用 Maya Python API 2.0 实现，以保证性能。
     """
 
+    # 撤销块名称，一次拖动滑条的所有预览写入合并为一次撤销
+    UNDO_CHUNK_NAME = "animCurveFilter"
+
     def __init__(self):
-        # 缓存数据结构: { "animCurveNodeName": MFnAnimCurve, "keys": [(time, value), ...] }
+        # 快照数据结构: { "animCurveNodeName": {"curve_fn": MFnAnimCurve,
+        #   "times": ndarray, "values": ndarray(只读快照), "current": ndarray(当前写入值)} }
         self.buffer_data = {}
+        # 频域过滤器的均匀网格重采样结果，每个快照只计算一次
+        self.grid_data = None
+        # 是否处于预览中（已打开撤销块）
+        self.previewing = False
 
     @staticmethod
     def get_selected_anim_curves() -> dict:
@@ -71,32 +83,46 @@ class AnimCurveFilterLogic:
 
     def cache_current_curves(self):
         """
-        在修改前，缓存所选动画曲线的所有关键帧数据。
+        在修改前，将所选动画曲线的所有关键帧缓存为不可变的 numpy 快照。
         """
         # 清理数据
         self.buffer_data.clear()
+        self.grid_data = None
         # 获取当前选择的动画曲线{name:MFnAnimCurve}
         anim_curves = self.get_selected_anim_curves()
         # 遍历选中的动画曲线
         for name, curve_fn in anim_curves.items():
-            keys_data = []  # 用于储存帧数据
-            # 选中的关键帧索引通过pymel获取当前动画曲线所选择的帧列表
-            attr = pm.PyNode(curve_fn.name())
-            sel_frame_list = pm.keyframe(attr, sl=True, query=True)
-            # 将帧列表转化为MTime列表
-            sel_time_list = [om.MTime(frame) for frame in sel_frame_list]
-            # 遍历曲线所有帧索引
-            for i in range(curve_fn.numKeys):
-                # 获取当前帧时间
-                time = curve_fn.input(i)
-                # 如果当前帧时间是选中的关键帧,添加数据
-                if time in sel_time_list:
-                    value = curve_fn.value(i)
-                    keys_data.append((time, value))
-            # 填充最终数据
-            self.buffer_data[name] = {"curve_fn": curve_fn, "keys": keys_data}
+            times, values = self.read_curve_keys(name)
+            # 快照只读，所有过滤结果都由快照计算，避免多次预览效果叠加
+            times.setflags(write=False)
+            values.setflags(write=False)
+            self.buffer_data[name] = {
+                "curve_fn": curve_fn,
+                "times": times,
+                "values": values,
+                "current": values.copy(),
+            }
         print(f"已缓存 {len(self.buffer_data)} 条曲线数据。")
 
+    def begin_preview(self):
+        """开始一次预览：缓存快照并打开撤销块。"""
+        if self.previewing:
+            self.end_preview()
+        self.cache_current_curves()
+        # 关闭缓存曲线更新，以便后面返回原始曲线数据。
+        pm.bufferCurve(animation="keysOrObjects", overwrite=False)
+        cmds.undoInfo(openChunk=True, chunkName=self.UNDO_CHUNK_NAME)
+        self.previewing = True
+
+    def end_preview(self):
+        """结束预览：关闭撤销块，丢弃已经过期的快照。"""
+        if not self.previewing:
+            return
+        self.previewing = False
+        cmds.undoInfo(closeChunk=True)
+        self.buffer_data.clear()
+        self.grid_data = None
+
     def restore_cached_curves(self):
         """将动画曲线返回修改前的状态
         原理：利用maya曲线编辑器的缓存曲线（bufferCurve）
@@ -109,141 +135,204 @@ class AnimCurveFilterLogic:
         except Exception as exc:
             print(exc)
 
-    def apply_butterworth_filter(self, scale_value):
+    @staticmethod
+    def read_curve_keys(curve_name: str):
+        """一次性读取动画曲线所有关键帧的时间和数值.
+        Args:
+            curve_name (str): 动画曲线节点名称
+        Returns:
+            tuple: (times np.ndarray, values np.ndarray)
         """
-        应用Butterworth过滤器。
-        原理：对每相邻的三帧，求其平均值，以此为轴心对中间帧进行值缩放。
+        # keyTimeValue 属性按关键帧顺序储存 (time, value)
+        ktv = cmds.getAttr(f"{curve_name}.keyTimeValue[*]") or []
+        data = np.array(ktv, dtype=np.float64).reshape(-1, 2)
+        return data[:, 0], data[:, 1]
+
+    @staticmethod
+    def write_curve_values(curve_name: str, times, values, start: int = 0):
+        """一次性写回动画曲线一段连续关键帧的数值（时间保持不变）.
         Args:
-            scale_value (float): 缩放值,0:1
+            curve_name (str): 动画曲线节点名称
+            times (np.ndarray): 这段关键帧的时间
+            values (np.ndarray): 新的数值
+            start (int): 第一个关键帧的索引
         """
-        # 关闭缓存曲线更新，以便后面返回原始曲线数据。
-        pm.bufferCurve(animation="keysOrObjects", overwrite=False)
+        if not len(values):
+            return
+        flat = np.column_stack([times, values]).ravel().tolist()
+        end = start + len(values) - 1
+        cmds.setAttr(f"{curve_name}.keyTimeValue[{start}:{end}]", *flat)
 
-        # 遍历数据
-        for data in self.buffer_data.values():
-            curve_fn = data["curve_fn"]
-            num_keys = curve_fn.numKeys
-            if num_keys < 3:
-                print((f"Skipping curve {curve_fn.name()} with fewer than 3 keys."))
+    def write_changed_keys(self, curve_name: str, values):
+        """只写回与当前值不同的关键帧，连续的关键帧合并为一次 setAttr.
+        Args:
+            curve_name (str): 动画曲线节点名称
+            values (np.ndarray): 由快照计算出的新数值
+        """
+        data = self.buffer_data[curve_name]
+        changed = np.flatnonzero(values != data["current"])
+        if not len(changed):
+            return
+        # 按索引间断切分为连续的区间
+        runs = np.split(changed, np.flatnonzero(np.diff(changed) > 1) + 1)
+        for run in runs:
+            start, stop = int(run[0]), int(run[-1]) + 1
+            self.write_curve_values(
+                curve_name, data["times"][start:stop], values[start:stop], start
+            )
+        data["current"] = values
+
+    def apply_filter(self, filter_func, param, min_keys):
+        """由快照计算所有缓存曲线的过滤结果，并写回有变化的关键帧.
+        Args:
+            filter_func (callable): engine 中的过滤函数 f(times, values, param)
+            param (float): 过滤参数
+            min_keys (int): 关键帧数量少于此值的曲线跳过
+        """
+        for curve_name, data in self.buffer_data.items():
+            if len(data["values"]) < min_keys:
                 continue
-            # 获取帧的值列表
-            original_values = [curve_fn.value(i) for i in range(num_keys)]
-            # 从第二帧开始遍历
-            for i in range(1, num_keys - 1):
-                pre_value = original_values[i - 1]  # 前一帧的值
-                cur_value = original_values[i]  # 当前帧的值
-                nex_value = original_values[i + 1]  # 后一帧的做
-                # 三帧的平均值
-                average_value = (pre_value + cur_value + nex_value) / 3.0
-                # 当前帧的值与平均值进行插值计算
-                new_value = cur_value + (average_value - cur_value) * scale_value
-                # 设置关键帧的值
-                curve_fn.setValue(i, new_value)
+            new_values = filter_func(data["times"], data["values"], param)
+            self.write_changed_keys(curve_name, new_values)
+
+    def apply_soften_filter(self, scale_value):
+        """
+        应用Soften过滤器。
+        原理：对每相邻的三帧，求其平均值，以此为轴心对中间帧进行值缩放。
+        Args:
+            scale_value (float): 缩放值,0:1
+        """
+        self.apply_filter(engine.soften, scale_value, 3)
 
     def apply_dampen_filter(self, scale_value):
         """
         应用Dampen过滤器。
         原理：将首尾两帧连线，找出曲线上每一帧投射到连线上的值，以此为轴心进行缩放。
         """
-        # 关闭缓存曲线更新，以便后面返回原始曲线数据。
-        pm.bufferCurve(animation="keysOrObjects", overwrite=False)
-        # 遍历数据
-        for data in self.buffer_data.values():
-            curve_fn = data["curve_fn"]
-            num_keys = curve_fn.numKeys
-            if num_keys < 2:
-                continue
-            # 计算动画曲线的整体斜率（第一个关键帧到最后一个关键帧的平均变化率）：
-            # 曲线首末帧的 值差/时间差
-            start_time = curve_fn.input(0).asUnits(om.MTime.uiUnit())
-            start_value = curve_fn.value(0)
-            end_time = curve_fn.input(num_keys - 1).asUnits(om.MTime.uiUnit())
-            end_value = curve_fn.value(num_keys - 1)
-
-            time_diff = end_time - start_time
-            value_diff = end_value - start_value
-            # 避免除以零,1e-6 = 1 * 10 ^{-6} = 0.000001
-            if abs(time_diff) < 1e-6:
-                continue
-
-            tangent = value_diff / time_diff
-            # 遍历所有关键帧进行插值
-            for i in range(1, num_keys - 1):
-                current_time = curve_fn.input(i).asUnits(om.MTime.uiUnit())
-                current_value = curve_fn.value(i)
-                # 计算缩放的枢轴点：当前时间到第一帧时间的斜率插值
-                pivot_value = start_value + tangent * (current_time - start_time)
-                # 计算新值：当前值到枢轴值的缩放插值
-                new_value = current_value + (pivot_value - current_value) * scale_value
-                # 设置曲线值
-                curve_fn.setValue(i, new_value)
+        self.apply_filter(engine.dampen, scale_value, 3)
 
     def apply_smooth_filter(self, iterations):
         """
         应用Smooth过滤器。
         原理：对每相邻的三帧，求其平均值，直接赋给中间帧。可多次迭代。
         """
-        # 关闭缓存曲线更新，以便后面返回原始曲线数据。
-        pm.bufferCurve(animation="keysOrObjects", overwrite=False)
-        # 遍历迭代次数
-        for _ in range(iterations):
-            for data in self.buffer_data.values():
-                curve_fn = data["curve_fn"]
-                num_keys = curve_fn.numKeys
-                if num_keys < 3:
-                    continue
-                # 获取帧数据
-                original_values = [curve_fn.value(i) for i in range(num_keys)]
-                # 计算临近三帧的平均值直接赋值给中间帧
-                for i in range(1, num_keys - 1):
-                    pre_value = original_values[i - 1]
-                    cur_value = original_values[i]
-                    nex_value = original_values[i + 1]
-                    average_value = (pre_value + cur_value + nex_value) / 3.0
-                    curve_fn.setValue(i, average_value)
+        self.apply_filter(engine.smooth, iterations, 3)
+
+    @staticmethod
+    def get_scene_fps() -> float:
+        """获取场景帧率（每秒帧数）"""
+        return om.MTime(1.0, om.MTime.kSeconds).asUnits(om.MTime.uiUnit())
+
+    @staticmethod
+    def sample_curve(curve_fn, times, values, grid) -> np.ndarray:
+        """将曲线重采样到均匀网格上，曲线范围之外保持首尾值。
+        每个网格点都有关键帧时直接取关键帧数值，否则用 MFnAnimCurve 按切线求值。
+        """
+        if engine.keys_on_grid(times, grid):
+            return np.interp(grid, times, values)
+        samples = np.interp(grid, times, values)
+        inside = np.nonzero((grid > times[0]) & (grid < times[-1]))[0]
+        unit = om.MTime.uiUnit()
+        samples[inside] = [curve_fn.evaluate(om.MTime(float(grid[i]), unit)) for i in inside]
+        return samples
+
+    def get_grid_data(self, min_keys: int):
+        """将所有快照曲线重采样到同一均匀网格，结果缓存到下一次快照.
+        Returns:
+            dict: {"names": [...], "times_list": [...], "grid": ndarray, "data": ndarray}
+        """
+        if self.grid_data is None:
+            names = [
+                name for name, data in self.buffer_data.items()
+                if len(data["values"]) >= min_keys
+            ]
+            times_list = [self.buffer_data[name]["times"] for name in names]
+            grid = engine.make_grid(times_list) if names else np.zeros(0)
+            stacked = [
+                self.sample_curve(data["curve_fn"], data["times"], data["values"], grid)
+                for data in (self.buffer_data[name] for name in names)
+            ]
+            self.grid_data = {
+                "names": names,
+                "times_list": times_list,
+                "grid": grid,
+                "data": np.vstack(stacked) if stacked else np.zeros((0, 0)),
+            }
+        return self.grid_data
+
+    def apply_frequency_filter(self, filter_func, cutoff_ratio, min_keys=3):
+        """由网格快照整体过滤所有曲线，并写回有变化的关键帧.
+        Args:
+            filter_func (callable): engine 中的频域过滤函数 f(data, cutoff_hz, fps)
+            cutoff_ratio (float): 截止频率与奈奎斯特频率之比，>= 1 时不过滤
+            min_keys (int): 关键帧数量少于此值的曲线跳过
+        """
+        if cutoff_ratio >= 1.0:
+            # 不过滤时回到快照
+            for curve_name, data in self.buffer_data.items():
+                self.write_changed_keys(curve_name, data["values"])
+            return
+        grid_data = self.get_grid_data(min_keys)
+        if not grid_data["names"]:
+            return
+        fps = self.get_scene_fps()
+        filtered = filter_func(grid_data["data"], cutoff_ratio * fps * 0.5, fps)
+        new_values = engine.sample_rows(grid_data["grid"], filtered, grid_data["times_list"])
+        for curve_name, values in zip(grid_data["names"], new_values):
+            self.write_changed_keys(curve_name, values)
+
+    def apply_butterworth_filter(self, cutoff_ratio):
+        """
+        应用Butterworth过滤器。
+        原理：二阶 Butterworth 低通正向、反向各滤波一次，得到零相位的四阶响应。
+        Args:
+            cutoff_ratio (float): 截止频率与奈奎斯特频率之比,0:1
+        """
+        self.apply_frequency_filter(engine.butterworth_filtfilt, cutoff_ratio)
+
+    def apply_gaussian_filter(self, cutoff_ratio):
+        """
+        应用Gaussian过滤器。
+        原理：用标准差由截止频率换算的高斯核对重采样后的曲线做卷积。
+        """
+        self.apply_frequency_filter(engine.gaussian_filter, cutoff_ratio)
+
+    def apply_savitzkygolay_filter(self, cutoff_ratio):
+        """
+        应用Savitzky-Golay过滤器。
+        原理：在截止频率对应的窗口内做最小二乘多项式拟合，取中心点的值。
+        """
+        self.apply_frequency_filter(engine.savgol_filter, cutoff_ratio)
 
     def apply_twinner_filter(self, scale_value):
         """
         应用Twinner过滤器。
-        在当前时间点，根据前后帧的值按比例创建或修改关键帧。
+        在当前时间点，根据快照中前后帧的值按比例创建或修改关键帧。
         """
-        # 关闭缓存曲线更新，以便后面返回原始曲线数据。
-        pm.bufferCurve(animation="keysOrObjects", overwrite=False)
         # 获取当前时间栏时间
-        current_time = oma.MAnimControl.currentTime()
+        current_time = oma.MAnimControl.currentTime().asUnits(om.MTime.uiUnit())
         # 遍历数据
-        for data in self.buffer_data.values():
-            curve_fn = data["curve_fn"]
-            num_keys = curve_fn.numKeys
-            if num_keys < 2:
+        for curve_name, data in self.buffer_data.items():
+            times, values = data["times"], data["values"]
+            if len(times) < 2:
                 continue
-
-            # 查找当前时间前一个和后一个关键帧的索引
-            pre_index = curve_fn.findClosest(current_time)
-            if curve_fn.input(pre_index) > current_time and pre_index > 0:
-                pre_index -= 1
-
-            next_index = pre_index + 1
-            # 获取前后关键帧的值
-            if pre_index >= 0 and next_index < curve_fn.numKeys:
-                pre_value = curve_fn.value(pre_index)
-                next_value = curve_fn.value(next_index)
-                # 如果前后帧的值不想等
-                if abs(next_value - pre_value) > 1e-6:
-                    # 算法：前值 + 后值 - 前值 * 比例
-                    new_value = pre_value + (next_value - pre_value) * scale_value
-
-                    # 检查当前时间是否已有关键帧，有则修改，无则添加
-                    found_exact = False
-                    for i in range(curve_fn.numKeys):
-                        if curve_fn.input(i) == current_time:
-                            curve_fn.setValue(i, new_value)
-                            found_exact = True
-                            break
-
-                    if not found_exact:
-                        key_index = curve_fn.insertKey(current_time)
-                        curve_fn.setValue(key_index, new_value)
+            # 查找当前时间前一个和后一个关键帧的索引（不含当前时间上的关键帧）
+            pre_index = int(np.searchsorted(times, current_time - 1e-6, side="right")) - 1
+            next_index = int(np.searchsorted(times, current_time + 1e-6, side="left"))
+            if pre_index < 0 or next_index >= len(times):
+                continue
+            pre_value = values[pre_index]
+            next_value = values[next_index]
+            # 如果前后帧的值相等，不需要处理
+            if abs(next_value - pre_value) <= 1e-6:
+                continue
+            # 算法：前值 + 后值 - 前值 * 比例
+            new_value = float(pre_value + (next_value - pre_value) * scale_value)
+            if data.get("twin_value") == new_value:
+                continue
+            # 当前时间已有关键帧则修改，没有则插入
+            cmds.setKeyframe(curve_name, time=(current_time,), value=new_value)
+            data["twin_value"] = new_value
 
     @staticmethod
     def remap_value(in_min, in_max, out_min, out_max, v) -> float:
@@ -38,6 +38,10 @@ class AnimCurveFilterUI(QtWidgets.QDialog):
     """
 
     _ui_instance = None
+    # 合并滑条事件的间隔（毫秒），拖动期间最多每帧刷新一次预览
+    PREVIEW_INTERVAL = 16
+    # 键盘、滚轮或点击滑槽停止操作多久后提交（毫秒）
+    COMMIT_INTERVAL = 600
 
     def __init__(self, parent=None):
         if parent is None:
@@ -57,6 +61,15 @@ class AnimCurveFilterUI(QtWidgets.QDialog):
         self.value_slider = None
         self.tip_label = None
         self.reverse_button = None
+        # 合并拖动期间的滑条事件，只计算最后一个值
+        self.pending_value = None
+        self.preview_timer = QtCore.QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.PREVIEW_INTERVAL)
+        # 非拖动的连续修改共用同一个快照，停止操作或滑条失去焦点时才提交
+        self.commit_timer = QtCore.QTimer(self)
+        self.commit_timer.setSingleShot(True)
+        self.commit_timer.setInterval(self.COMMIT_INTERVAL)
         # 构建控件
         self._create_widgets()
         self._create_layouts()
@@ -113,15 +126,39 @@ class AnimCurveFilterUI(QtWidgets.QDialog):
         """连接信号与槽。"""
         self.filter_combo.currentTextChanged.connect(self._on_filter_changed)
 
-        self.value_slider.sliderPressed.connect(self.filter_logic.cache_current_curves)
+        self.value_slider.sliderPressed.connect(self._on_slider_pressed)
         self.value_slider.valueChanged.connect(self._on_slider_value_changed)
-        self.value_slider.sliderReleased.connect(self.reset_slider)
-
-        self.reverse_button.clicked.connect(self.filter_logic.restore_cached_curves)
-        self.reverse_button.clicked.connect(self.reset_slider)
+        self.value_slider.sliderReleased.connect(self._on_slider_released)
+        self.value_slider.installEventFilter(self)
+        self.preview_timer.timeout.connect(self._flush_preview)
+        self.commit_timer.timeout.connect(self._commit_preview)
+
+        self.reverse_button.clicked.connect(self._on_revert)
+
+    def eventFilter(self, watched, event):
+        """滑条失去焦点时提交键盘或滚轮的修改。"""
+        if (
+            watched is self.value_slider
+            and event.type() == QtCore.QEvent.FocusOut
+            and not self.value_slider.isSliderDown()
+        ):
+            self._commit_preview()
+        return super().eventFilter(watched, event)
+
+    def closeEvent(self, event):
+        self._commit_preview()
+        super().closeEvent(event)
+
+    def _on_revert(self):
+        """先提交正在进行的修改，再恢复到修改前的曲线。"""
+        self._commit_preview()
+        self.filter_logic.restore_cached_curves()
+        self.reset_slider()
 
     def _on_filter_changed(self):
         """当ComboBox选项改变时，更新UI和滑条。"""
+        # 切换过滤器前提交上一个过滤器的修改
+        self._commit_preview()
         # 获取数据
         current_filter = self.filter_combo.currentText()
         settings = FILTER_MODES[current_filter]
@@ -139,13 +176,50 @@ class AnimCurveFilterUI(QtWidgets.QDialog):
         # 设置滑条数值标签
         self.value_label.setText(f"当前值： {settings['default_value']}")
 
+    def _on_slider_pressed(self):
+        """开始拖动：沿用键盘修改尚未提交的快照，否则缓存新的快照。"""
+        self.commit_timer.stop()
+        if not self.filter_logic.previewing:
+            self.filter_logic.begin_preview()
+
     def _on_slider_value_changed(self, value):
-        """当滑条值改变时，执行对应的过滤器逻辑。"""
+        """当滑条值改变时，记录最新的值，由定时器合并后再计算预览。"""
+        # 更新滑条数值标签显示
+        self.value_label.setText(f"当前值： {value}")
+        if not self.value_slider.isSliderDown():
+            # 键盘、滚轮或点击滑槽改变的值：第一次改变时缓存快照，
+            # 之后的每一步都由同一个快照计算，停止操作后只提交一次
+            if not self.filter_logic.previewing:
+                self.filter_logic.begin_preview()
+            self.commit_timer.start()
+        self.pending_value = value
+        if not self.preview_timer.isActive():
+            self.preview_timer.start()
+
+    def _on_slider_released(self):
+        """松开滑条时，计算最后的值并提交撤销块。"""
+        self._commit_preview()
+
+    def _commit_preview(self):
+        """计算最后的值，提交撤销块并复位滑条；没有进行中的预览时不做任何事。"""
+        self.commit_timer.stop()
+        self.preview_timer.stop()
+        if not self.filter_logic.previewing:
+            return
+        try:
+            self._flush_preview()
+        finally:
+            self.filter_logic.end_preview()
+            self.reset_slider()
+
+    def _flush_preview(self):
+        """由快照计算当前滑条值对应的过滤结果，执行对应的过滤器逻辑。"""
+        if self.pending_value is None:
+            return
+        value, self.pending_value = self.pending_value, None
         # 获取数据
         current_filter = self.filter_combo.currentText()
         settings = FILTER_MODES[current_filter]
-        # 更新滑条数值标签显示
-        self.value_label.setText(f"当前值： {value}")
 
         # 如果需要remap，则计算remap后的值，否则直接使用滑条值
         if settings["remap_range"]:
@@ -176,7 +250,10 @@ class AnimCurveFilterUI(QtWidgets.QDialog):
         current_filter = self.filter_combo.currentText()
         settings = FILTER_MODES[current_filter]
         try:
+            # 阻止信号触发，快照已经释放，复位不应再执行过滤逻辑
+            self.value_slider.blockSignals(True)
             self.value_slider.setValue(settings["default_value"])
+            self.value_slider.blockSignals(False)
             self.value_label.setText(f"当前值： {settings['default_value']}")
         except Exception as e:
             print(e)
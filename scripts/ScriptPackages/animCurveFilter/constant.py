@@ -1,5 +1,5 @@
 FILTER_MODES = {
-    "Butterworth": {
+    "Soften": {
         "tip": "在最大限度保持曲线细节的情况下, 对曲线进行一些光滑。",
         "slider_range": (0, 100),
         "default_value": 0,
@@ -20,6 +20,28 @@ FILTER_MODES = {
         "single_step": 1,
         "remap_range": None,
     },
+    # 频域过滤器的 remap 结果为截止频率与奈奎斯特频率（帧率的一半）之比, 1 表示不过滤
+    "Butterworth": {
+        "tip": "零相位 Butterworth 低通滤波, 滑条越大截止频率越低, 适合动捕数据降噪。",
+        "slider_range": (0, 100),
+        "default_value": 0,
+        "single_step": 1,
+        "remap_range": (1, 0.02),
+    },
+    "Gaussian": {
+        "tip": "高斯低通滤波, 滑条越大截止频率越低, 曲线越光滑且不会过冲。",
+        "slider_range": (0, 100),
+        "default_value": 0,
+        "single_step": 1,
+        "remap_range": (1, 0.02),
+    },
+    "SavitzkyGolay": {
+        "tip": "Savitzky-Golay 多项式平滑, 在去除噪声的同时较好地保留峰值。",
+        "slider_range": (0, 100),
+        "default_value": 0,
+        "single_step": 1,
+        "remap_range": (1, 0.02),
+    },
     "Twinner": {
         "tip": "根据前后帧的值按照比例插值添加中间帧。",
         "slider_range": (0, 100),
@@ -0,0 +1,181 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   test_anim_curve_filter_engine.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   动画曲线过滤器计算内核的测试，不依赖Maya。
+"""
+
+import numpy as np
+import pytest
+
+from animCurveFilter import anim_curve_filter_engine as engine
+
+
+# ---------------------------------------------------------------------------
+# 逐帧参考实现：与向量化之前 AnimCurveFilterLogic 中的循环相同
+# ---------------------------------------------------------------------------
+def loop_soften(times, values, scale):
+    values = list(values)
+    result = list(values)
+    if len(values) < 3:
+        return result
+    for i in range(1, len(values) - 1):
+        average_value = (values[i - 1] + values[i] + values[i + 1]) / 3.0
+        result[i] = values[i] + (average_value - values[i]) * scale
+    return result
+
+
+def loop_dampen(times, values, scale):
+    result = list(values)
+    if len(values) < 2:
+        return result
+    time_diff = times[-1] - times[0]
+    if abs(time_diff) < 1e-6:
+        return result
+    tangent = (values[-1] - values[0]) / time_diff
+    for i in range(1, len(values) - 1):
+        pivot_value = values[0] + tangent * (times[i] - times[0])
+        result[i] = values[i] + (pivot_value - values[i]) * scale
+    return result
+
+
+def loop_smooth(times, values, iterations):
+    result = list(values)
+    if len(values) < 3:
+        return result
+    for _ in range(iterations):
+        original_values = list(result)
+        for i in range(1, len(result) - 1):
+            result[i] = (
+                original_values[i - 1] + original_values[i] + original_values[i + 1]
+            ) / 3.0
+    return result
+
+
+def random_curve(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.integers(1, 4, count)).astype(np.float64)
+    values = np.cumsum(rng.normal(0, 2.0, count))
+    return times, values
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 4, 50])
+@pytest.mark.parametrize(
+    "func, reference, params",
+    [
+        (engine.soften, loop_soften, [0.0, 0.35, 1.0, -2.0]),
+        (engine.dampen, loop_dampen, [0.0, 0.5, 1.5, -0.5]),
+        (engine.smooth, loop_smooth, [0, 1, 2, 7]),
+    ],
+)
+def test_filters_match_loops(func, reference, params, count):
+    times, values = random_curve(count, seed=count)
+    for param in params:
+        result = func(times, values, param)
+        np.testing.assert_array_equal(result, reference(times, values, param))
+        # 不修改输入数组
+        assert result is not values
+
+
+def test_dampen_zero_time_span():
+    values = np.array([1.0, 5.0, -2.0, 3.0])
+    times = np.full(4, 10.0)
+    np.testing.assert_array_equal(engine.dampen(times, values, 0.5), values)
+    np.testing.assert_array_equal(
+        engine.dampen(times, values, 0.5), loop_dampen(times, values, 0.5)
+    )
+
+
+def test_end_keys_are_kept():
+    times, values = random_curve(20, seed=3)
+    filters = ((engine.soften, 0.8), (engine.dampen, 0.8), (engine.smooth, 5))
+    for func, param in filters:
+        result = func(times, values, param)
+        assert result[0] == values[0]
+        assert result[-1] == values[-1]
+
+
+# ---------------------------------------------------------------------------
+# 频域过滤器
+# ---------------------------------------------------------------------------
+FPS = 30.0
+CUTOFF = 3.0
+GRID_FILTERS = [
+    engine.butterworth_filtfilt,
+    engine.gaussian_filter,
+    engine.savgol_filter,
+]
+
+
+def sine(freq: float, count: int = 300) -> np.ndarray:
+    return np.sin(2.0 * np.pi * freq * np.arange(count) / FPS)
+
+
+def phase_of(signal: np.ndarray, freq: float) -> float:
+    """最小二乘拟合 a*sin + b*cos，返回相位（弧度）"""
+    t = 2.0 * np.pi * freq * np.arange(len(signal)) / FPS
+    basis = np.column_stack([np.sin(t), np.cos(t)])
+    (a, b), *_ = np.linalg.lstsq(basis, signal, rcond=None)
+    return np.arctan2(b, a)
+
+
+@pytest.mark.parametrize("func", GRID_FILTERS)
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 200])
+def test_constant_is_preserved(func, count):
+    data = np.repeat([[4.2], [-1.0], [0.0]], count, axis=1)
+    result = func(data, CUTOFF, FPS)
+    assert result.shape == data.shape
+    np.testing.assert_allclose(result, data, atol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "func, stop_gain", list(zip(GRID_FILTERS, [0.01, 0.01, 0.15]))
+)
+def test_content_above_cutoff_is_attenuated(func, stop_gain):
+    data = np.vstack([sine(0.5), sine(10.0)])
+    result = func(data, CUTOFF, FPS)
+    interior = slice(30, -30)
+    # 通带内的低频几乎不变，截止频率以上的高频被衰减
+    np.testing.assert_allclose(result[0, interior], data[0, interior], atol=0.02)
+    assert np.abs(result[1, interior]).max() < stop_gain
+    # 截止频率越低衰减越多
+    lower = func(data, CUTOFF / 2, FPS)
+    stop = np.abs(result[1, interior]).max()
+    assert np.abs(lower[1, interior]).max() <= stop + 1e-9
+
+
+def test_filtfilt_has_no_phase_shift():
+    freq = 2.0
+    data = sine(freq, 600)[None]
+    result = engine.butterworth_filtfilt(data, CUTOFF, FPS)[0]
+    interior = slice(60, -60)
+    shift = phase_of(result[interior], freq) - phase_of(data[0, interior], freq)
+    assert abs(shift) < 1e-3
+    # 对比：只做一次正向滤波会产生明显的相位滞后
+    forward = data
+    for b, a in engine.butterworth_sections(CUTOFF, FPS):
+        forward = engine._biquad_rows(forward, b, a)
+    lag = phase_of(data[0, interior], freq) - phase_of(forward[0, interior], freq)
+    assert lag > 0.3
+
+
+@pytest.mark.parametrize("func", GRID_FILTERS)
+@pytest.mark.parametrize("count", [1, 2, 3])
+def test_short_arrays(func, count):
+    data = np.arange(2 * count, dtype=np.float64).reshape(2, count) + 1.0
+    result = func(data, CUTOFF, FPS)
+    assert result.shape == data.shape
+    assert np.isfinite(result).all()
+    # 平滑结果不会超出原数据的范围，输入保持不变
+    assert (result.min(axis=1) >= data.min(axis=1) - 0.05).all()
+    assert (result.max(axis=1) <= data.max(axis=1) + 0.05).all()
+    np.testing.assert_array_equal(data, np.arange(2 * count).reshape(2, count) + 1.0)
+
+
+def test_filtfilt_keeps_short_ramps():
+    for count in (2, 3, 4):
+        ramp = np.arange(count, dtype=np.float64)[None]
+        result = engine.butterworth_filtfilt(ramp, CUTOFF, FPS)
+        np.testing.assert_allclose(result, ramp, atol=0.05)
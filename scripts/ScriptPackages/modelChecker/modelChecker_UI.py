@@ -5,16 +5,25 @@ from functools import partial
 import json
 import maya.cmds as cmds
 import maya.OpenMayaUI as omui
-import maya.api.OpenMaya as om
-import modelChecker.modelChecker_commands as mcc
+import modelChecker.modelChecker_incremental as mci
 import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_names as mcn
+import modelChecker.modelChecker_parallel as mcpar
+import modelChecker.modelChecker_report as mcrep
+import modelChecker.modelChecker_runner as mcr
 from modelChecker.__version__ import __version__
 
 
 def getMainWindow():
+    """
+    Returns Maya's main window, None when Maya runs without a GUI
+
+    :rtype: QtWidgets.QWidget
+    """
     mainWindowPtr = omui.MQtUtil.mainWindow()
-    mainWindow = wrapInstance(int(mainWindowPtr), QtWidgets.QWidget)
-    return mainWindow
+    if mainWindowPtr is None:
+        return None
+    return wrapInstance(int(mainWindowPtr), QtWidgets.QWidget)
 
 
 class UI(QtWidgets.QMainWindow):
@@ -43,8 +52,9 @@ class UI(QtWidgets.QMainWindow):
             cls.qmwInstance.raise_()
             cls.qmwInstance.activateWindow()
 
-    def __init__(self, parent=getMainWindow()):
-        super(UI, self).__init__(parent)
+    def __init__(self, parent=None):
+        # resolved on construction, importing the module must not need a GUI
+        super(UI, self).__init__(parent or getMainWindow())
 
         self.setObjectName("ModelCheckerUI")
         self.setWindowTitle("Model Checker {}".format(self.version))
@@ -271,13 +281,29 @@ class UI(QtWidgets.QMainWindow):
         self.contextTable.horizontalHeader().setSectionResizeMode(
             QtWidgets.QHeaderView.Stretch
         )
-        self.reportOutputUI = QtWidgets.QTextEdit()
-        self.reportOutputUI.setReadOnly(True)
+        self.reportTitle = QtWidgets.QLabel()
+        self.reportModel = mcrep.ReportModel(self)
+        self.reportOutputUI = QtWidgets.QTreeView()
+        self.reportOutputUI.setModel(self.reportModel)
+        self.reportOutputUI.setHeaderHidden(True)
+        self.reportOutputUI.setUniformRowHeights(True)
+        self.reportOutputUI.setSelectionMode(
+            QtWidgets.QAbstractItemView.ExtendedSelection
+        )
         self.reportOutputUI.setMinimumWidth(600)
+        self.reportOutputUI.activated.connect(self.selectReportRows)
+        reportWidget = QtWidgets.QWidget()
+        reportWidgetLayout = QtWidgets.QVBoxLayout()
+        reportWidgetLayout.setContentsMargins(0, 0, 0, 0)
+        reportWidget.setLayout(reportWidgetLayout)
+        reportWidgetLayout.addWidget(self.reportTitle)
+        reportWidgetLayout.addWidget(self.reportOutputUI)
 
         self.runCurrentButton = QtWidgets.QPushButton("Run Current")
         self.runAllCheckedButton = QtWidgets.QPushButton("Run Checks on Selected / All")
         self.consolidatedCheck = QtWidgets.QCheckBox()
+        self.traceMemoryCheck = QtWidgets.QCheckBox()
+        self.parallelCheck = QtWidgets.QCheckBox()
 
         clearButton = QtWidgets.QPushButton("Clear")
         clearButton.setMaximumWidth(150)
@@ -286,6 +312,10 @@ class UI(QtWidgets.QMainWindow):
         settingsLayout.addWidget(QtWidgets.QLabel("Consolidated display: "))
         settingsLayout.addStretch()
         settingsLayout.addWidget(self.consolidatedCheck)
+        settingsLayout.addWidget(QtWidgets.QLabel("Trace memory: "))
+        settingsLayout.addWidget(self.traceMemoryCheck)
+        settingsLayout.addWidget(QtWidgets.QLabel("Parallel mesh checks: "))
+        settingsLayout.addWidget(self.parallelCheck)
 
         runLayout = QtWidgets.QHBoxLayout()
         runLayout.addWidget(QtWidgets.QLabel("Report: "))
@@ -293,7 +323,7 @@ class UI(QtWidgets.QMainWindow):
         runLayout.addWidget(self.runAllCheckedButton)
         splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical)
         splitter.addWidget(contextWidget)
-        splitter.addWidget(self.reportOutputUI)
+        splitter.addWidget(reportWidget)
         splitter.setSizes([0, 1])
         report.addLayout(settingsLayout)
         report.addWidget(splitter)
@@ -357,6 +387,9 @@ class UI(QtWidgets.QMainWindow):
             self.errorNodesButton[name] = QtWidgets.QPushButton("Select Error Nodes")
             self.errorNodesButton[name].setEnabled(False)
             self.errorNodesButton[name].setMaximumWidth(150)
+            self.errorNodesButton[name].clicked.connect(
+                partial(self.selectErrorNodes, name)
+            )
 
             self.commandLayout[name].addWidget(self.commandLabel[name])
             self.commandLayout[name].addWidget(self.commandCheckBox[name])
@@ -384,8 +417,14 @@ class UI(QtWidgets.QMainWindow):
         checkButtonsLayout.addWidget(checkAllButton)
         return checks
 
+    def showEvent(self, event):
+        mcn.nameCache.registerCallbacks()
+        super(UI, self).showEvent(event)
+
     def closeEvent(self, event):
         self.saveSettings()
+        mcn.nameCache.removeCallbacks()
+        mci.meshResults.clear()
         super(UI, self).closeEvent(event)
 
     def getCategories(self, commands):
@@ -431,7 +470,7 @@ class UI(QtWidgets.QMainWindow):
         for command in self.commandsList.keys():
             self.errorNodesButton[command].setEnabled(False)
             self.commandLabel[command].setStyleSheet("background-color: none;")
-        self.reportOutputUI.clear()
+        self.reportModel.clear()
 
     def checkCategory(self, category):
         uncheckedCategoryButtons = []
@@ -447,13 +486,7 @@ class UI(QtWidgets.QMainWindow):
             self.commandCheckBox[category].setChecked(checked)
 
     def filterGetAllNodes(self):
-        allNodes = cmds.ls(transforms=True, long=True)
-        allUsuableNodes = []
-        for node in allNodes:
-            if node not in {"|front", "|persp", "|top", "|side"}:
-                uuid = cmds.ls(node, uuid=True)[0]
-                allUsuableNodes.append(uuid)
-        return allUsuableNodes
+        return mcr.getAllNodes()
 
     def oneOfs(self, command):
         nodes = self.contexts[self.currentContextUUID]["nodes"]
@@ -463,126 +496,43 @@ class UI(QtWidgets.QMainWindow):
         self.createReport(self.currentContextUUID)
 
     def commandToRun(self, commands, nodes):
-        diagnostics = {}
-        SLMesh = om.MSelectionList()
-        nodes = [node for node in nodes if cmds.ls(node, uuid=True)]
-        longNodeNames = [cmds.ls(node, uuid=True)[0] for node in nodes]
-        for node in longNodeNames:
-            nodeName = cmds.ls(node)
-            shapes = cmds.listRelatives(nodeName, shapes=True, typ="mesh")
-            if shapes:
-                SLMesh.add(node)
-        for command in commands:
-            type, errors = getattr(mcc, command)(nodes, SLMesh)
-            diagnostics[command] = {"type": type, "uuids": errors}
-        SLMesh.clear()
-        return diagnostics
+        return mcr.commandToRun(
+            commands,
+            nodes,
+            incremental=True,
+            traceMemory=self.traceMemoryCheck.isChecked(),
+            workers=mcpar.defaultWorkers() if self.parallelCheck.isChecked() else 0,
+        )
 
     def parseErrors(self, errors):
-        uuids = errors["uuids"]
-        type = errors["type"]
-
-        if type == "nodes":
-            nodes = []
-            for node in errors["uuids"]:
-                curNode = cmds.ls(node)
-                if curNode:
-                    nodes.append(curNode[0])
-            return nodes
-
-        outputErrors = []
-        typeMapping = {
-            "uv": ".map[{}]",
-            "vertex": ".vtx[{}]",
-            "edge": ".e[{}]",
-            "polygon": ".f[{}]",
-        }
-
-        for uuid in uuids:
-            nodeName = cmds.ls(uuid)
-            if nodeName:
-                for component in uuids[uuid]:
-                    outputErrors.append(
-                        nodeName[0] + typeMapping[type].format(component)
-                    )
-        return outputErrors
+        return mcrep.errorNames(errors)
 
     def createReport(self, uuid):
         context = self.contexts[uuid]
         diagnostics = context["diagnostics"]
-        nodes = context["nodes"]
-        name = context["name"]
-        self.reportOutputUI.clear()
-        lastFailed = None
-        consolidated = self.consolidatedCheck.isChecked()
-        html = "<h2>{}</h2>".format(name)
-
-        if consolidated or not nodes:
-            plural = "" if len(nodes) == 1 else "s"
-            html += "&#10752; Node{} checked: {}<br><br>".format(plural, len(nodes))
-        else:
-            html += "&#10752; Nodes checked:<br>"
-            for node in nodes:
-                html += "&#9492;&#9472; {}<br>".format(cmds.ls(node)[0])
-            html += "<br><br>"
-
-        if len(diagnostics) == 0:
-            html += "{} - No tests run in this context.".format(
-                self.contexts[self.currentContextUUID]["name"]
-            )
-            self.reportOutputUI.setHtml(html)
-            return
+        self.reportTitle.setText("<h2>{}</h2>".format(context["name"]))
 
-        for error in sorted(self.commandsList.keys()):
+        for error in self.commandsList:
             if error not in diagnostics:
                 self.errorNodesButton[error].setEnabled(False)
                 self.commandLabel[error].setStyleSheet("background-color: none;")
                 continue
+            failed = mcrep.hasErrors(diagnostics[error])
+            self.errorNodesButton[error].setEnabled(failed)
+            color = "#664444" if failed else "#446644"
+            self.commandLabel[error].setStyleSheet(
+                "background-color: {};".format(color)
+            )
 
-            parsedErrors = self.parseErrors(diagnostics[error])
-            failed = len(parsedErrors) != 0
-            if failed:
-                self.errorNodesButton[error].setEnabled(True)
-                self.errorNodesButton[error].clicked.connect(
-                    partial(self.selectErrorNodes, diagnostics[error])
-                )
-                self.commandLabel[error].setStyleSheet("background-color: #664444;")
-            else:
-                self.errorNodesButton[error].setEnabled(False)
-                self.commandLabel[error].setStyleSheet("background-color: #446644;")
-            label = self.commandsList[error]["label"]
-            failed = len(parsedErrors) != 0
-            if (
-                lastFailed != failed
-                and lastFailed is not None
-                or (failed is True and lastFailed is True)
-            ):
-                html += "<br>"
-            lastFailed = failed
-            if failed:
-                html += "&#10752; {}<font color=#9c4f4f> [ FAILED ]</font><br>".format(
-                    label
-                )
-            else:
-                html += "{}<font color=#64a65a> [ SUCCESS ]</font><br>".format(label)
-
-            if failed:
-                if consolidated and len(parsedErrors) > 0:
-                    store = {}
-                    for node in parsedErrors:
-                        name = node.split(".")[0]
-                        store[name] = store.get(name, 0) + 1
-
-                    for node in store:
-                        word = "issues" if store[node] > 1 else "issue"
-                        html += "&#9492;&#9472; {} - <font color=#9c4f4f>{} {}</font><br>".format(
-                            node, store[node], word
-                        )
-                else:
-                    for node in parsedErrors:
-                        html += "&#9492;&#9472; {}<br>".format(node)
-
-        self.reportOutputUI.insertHtml(html)
+        self.reportModel.setSpecs(
+            mcrep.reportSpecs(
+                self.contexts[self.currentContextUUID]["name"],
+                context["nodes"],
+                diagnostics,
+                self.commandsList,
+                self.consolidatedCheck.isChecked(),
+            )
+        )
 
     def changeConsolidated(self):
         self.createReport(self.currentContextUUID)
@@ -595,7 +545,7 @@ class UI(QtWidgets.QMainWindow):
                 nodeName, typ="transform", allDescendents=True, fullPath=True
             )
             if children:
-                uuids = [cmds.ls(child, uuid=True)[0] for child in children]
+                uuids = cmds.ls(children, uuid=True)
                 hierachy.update(uuids)
             hierachy.add(node)
         return list(hierachy)
@@ -653,7 +603,8 @@ class UI(QtWidgets.QMainWindow):
             else:
                 nodes = self.contexts[contextUUID]["nodes"]
 
-            nodes = [uuid for uuid in nodes if cmds.ls(uuid, uuid=True)]
+            mcn.nameCache.beginRun()
+            nodes = [uuid for uuid in nodes if mcn.nameCache.exists(uuid)]
 
             if not nodes:
                 cmds.warning("No nodes to check")
@@ -669,8 +620,19 @@ class UI(QtWidgets.QMainWindow):
 
         self.setRowFromUUID(self.currentContextUUID)
 
-    def selectErrorNodes(self, errors):
-        cmds.select(self.parseErrors(errors))
+    def selectErrorNodes(self, command):
+        diagnostics = self.contexts[self.currentContextUUID]["diagnostics"]
+        if command in diagnostics:
+            mcrep.selectErrors([diagnostics[command]])
+
+    def selectReportRows(self):
+        errorsList = []
+        for index in self.reportOutputUI.selectionModel().selectedIndexes():
+            errors = self.reportModel.item(index).errors
+            if errors:
+                errorsList.append(errors)
+        if errorsList:
+            mcrep.selectErrors(errorsList)
 
     def countErrors(self, diagnostics):
         count = 0
@@ -682,6 +644,8 @@ class UI(QtWidgets.QMainWindow):
     def saveSettings(self):
         settings = {}
         settings["consolidated"] = self.consolidatedCheck.isChecked()
+        settings["traceMemory"] = self.traceMemoryCheck.isChecked()
+        settings["parallel"] = self.parallelCheck.isChecked()
         settings["commands"] = {}
         for name in self.commandsList:
             settings["commands"][name] = self.commandCheckBox[name].isChecked()
@@ -692,6 +656,8 @@ class UI(QtWidgets.QMainWindow):
         if settings:
             settings = json.loads(settings)
             self.consolidatedCheck.setChecked(settings["consolidated"])
+            self.traceMemoryCheck.setChecked(settings.get("traceMemory", False))
+            self.parallelCheck.setChecked(settings.get("parallel", False))
             if "commands" in settings:
                 for name in settings["commands"]:
                     self.commandCheckBox[name].setChecked(settings["commands"][name])
@@ -726,6 +692,11 @@ class UI(QtWidgets.QMainWindow):
         testItem.setText("0")
 
 
+def run():
+    """Shows the modelChecker window, called by the shelf"""
+    UI.show_UI()
+
+
 if __name__ == "__main__":
     try:
         win.close()
@@ -0,0 +1,214 @@
+from collections import defaultdict
+
+import numpy as np
+import maya.api.OpenMaya as om
+
+import modelChecker.modelChecker_parallel as mcpar
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_topology as mct
+
+# Bulk array backend
+#
+# The topology of each mesh is pulled once as flat arrays (face vertex counts
+# and connects, points, assigned UV counts) and the checks are answered with
+# NumPy instead of one Python round-trip per component. Edges are derived
+# from the face vertices (see modelChecker_topology), the edge predicates
+# return indices into edgeVertices that are mapped to Maya's edge ids. The
+# vertices and smoothing of Maya's edges are read in one pass into NumPy
+# arrays, the API has no call returning them for all edges.
+# Results follow the same (type, {UUID: [... componentId]}) contract as the
+# functions in modelChecker_commands.
+#
+# With workers the arrays a check reads from Maya are extracted up front on
+# the main thread and the predicates run in worker threads.
+
+class MeshArrays(mct.MeshTopology):
+    """
+    Flat topology arrays of one mesh, extracted lazily and at most once
+    """
+
+    def __init__(self, dagPath):
+        self.dagPath = dagPath
+        self.fnMesh = om.MFnMesh(dagPath)
+        self.uuid = om.MFnDependencyNode(dagPath.node()).uuid().asString()
+        self.numVertices = self.fnMesh.numVertices
+        self._cache = {}
+
+    def extract(self, names):
+        """
+        Reads the given arrays from Maya now, derived arrays then only use NumPy
+
+        :param names: names of arrays read from Maya, see RAW_ARRAYS
+        :type names: iterable of str
+        """
+        for name in names:
+            getattr(self, name)
+
+    def _buildVertices(self):
+        counts, connects = self.fnMesh.getVertices()
+        self._cache["counts"] = np.array(counts, dtype=np.int64)
+        self._cache["connects"] = np.array(connects, dtype=np.int64)
+
+    @property
+    def counts(self):
+        """Number of vertices of every face"""
+        if "counts" not in self._cache:
+            self._buildVertices()
+        return self._cache["counts"]
+
+    @property
+    def connects(self):
+        """Vertex ids of every face, concatenated"""
+        if "connects" not in self._cache:
+            self._buildVertices()
+        return self._cache["connects"]
+
+    @property
+    def points(self):
+        """Object space vertex positions, (numVertices, 3)"""
+        return self._get("points", self._buildPoints)
+
+    def _buildPoints(self):
+        points = np.array(self.fnMesh.getPoints(), dtype=np.float64)
+        return points.reshape(-1, 4)[:, :3]
+
+    def _buildEdgeInfo(self):
+        # the vertices and smoothing of every Maya edge by edge id, matched
+        # to edgeVertices by vertex pair
+        numEdges = self.fnMesh.numEdges
+        mayaEdges = np.empty((numEdges, 2), dtype=np.int64)
+        smooth = np.empty(numEdges, dtype=bool)
+        for edgeId in range(numEdges):
+            mayaEdges[edgeId] = self.fnMesh.getEdgeVertices(edgeId)
+            smooth[edgeId] = self.fnMesh.isEdgeSmooth(edgeId)
+        try:
+            edgeIds = mct.matchEdges(self.edgeVertices, mayaEdges, self.numVertices)
+        except ValueError as e:
+            raise ValueError("{}: {}".format(self.dagPath.fullPathName(), e))
+        self._cache["edgeIds"] = edgeIds
+        self._cache["edgeSmooth"] = smooth[edgeIds]
+
+    @property
+    def edgeIds(self):
+        """Maya edge id of every edge in edgeVertices"""
+        if "edgeIds" not in self._cache:
+            self._buildEdgeInfo()
+        return self._cache["edgeIds"]
+
+    @property
+    def edgeSmooth(self):
+        """Smoothing flag of every edge in edgeVertices"""
+        if "edgeSmooth" not in self._cache:
+            self._buildEdgeInfo()
+        return self._cache["edgeSmooth"]
+
+    @property
+    def uvCounts(self):
+        """Number of UVs assigned to every face in the current UV set"""
+        return self._get(
+            "uvCounts",
+            lambda: np.array(self.fnMesh.getAssignedUVs()[0], dtype=np.int64),
+        )
+
+
+# check name -> (component type, predicate)
+ARRAY_CHECKS = {
+    "triangles": ("polygon", mct.triangles),
+    "ngons": ("polygon", mct.ngons),
+    "lamina": ("polygon", mct.lamina),
+    "zeroAreaFaces": ("polygon", mct.zeroAreaFaces),
+    "missingUVs": ("polygon", mct.missingUVs),
+    "hardEdges": ("edge", mct.hardEdges),
+    "zeroLengthEdges": ("edge", mct.zeroLengthEdges),
+    "noneManifoldEdges": ("edge", mct.noneManifoldEdges),
+    "openEdges": ("edge", mct.openEdges),
+    "poles": ("vertex", mct.poles),
+}
+
+
+# arrays of MeshArrays that are read from Maya
+RAW_ARRAYS = ("counts", "points", "edgeSmooth", "uvCounts")
+
+# check name -> raw arrays it reads, checks missing here read all of them
+ARRAY_INPUTS = {
+    "triangles": ("counts",),
+    "ngons": ("counts",),
+    "lamina": ("counts",),
+    "zeroAreaFaces": ("counts", "points"),
+    "missingUVs": ("uvCounts",),
+    "hardEdges": ("counts", "edgeSmooth"),
+    "zeroLengthEdges": ("counts", "points"),
+    "noneManifoldEdges": ("counts",),
+    "openEdges": ("counts",),
+    "poles": ("counts",),
+}
+
+
+def arrayChecks(commands, SLMesh, profiler=None, workers=0):
+    """
+    Runs every array-capable check in commands, extracting each mesh's arrays once
+
+    :param commands: names of the checks to run, unknown names are ignored
+    :type commands: list of str
+    :param SLMesh: selection list of the meshes to check
+    :type SLMesh: om.MSelectionList
+    :param profiler: collects the cost of every check
+    :type profiler: modelChecker_profile.CheckProfiler
+    :param workers: number of threads evaluating the predicates, 0 runs serially
+    :type workers: int
+    :return: A dictionary of check name to a tuple of the component type and a dictionary of UUIDs to component IDs
+    :rtype: dict of (str, tuple of (str, dict of (str, list of int)))
+    """
+    profiler = profiler or mcp.CheckProfiler()
+    checks = [command for command in commands if command in ARRAY_CHECKS]
+    results = {check: defaultdict(list) for check in checks}
+    inputs = set()
+    for check in checks:
+        inputs.update(ARRAY_INPUTS.get(check, RAW_ARRAYS))
+
+    def meshes():
+        selIt = om.MItSelectionList(SLMesh)
+        while not selIt.isDone():
+            arrays = MeshArrays(selIt.getDagPath())
+            if workers > 1:
+                with profiler.measure(checks):
+                    arrays.extract(inputs)
+            yield arrays
+            selIt.next()
+
+    def evaluate(arrays):
+        failed = {}
+        for check in checks:
+            # lazily extracted arrays are charged to the first check using them
+            with profiler.measure([check]):
+                failed[check] = ARRAY_CHECKS[check][1](arrays)
+        return arrays, failed
+
+    if checks:
+        for arrays, failed in mcpar.mapOrdered(evaluate, meshes(), workers):
+            for check in checks:
+                type = ARRAY_CHECKS[check][0]
+                components = mcp.componentCount(arrays.fnMesh, type)
+                profiler.count(check, meshes=1, components=components)
+                ids = failed[check]
+                if not len(ids):
+                    continue
+                if type == "edge":
+                    with profiler.measure([check]):
+                        ids = np.sort(arrays.edgeIds[ids])
+                results[check][arrays.uuid].extend(ids.tolist())
+    return {check: (ARRAY_CHECKS[check][0], results[check]) for check in checks}
+
+
+def arraySingle(check, SLMesh):
+    """
+    Runs a single array check, used by the per-check functions in modelChecker_commands
+
+    :param check: name of a check in ARRAY_CHECKS
+    :type check: str
+    :param SLMesh: selection list of the meshes to check
+    :type SLMesh: om.MSelectionList
+    :return: A tuple containing the component type and a dictionary of UUIDs to component IDs
+    :rtype: tuple of (str, dict of (str, list of int))
+    """
+    return arrayChecks([check], SLMesh)[check]
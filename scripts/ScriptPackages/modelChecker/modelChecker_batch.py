@@ -0,0 +1,409 @@
+"""
+Headless batch mode of the modelChecker
+
+Runs a check profile on many scene files with mayapy, one scene per worker
+process, and writes a JSON and a JUnit XML report per file:
+
+    mayapy -m modelChecker.modelChecker_batch "assets/**/*.mb" \\
+        --checks topology,naming --output reports --workers 8
+
+Every check reports its wall time and the meshes and components it
+processed, --trace-memory adds its peak memory. The summed cost of every
+check over all scenes is written to checkCosts.json.
+
+Checks added with modelChecker_registry.registerCheck are known to the
+batch mode when the module registering them is passed with --register, it
+is imported before the profile is resolved and again in every worker:
+
+    mayapy -m modelChecker.modelChecker_batch assets --register studio.checks
+
+The exit code is 1 if any check failed or a scene could not be checked,
+so the command can be used as a publish gate.
+"""
+
+import argparse
+import glob
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import modelChecker.modelChecker_list as mcl
+
+SCENE_EXTENSIONS = (".ma", ".mb")
+
+
+def resolveProfile(profile):
+    """
+    Returns the check names of a profile
+
+    :param profile: "all", or a comma separated list of categories and check names
+    :type profile: str
+    :return: names of the checks, in mcCommandsList order
+    :rtype: list of str
+    """
+    tokens = {token.strip() for token in profile.split(",") if token.strip()}
+    if not tokens or "all" in tokens:
+        return list(mcl.mcCommandsList)
+    commands = [
+        name
+        for name, command in mcl.mcCommandsList.items()
+        if name in tokens or command["category"] in tokens
+    ]
+    known = set(mcl.mcCommandsList) | {
+        command["category"] for command in mcl.mcCommandsList.values()
+    }
+    unknown = tokens - known
+    if unknown:
+        raise ValueError("Unknown checks or categories: {}".format(sorted(unknown)))
+    return commands
+
+
+def collectScenes(patterns):
+    """
+    Expands files, directories and glob patterns into a sorted list of scene files
+
+    :param patterns: paths or glob patterns, "**" is recursive
+    :type patterns: list of str
+    :return: paths of the .ma/.mb files
+    :rtype: list of str
+    """
+    scenes = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*")
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith(SCENE_EXTENSIONS):
+                scenes.add(os.path.abspath(path))
+    return sorted(scenes)
+
+
+def importRegistrations(modules):
+    """
+    Imports the modules that register custom checks
+
+    :param modules: module names, like "studio.checks"
+    :type modules: list of str
+    """
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _initWorker(registerModules=()):
+    import maya.standalone
+
+    maya.standalone.initialize(name="python")
+    # spawn workers start without the checks registered in the parent
+    importRegistrations(registerModules)
+
+
+def checkScene(scenePath, commands, traceMemory=False, meshWorkers=0):
+    """
+    Opens a scene and runs the checks on all of its transforms, runs inside a worker
+
+    :param scenePath: path of the .ma/.mb file
+    :type scenePath: str
+    :param commands: names of the checks
+    :type commands: list of str
+    :param traceMemory: record the peak memory of every check
+    :type traceMemory: bool
+    :param meshWorkers: threads evaluating the array and UV checks per scene
+    :type meshWorkers: int
+    :return: report of the scene
+    :rtype: dict
+    """
+    import maya.cmds as cmds
+    import modelChecker.modelChecker_names as mcn
+    import modelChecker.modelChecker_runner as mcr
+
+    report = {"file": scenePath, "checks": {}, "error": None}
+    start = time.time()
+    try:
+        cmds.file(scenePath, open=True, force=True, prompt=False)
+        mcn.nameCache.invalidate()
+        diagnostics = mcr.commandToRun(
+            commands,
+            mcr.getAllNodes(),
+            traceMemory=traceMemory,
+            workers=meshWorkers,
+        )
+        for command in commands:
+            diagnostic = diagnostics[command]
+            if diagnostic["type"] == "nodes":
+                errors = mcn.nameCache.names(diagnostic["uuids"])
+            else:
+                errors = {
+                    mcn.nameCache.name(uuid) or uuid: [int(i) for i in ids]
+                    for uuid, ids in diagnostic["uuids"].items()
+                    if ids
+                }
+            report["checks"][command] = {
+                "label": mcl.mcCommandsList[command]["label"],
+                "category": mcl.mcCommandsList[command]["category"],
+                "type": diagnostic["type"],
+                "passed": not errors,
+                "errors": errors,
+                "profile": diagnostic["profile"],
+            }
+    except Exception as e:
+        report["error"] = "{}: {}".format(type(e).__name__, e)
+    report["duration"] = time.time() - start
+    return report
+
+
+def reportPassed(report):
+    return report["error"] is None and all(
+        check["passed"] for check in report["checks"].values()
+    )
+
+
+def reportNames(scenes):
+    """
+    Returns a unique report file name (without extension) for every scene
+
+    :param scenes: paths of the scene files
+    :type scenes: list of str
+    :return: scene path -> report name
+    :rtype: dict
+    """
+    names = {}
+    used = set()
+    for scene in scenes:
+        base = os.path.splitext(os.path.basename(scene))[0]
+        name, index = base, 1
+        while name in used:
+            index += 1
+            name = "{}_{}".format(base, index)
+        used.add(name)
+        names[scene] = name
+    return names
+
+
+def writeJson(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def _failureText(check):
+    errors = check["errors"]
+    if check["type"] == "nodes":
+        return "\n".join(errors)
+    return "\n".join(
+        "{}: {} {}".format(node, len(ids), check["type"]) for node, ids in errors.items()
+    )
+
+
+def writeJUnit(report, path):
+    """
+    Writes a JUnit XML report, one test suite per scene and one test case per check
+
+    :param report: report of a scene as returned by checkScene
+    :type report: dict
+    :param path: path of the xml file
+    :type path: str
+    """
+    checks = report["checks"]
+    failures = sum(1 for check in checks.values() if not check["passed"])
+    suite = ET.Element(
+        "testsuite",
+        name=os.path.basename(report["file"]),
+        tests=str(len(checks)),
+        failures=str(failures),
+        errors="1" if report["error"] else "0",
+        time="{:.3f}".format(report["duration"]),
+    )
+    ET.SubElement(suite, "properties").append(
+        ET.Element("property", name="file", value=report["file"])
+    )
+    if report["error"]:
+        case = ET.SubElement(suite, "testcase", classname="modelChecker", name="open")
+        ET.SubElement(case, "error", message=report["error"])
+    for name, check in checks.items():
+        case = ET.SubElement(
+            suite,
+            "testcase",
+            classname="modelChecker.{}".format(check["category"]),
+            name=check["label"],
+            time="{:.3f}".format(check["profile"]["seconds"]),
+        )
+        if not check["passed"]:
+            failure = ET.SubElement(
+                case,
+                "failure",
+                message="{} failed on {} node(s)".format(name, len(check["errors"])),
+            )
+            failure.text = _failureText(check)
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def runBatch(
+    scenes,
+    commands,
+    outputDir,
+    workers=None,
+    traceMemory=False,
+    meshWorkers=0,
+    registerModules=(),
+):
+    """
+    Checks every scene, one scene per worker process, and writes the reports
+
+    :param scenes: paths of the scene files
+    :type scenes: list of str
+    :param commands: names of the checks
+    :type commands: list of str
+    :param outputDir: directory of the JSON and JUnit reports
+    :type outputDir: str
+    :param workers: number of worker processes, 0 runs in the current process
+    :type workers: int
+    :param traceMemory: record the peak memory of every check
+    :type traceMemory: bool
+    :param meshWorkers: threads evaluating the array and UV checks per scene
+    :type meshWorkers: int
+    :param registerModules: modules registering custom checks, imported in
+        every worker
+    :type registerModules: list of str
+    :return: reports of all scenes, in the order of scenes
+    :rtype: list of dict
+    """
+    if not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+    if workers is None:
+        workers = min(len(scenes), multiprocessing.cpu_count())
+
+    reports = {}
+    names = reportNames(scenes)
+
+    def finish(report):
+        reports[report["file"]] = report
+        baseName = os.path.join(outputDir, names[report["file"]])
+        writeJson(report, baseName + ".json")
+        writeJUnit(report, baseName + ".xml")
+        status = "PASSED" if reportPassed(report) else "FAILED"
+        print("[{}] {} ({:.1f}s)".format(status, report["file"], report["duration"]))
+
+    if workers <= 0:
+        _initWorker(registerModules)
+        for scene in scenes:
+            finish(checkScene(scene, commands, traceMemory, meshWorkers))
+    else:
+        # every worker owns a Maya session, spawn avoids forking a live one
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_initWorker,
+            initargs=(tuple(registerModules),),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    checkScene, scene, commands, traceMemory, meshWorkers
+                ): scene
+                for scene in scenes
+            }
+            for future in as_completed(futures):
+                try:
+                    finish(future.result())
+                except Exception as e:
+                    finish(
+                        {
+                            "file": futures[future],
+                            "checks": {},
+                            "error": "{}: {}".format(type(e).__name__, e),
+                            "duration": 0.0,
+                        }
+                    )
+    return [reports[scene] for scene in scenes]
+
+
+def checkCosts(reports):
+    """
+    Sums the profiles of every check over all scenes
+
+    :param reports: reports of the scenes
+    :type reports: list of dict
+    :return: check name -> summed profile, slowest check first
+    :rtype: list of tuple of (str, dict)
+    """
+    costs = {}
+    for report in reports:
+        for name, check in report["checks"].items():
+            profile = check["profile"]
+            cost = costs.setdefault(
+                name, {"seconds": 0.0, "meshes": 0, "components": 0, "peakMemory": None}
+            )
+            cost["seconds"] += profile["seconds"]
+            cost["meshes"] += profile["meshes"]
+            cost["components"] += profile["components"]
+            if profile["peakMemory"] is not None:
+                cost["peakMemory"] = max(cost["peakMemory"] or 0, profile["peakMemory"])
+    return sorted(costs.items(), key=lambda item: item[1]["seconds"], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="modelChecker_batch", description="Run modelChecker checks on scene files"
+    )
+    parser.add_argument("scenes", nargs="+", help="scene files, directories or globs")
+    parser.add_argument(
+        "--checks",
+        default="all",
+        help="'all', or comma separated categories and check names",
+    )
+    parser.add_argument("--output", default="modelChecker_reports")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes, 0 runs in this process (default: cpu count)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="record the peak memory of every check (slower)",
+    )
+    parser.add_argument(
+        "--mesh-workers",
+        type=int,
+        default=0,
+        help="threads evaluating the array and UV checks of a scene (default: 0)",
+    )
+    parser.add_argument(
+        "--register",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="module registering custom checks, imported here and in every worker",
+    )
+    args = parser.parse_args(argv)
+
+    scenes = collectScenes(args.scenes)
+    if not scenes:
+        parser.error("No .ma/.mb files found")
+    importRegistrations(args.register)
+    commands = resolveProfile(args.checks)
+    reports = runBatch(
+        scenes,
+        commands,
+        args.output,
+        args.workers,
+        args.trace_memory,
+        args.mesh_workers,
+        args.register,
+    )
+    costs = checkCosts(reports)
+    with open(os.path.join(args.output, "checkCosts.json"), "w") as f:
+        json.dump(costs, f, indent=2)
+    for name, cost in costs[:5]:
+        print("{:>10.1f} ms  {}".format(cost["seconds"] * 1000.0, name))
+    failed = [report for report in reports if not reportPassed(report)]
+    print("{}/{} scenes passed".format(len(reports) - len(failed), len(reports)))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
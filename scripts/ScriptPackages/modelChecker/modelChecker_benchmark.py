@@ -0,0 +1,118 @@
+import time
+
+import numpy as np
+
+import modelChecker.modelChecker_parallel as mcpar
+import modelChecker.modelChecker_topology as mct
+
+# Parallel array check benchmark
+#
+# Runs the NumPy predicates of the array checks over synthetic grid meshes
+# serially and with worker threads, asserts that every worker count gives the
+# serial results and prints the timings. It does not need Maya:
+#
+#     python -m modelChecker.modelChecker_benchmark
+#
+# Only the predicates are measured. In Maya the face vertex arrays, points
+# and the edge vertices and smoothing are extracted on the main thread before
+# the predicates run, which adds a serial part that does not scale.
+
+PREDICATES = (
+    "triangles",
+    "ngons",
+    "lamina",
+    "zeroAreaFaces",
+    "missingUVs",
+    "hardEdges",
+    "zeroLengthEdges",
+    "noneManifoldEdges",
+    "openEdges",
+    "poles",
+)
+MESH_COUNT = 64
+GRID_SIZE = 200
+WORKER_COUNTS = (2, 4, 8, 16)
+
+
+def gridMesh(size, seed=0):
+    """
+    Returns a noisy grid with some triangles, zero length edges and hard edges
+
+    :param size: number of quads along each side
+    :type size: int
+    :param seed: random seed
+    :type seed: int
+    :rtype: modelChecker_topology.MeshTopology
+    """
+    rng = np.random.default_rng(seed)
+    row = size + 1
+    x, y = np.meshgrid(np.arange(size), np.arange(size))
+    corner = (y * row + x).ravel()
+    quads = np.column_stack([corner, corner + 1, corner + row + 1, corner + row])
+    # split every tenth quad into two triangles
+    split = rng.random(len(quads)) < 0.1
+    triangles = quads[split][:, [0, 1, 2, 0, 2, 3]].reshape(-1, 3)
+    counts = np.concatenate(
+        [np.full((~split).sum(), 4), np.full(len(triangles), 3)]
+    )
+    connects = np.concatenate([quads[~split].ravel(), triangles.ravel()])
+    points = np.zeros((row * row, 3))
+    points[:, 0] = np.tile(np.arange(row), row)
+    points[:, 1] = np.repeat(np.arange(row), row)
+    points[:, 2] = rng.normal(0, 0.1, row * row)
+    # collapse a few horizontal edges
+    collapsed = rng.integers(0, row * row - 1, max(size // 10, 1))
+    points[collapsed + 1] = points[collapsed]
+    mesh = mct.MeshTopology(counts, connects, row * row, points)
+    mesh.edgeSmooth = rng.random(len(mesh.edgeVertices)) > 0.05
+    mesh.uvCounts = np.where(rng.random(len(counts)) < 0.01, 0, counts)
+    return mesh
+
+
+def evaluate(mesh, names=PREDICATES):
+    """
+    Returns the failing component ids of every predicate on a mesh
+
+    :rtype: dict of (str, list of int)
+    """
+    return {name: getattr(mct, name)(mesh).tolist() for name in names}
+
+
+def runChecks(meshes, workers):
+    return list(mcpar.mapOrdered(evaluate, meshes, workers))
+
+
+def run(meshCount=MESH_COUNT, gridSize=GRID_SIZE, workerCounts=WORKER_COUNTS):
+    """
+    Runs the benchmark and prints the results
+
+    :return: (workers, seconds) for every worker count, 0 is the serial run
+    :rtype: list of tuple of (int, float)
+    """
+    meshes = [gridMesh(gridSize, seed) for seed in range(meshCount)]
+    # derive the edges up front, like the extraction on the main thread
+    for mesh in meshes:
+        mesh.edgeFaceCounts
+    start = time.perf_counter()
+    serial = runChecks(meshes, 0)
+    serialTime = time.perf_counter() - start
+    results = [(0, serialTime)]
+    print("{:>8} {:>10} {:>9}".format("workers", "seconds", "speedup"))
+    print("{:>8} {:>10.3f} {:>8.1f}x".format("serial", serialTime, 1.0))
+    for workers in workerCounts:
+        start = time.perf_counter()
+        threaded = runChecks(meshes, workers)
+        seconds = time.perf_counter() - start
+        # the threaded results must be exactly the serial ones
+        assert threaded == serial, "{} workers differ from the serial run".format(workers)
+        print(
+            "{:>8} {:>10.3f} {:>8.1f}x".format(
+                workers, seconds, serialTime / max(seconds, 1e-9)
+            )
+        )
+        results.append((workers, seconds))
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -1,7 +1,10 @@
-from collections import defaultdict
-
 import maya.cmds as cmds
-import maya.api.OpenMaya as om
+
+import modelChecker.modelChecker_arrays as mca
+import modelChecker.modelChecker_dag as mcdag
+import modelChecker.modelChecker_names as mcn
+import modelChecker.modelChecker_scan as mcs
+import modelChecker.modelChecker_uv as mcuv
 
 # Returns Error Tuple
 #     "uv": {}, [UUID] : [... uvId]
@@ -18,13 +21,10 @@ def _getNodeName(uuid):
 
     :param uuid: UUID of the node
     :type uuid: str
-    :return: Name of the node or None if the node does not exist
+    :return: Long name of the node or None if the node does not exist
     :rtype: str or None
     """
-    nodeName = cmds.ls(uuid, uuid=True)
-    if nodeName:
-        return nodeName[0]
-    return None
+    return mcn.nameCache.name(uuid)
 
 
 # Functions to be imported
@@ -37,12 +37,7 @@ def trailingNumbers(nodes, _):
     :return: A tuple containing a string indicating the type of nodes ("nodes") and a list of UUIDs of nodes with names that end with a digit
     :rtype: tuple of (str, list of str)
     """
-    trailingNumbers = []
-    for node in nodes:
-        nodeName = _getNodeName(node)
-        if nodeName and nodeName[-1].isdigit():
-            trailingNumbers.append(node)
-    return "nodes", trailingNumbers
+    return mcdag.namingSingle("trailingNumbers", nodes)
 
 
 def duplicatedNames(nodes, _):
@@ -54,16 +49,7 @@ def duplicatedNames(nodes, _):
     :return: A tuple containing a string indicating the type of nodes ("nodes") and a list of UUIDs of nodes with names that have duplicates
     :rtype: tuple of (str, list of str)
     """
-    nodesByShortName = defaultdict(list)
-    for node in nodes:
-        nodeName = _getNodeName(node)
-        name = nodeName.rsplit("|", 1)[-1]
-        nodesByShortName[name].append(node)
-    invalid = []
-    for name, shortNameNodes in nodesByShortName.items():
-        if len(shortNameNodes) > 1:
-            invalid.extend(shortNameNodes)
-    return "nodes", invalid
+    return mcdag.namingSingle("duplicatedNames", nodes)
 
 
 def namespaces(nodes, _):
@@ -75,12 +61,7 @@ def namespaces(nodes, _):
     :return: A tuple containing a string indicating the type of nodes ("nodes") and a list of UUIDs of nodes with names that contain a namespace
     :rtype: tuple of (str, list of str)
     """
-    namespaces = []
-    for node in nodes:
-        nodeName = _getNodeName(node)
-        if nodeName and ":" in nodeName:
-            namespaces.append(node)
-    return "nodes", namespaces
+    return mcdag.namingSingle("namespaces", nodes)
 
 
 def shapeNames(nodes, _):
@@ -92,17 +73,7 @@ def shapeNames(nodes, _):
     :return: A tuple containing a string indicating the type of nodes ("nodes") and a list of UUIDs of nodes with names that do not end with "Shape" when split by "|"
     :rtype: tuple of (str, list of str)
     """
-    shapeNames = []
-    for node in nodes:
-        nodeName = _getNodeName(node)
-        if nodeName:
-            new = nodeName.split("|")
-            shape = cmds.listRelatives(nodeName, shapes=True)
-            if shape:
-                shapename = new[-1] + "Shape"
-                if shape[0] != shapename:
-                    shapeNames.append(node)
-    return "nodes", shapeNames
+    return mcdag.namingSingle("shapeNames", nodes)
 
 
 def triangles(_, SLMesh):
@@ -114,19 +85,7 @@ def triangles(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("polygon") and a list of UUIDs of polygons that are triangles
     :rtype: tuple of (str, list of str)
     """
-    triangles = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        faceIt = om.MItMeshPolygon(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not faceIt.isDone():
-            numOfEdges = faceIt.getEdges()
-            if len(numOfEdges) == 3:
-                triangles[uuid].append(faceIt.index())
-            faceIt.next()
-        selIt.next()
-    return "polygon", triangles
+    return mca.arraySingle("triangles", SLMesh)
 
 
 def ngons(_, SLMesh):
@@ -139,19 +98,7 @@ def ngons(_, SLMesh):
         "polygon": {}, [UUID] : [... ngonId ]
     :rtype: dict
     """
-    ngons = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        faceIt = om.MItMeshPolygon(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not faceIt.isDone():
-            numOfEdges = faceIt.getEdges()
-            if len(numOfEdges) > 4:
-                ngons[uuid].append(faceIt.index())
-            faceIt.next()
-        selIt.next()
-    return "polygon", ngons
+    return mca.arraySingle("ngons", SLMesh)
 
 
 def hardEdges(_, SLMesh):
@@ -164,18 +111,7 @@ def hardEdges(_, SLMesh):
         "edge": {}, [UUID] : [... hardEdgeId ]
     :rtype: dict
     """
-    hardEdges = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        edgeIt = om.MItMeshEdge(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not edgeIt.isDone():
-            if edgeIt.isSmooth is False and edgeIt.onBoundary() is False:
-                hardEdges[uuid].append(edgeIt.index())
-            edgeIt.next()
-        selIt.next()
-    return "edge", hardEdges
+    return mca.arraySingle("hardEdges", SLMesh)
 
 
 def lamina(_, SLMesh):
@@ -188,19 +124,7 @@ def lamina(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("polygon") and a dictionary of UUIDs of polygons that are lamina to their corresponding polygon IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    lamina = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        faceIt = om.MItMeshPolygon(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not faceIt.isDone():
-            laminaFaces = faceIt.isLamina()
-            if laminaFaces is True:
-                lamina[uuid].append(faceIt.index())
-            faceIt.next()
-        selIt.next()
-    return "polygon", lamina
+    return mca.arraySingle("lamina", SLMesh)
 
 
 def zeroAreaFaces(_, SLMesh):
@@ -213,19 +137,7 @@ def zeroAreaFaces(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("polygon") and a dictionary of UUIDs of polygons that are zero area to their respective polygon IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    zeroAreaFaces = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        faceIt = om.MItMeshPolygon(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not faceIt.isDone():
-            faceArea = faceIt.getArea()
-            if faceArea <= 0.00000001:
-                zeroAreaFaces[uuid].append(faceIt.index())
-            faceIt.next()
-        selIt.next()
-    return "polygon", zeroAreaFaces
+    return mca.arraySingle("zeroAreaFaces", SLMesh)
 
 
 def zeroLengthEdges(_, SLMesh):
@@ -238,46 +150,21 @@ def zeroLengthEdges(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("edge") and a dictionary of UUIDs of edges that are zero length to their respective edge IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    zeroLengthEdges = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        edgeIt = om.MItMeshEdge(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not edgeIt.isDone():
-            if edgeIt.length() <= 0.00000001:
-                zeroLengthEdges[uuid].append(edgeIt.index())
-            edgeIt.next()
-        selIt.next()
-    return "edge", zeroLengthEdges
+    return mca.arraySingle("zeroLengthEdges", SLMesh)
 
 
-def selfPenetratingUVs(transformNodes, _):
+def selfPenetratingUVs(_, SLMesh):
     """
-    Returns a dictionary of self penetrating UVs (UVs that are overlapping with each other)
+    Returns a dictionary of self penetrating UVs (faces whose UVs overlap the UVs of another face of the same mesh)
 
-    :param transformNodes: A list of transform nodes to check
-    :type transformNodes: list of str
     :param _: Unused parameter
     :type _: None
+    :param SLMesh: UUID of the mesh to check
+    :type SLMesh: str
     :return: A tuple containing a string indicating the type of nodes ("polygon") and a dictionary of UUIDs of polygons that are self penetrating to their respective polygon IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    selfPenetratingUVs = defaultdict(list)
-    for node in transformNodes:
-        nodeName = _getNodeName(node)
-        shapes = cmds.listRelatives(
-            nodeName, shapes=True, type="mesh", noIntermediate=True
-        )
-        if shapes:
-            overlapping = cmds.polyUVOverlap("{}.f[*]".format(shapes[0]), oc=True)
-            if overlapping:
-                formatted = [
-                    overlap.split("{}.f[".format(shapes[0]))[1][:-1]
-                    for overlap in overlapping
-                ]
-                selfPenetratingUVs[node].extend(formatted)
-    return "polygon", selfPenetratingUVs
+    return mcuv.uvSingle("selfPenetratingUVs", SLMesh)
 
 
 def noneManifoldEdges(_, SLMesh):
@@ -290,18 +177,7 @@ def noneManifoldEdges(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("edge") and a dictionary of UUIDs of edges that are none manifold to their respective edge IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    noneManifoldEdges = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        edgeIt = om.MItMeshEdge(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not edgeIt.isDone():
-            if edgeIt.numConnectedFaces() > 2:
-                noneManifoldEdges[uuid].append(edgeIt.index())
-            edgeIt.next()
-        selIt.next()
-    return "edge", noneManifoldEdges
+    return mca.arraySingle("noneManifoldEdges", SLMesh)
 
 
 def openEdges(_, SLMesh):
@@ -314,18 +190,7 @@ def openEdges(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("edge") and a dictionary of UUIDs of edges that are open to their respective edge IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    openEdges = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        edgeIt = om.MItMeshEdge(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not edgeIt.isDone():
-            if edgeIt.numConnectedFaces() < 2:
-                openEdges[uuid].append(edgeIt.index())
-            edgeIt.next()
-        selIt.next()
-    return "edge", openEdges
+    return mca.arraySingle("openEdges", SLMesh)
 
 
 def poles(_, SLMesh):
@@ -338,18 +203,7 @@ def poles(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("vertex") and a dictionary of UUIDs of vertices that are poles to their respective vertex IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    poles = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        vertexIt = om.MItMeshVertex(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not vertexIt.isDone():
-            if vertexIt.numConnectedEdges() > 5:
-                poles[uuid].append(vertexIt.index())
-            vertexIt.next()
-        selIt.next()
-    return "vertex", poles
+    return mca.arraySingle("poles", SLMesh)
 
 
 def starlike(_, SLMesh):
@@ -362,18 +216,7 @@ def starlike(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("polygon") and a dictionary of UUIDs of polygons that are not starlike to their respective polygon IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    noneStarlike = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        polyIt = om.MItMeshPolygon(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not polyIt.isDone():
-            if polyIt.isStarlike() is False:
-                noneStarlike[uuid].append(polyIt.index())
-            polyIt.next()
-        selIt.next()
-    return "polygon", noneStarlike
+    return mcs.scanSingle("starlike", SLMesh)
 
 
 def missingUVs(_, SLMesh):
@@ -386,18 +229,7 @@ def missingUVs(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("polygon") and a dictionary of UUIDs of faces that are missing UVs to their respective face IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    missingUVs = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        faceIt = om.MItMeshPolygon(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not faceIt.isDone():
-            if faceIt.hasUVs() is False:
-                missingUVs[uuid].append(faceIt.index())
-            faceIt.next()
-        selIt.next()
-    return "polygon", missingUVs
+    return mca.arraySingle("missingUVs", SLMesh)
 
 
 def uvRange(_, SLMesh):
@@ -410,18 +242,7 @@ def uvRange(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("uv") and a dictionary of UUIDs of UVs that are outside of the range to their respective UV IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    uvRange = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        mesh = om.MFnMesh(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        Us, Vs = mesh.getUVs()
-        for i in range(len(Us)):
-            if Us[i] < 0 or Us[i] > 10 or Vs[i] < 0:
-                uvRange[uuid].append(i)
-        selIt.next()
-    return "uv", uvRange
+    return mcuv.uvSingle("uvRange", SLMesh)
 
 
 def onBorder(_, SLMesh):
@@ -434,18 +255,7 @@ def onBorder(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("uv") and a dictionary of UUIDs of UVs that are on the border to their respective UV IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    onBorder = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        mesh = om.MFnMesh(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        Us, Vs = mesh.getUVs()
-        for i in range(len(Us)):
-            if abs(int(Us[i]) - Us[i]) < 0.00001 or abs(int(Vs[i]) - Vs[i]) < 0.00001:
-                onBorder[uuid].append(i)
-        selIt.next()
-    return "uv", onBorder
+    return mcuv.uvSingle("onBorder", SLMesh)
 
 
 def crossBorder(_, SLMesh):
@@ -458,36 +268,7 @@ def crossBorder(_, SLMesh):
     :return: A tuple containing a string indicating the type of nodes ("polygon") and a dictionary of UUIDs of polygons that have UVs that cross the border to their respective polygon IDs
     :rtype: tuple of (str, dict of (str, list of int))
     """
-    crossBorder = defaultdict(list)
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        faceIt = om.MItMeshPolygon(selIt.getDagPath())
-        fn = om.MFnDependencyNode(selIt.getDagPath().node())
-        uuid = fn.uuid().asString()
-        while not faceIt.isDone():
-            U, V = set(), set()
-            try:
-                UVs = faceIt.getUVs()
-                (
-                    Us,
-                    Vs,
-                ) = (
-                    UVs[0],
-                    UVs[1],
-                )
-                for i in range(len(Us)):
-                    uAdd = int(Us[i]) if Us[i] > 0 else int(Us[i]) - 1
-                    vAdd = int(Vs[i]) if Vs[i] > 0 else int(Vs[i]) - 1
-                    U.add(uAdd)
-                    V.add(vAdd)
-                if len(U) > 1 or len(V) > 1:
-                    crossBorder[uuid].append(faceIt.index())
-                faceIt.next()
-            except:
-                cmds.warning("Face " + str(faceIt.index()) + " has no UVs")
-                faceIt.next()
-        selIt.next()
-    return "polygon", crossBorder
+    return mcuv.uvSingle("crossBorder", SLMesh)
 
 
 def unfrozenTransforms(nodes, _):
@@ -0,0 +1,117 @@
+from collections import Counter, namedtuple
+
+import maya.api.OpenMaya as om
+
+import modelChecker.modelChecker_profile as mcp
+
+# DAG snapshot for the naming checks
+#
+# One MItDag traversal records the full path, short name and first shape of
+# every transform. The naming checks are answered from that table instead of
+# resolving names and listing shapes node by node. Results follow the same
+# ("nodes", [... UUID]) contract as modelChecker_commands.
+
+# shapeName is the partial path of the first shape, like cmds.listRelatives
+DagEntry = namedtuple("DagEntry", ["fullPath", "shortName", "shapeName"])
+
+
+def dagSnapshot():
+    """
+    Returns the names of every transform of the scene, instanced transforms
+    resolve to their first path
+
+    :return: UUID -> DagEntry
+    :rtype: dict of (str, DagEntry)
+    """
+    snapshot = {}
+    dagIt = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kTransform)
+    while not dagIt.isDone():
+        dagPath = dagIt.getPath()
+        uuid = om.MFnDependencyNode(dagPath.node()).uuid().asString()
+        if uuid not in snapshot:
+            fullPath = dagPath.fullPathName()
+            shapeName = None
+            for i in range(dagPath.childCount()):
+                child = dagPath.child(i)
+                if child.hasFn(om.MFn.kShape):
+                    shapePath = om.MDagPath(dagPath)
+                    shapePath.push(child)
+                    shapeName = shapePath.partialPathName()
+                    break
+            shortName = fullPath.rsplit("|", 1)[-1]
+            snapshot[uuid] = DagEntry(fullPath, shortName, shapeName)
+        dagIt.next()
+    return snapshot
+
+
+def trailingNumbers(entries):
+    return [uuid for uuid, entry in entries if entry.shortName[-1:].isdigit()]
+
+
+def duplicatedNames(entries):
+    counts = Counter(entry.shortName for _, entry in entries)
+    return [uuid for uuid, entry in entries if counts[entry.shortName] > 1]
+
+
+def namespaces(entries):
+    # a namespace anywhere in the path, the node's own or a parent's
+    return [uuid for uuid, entry in entries if ":" in entry.fullPath]
+
+
+def shapeNames(entries):
+    return [
+        uuid
+        for uuid, entry in entries
+        if entry.shapeName and entry.shapeName != entry.shortName + "Shape"
+    ]
+
+
+# check name -> function(list of (UUID, DagEntry)) returning the failing UUIDs
+NAMING_CHECKS = {
+    "trailingNumbers": trailingNumbers,
+    "duplicatedNames": duplicatedNames,
+    "namespaces": namespaces,
+    "shapeNames": shapeNames,
+}
+
+
+def namingChecks(commands, nodes, profiler=None):
+    """
+    Runs every naming check in commands on one DAG snapshot
+
+    :param commands: names of the checks to run, unknown names are ignored
+    :type commands: list of str
+    :param nodes: UUIDs of the transforms to check
+    :type nodes: list of str
+    :param profiler: collects the cost of every check
+    :type profiler: modelChecker_profile.CheckProfiler
+    :return: A dictionary of check name to a tuple of "nodes" and a list of UUIDs
+    :rtype: dict of (str, tuple of (str, list of str))
+    """
+    profiler = profiler or mcp.CheckProfiler()
+    checks = [command for command in commands if command in NAMING_CHECKS]
+    if not checks:
+        return {}
+    with profiler.measure(checks):
+        snapshot = dagSnapshot()
+    entries = [(uuid, snapshot[uuid]) for uuid in nodes if uuid in snapshot]
+    results = {}
+    for check in checks:
+        with profiler.measure([check]):
+            results[check] = ("nodes", NAMING_CHECKS[check](entries))
+        profiler.count(check, nodes=len(entries))
+    return results
+
+
+def namingSingle(check, nodes):
+    """
+    Runs a single naming check, used by the per-check functions in modelChecker_commands
+
+    :param check: name of a check in NAMING_CHECKS
+    :type check: str
+    :param nodes: UUIDs of the transforms to check
+    :type nodes: list of str
+    :return: A tuple containing "nodes" and a list of UUIDs
+    :rtype: tuple of (str, list of str)
+    """
+    return namingChecks([check], nodes)[check]
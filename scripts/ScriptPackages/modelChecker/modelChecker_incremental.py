@@ -0,0 +1,129 @@
+import hashlib
+from collections import defaultdict
+
+import numpy as np
+import maya.api.OpenMaya as om
+
+# Incremental re-checks
+#
+# Results of the per-mesh checks are kept per mesh transform together with a
+# fingerprint of the mesh (vertex/edge/face/UV counts and a hash of the
+# points). A dirty-plug callback on every checked mesh shape flags edits that
+# do not change the fingerprint (UVs, edge smoothing, ...). A mesh is only
+# checked again when it was flagged dirty or its fingerprint changed.
+
+
+def meshFingerprint(dagPath):
+    """
+    Returns a cheap fingerprint of the topology and geometry of a mesh
+
+    :param dagPath: DAG path of the mesh
+    :type dagPath: om.MDagPath
+    :return: (numVertices, numEdges, numPolygons, numUVs, points digest)
+    :rtype: tuple
+    """
+    fnMesh = om.MFnMesh(dagPath)
+    points = np.array(fnMesh.getPoints(), dtype=np.float64)
+    digest = hashlib.blake2b(points.tobytes(), digest_size=16).hexdigest()
+    return (
+        fnMesh.numVertices,
+        fnMesh.numEdges,
+        fnMesh.numPolygons,
+        fnMesh.numUVs(),
+        digest,
+    )
+
+
+class MeshResultCache(object):
+    def __init__(self):
+        # transform UUID -> {"fingerprint": tuple, "results": {command: (type, ids)}}
+        self._entries = {}
+        self._dirty = set()
+        # transform UUID -> dirty callback id
+        self._callbackIds = {}
+
+    def _onDirty(self, node, plug, uuid):
+        self._dirty.add(uuid)
+
+    def _watch(self, dagPath, uuid):
+        if uuid in self._callbackIds:
+            return
+        shapePath = om.MDagPath(dagPath)
+        shapePath.extendToShape()
+        self._callbackIds[uuid] = om.MNodeMessage.addNodeDirtyPlugCallback(
+            shapePath.node(), self._onDirty, uuid
+        )
+
+    def clear(self):
+        """
+        Drops all results and removes the dirty callbacks
+        """
+        if self._callbackIds:
+            om.MMessage.removeCallbacks(list(self._callbackIds.values()))
+        self._callbackIds = {}
+        self._entries = {}
+        self._dirty = set()
+
+    def run(self, commands, SLMesh, runChecks):
+        """
+        Runs the per-mesh checks on the meshes that changed since the last run
+        and merges the results with the stored results of the unchanged meshes
+
+        :param commands: names of per-mesh checks
+        :type commands: list of str
+        :param SLMesh: selection list of the mesh transforms to check
+        :type SLMesh: om.MSelectionList
+        :param runChecks: function(commands, SLMesh) returning {command: (type, {UUID: ids})}
+        :type runChecks: callable
+        :return: A dictionary of check name to a tuple of the component type and a dictionary of UUIDs to component IDs
+        :rtype: dict of (str, tuple of (str, dict of (str, list of int)))
+        """
+        staleMeshes = om.MSelectionList()
+        fingerprints = {}
+        reused = []
+        selIt = om.MItSelectionList(SLMesh)
+        while not selIt.isDone():
+            dagPath = selIt.getDagPath()
+            uuid = om.MFnDependencyNode(dagPath.node()).uuid().asString()
+            fingerprint = meshFingerprint(dagPath)
+            entry = self._entries.get(uuid)
+            if (
+                entry is not None
+                and uuid not in self._dirty
+                and entry["fingerprint"] == fingerprint
+                and all(command in entry["results"] for command in commands)
+            ):
+                reused.append(uuid)
+            else:
+                staleMeshes.add(dagPath)
+                fingerprints[uuid] = (dagPath, fingerprint)
+            selIt.next()
+
+        # also run on an empty list to get the component type of every check
+        fresh = runChecks(commands, staleMeshes)
+        for uuid, (dagPath, fingerprint) in fingerprints.items():
+            # results of other checks from earlier runs may be stale as well
+            entry = {"fingerprint": fingerprint, "results": {}}
+            self._entries[uuid] = entry
+            for command in commands:
+                type, errors = fresh[command]
+                entry["results"][command] = (type, list(errors.get(uuid, [])))
+            self._dirty.discard(uuid)
+            self._watch(dagPath, uuid)
+
+        results = {}
+        for command in commands:
+            type, errors = fresh[command]
+            merged = defaultdict(list)
+            for uuid, ids in errors.items():
+                if ids:
+                    merged[uuid] = list(ids)
+            for uuid in reused:
+                ids = self._entries[uuid]["results"][command][1]
+                if ids:
+                    merged[uuid] = list(ids)
+            results[command] = (type, merged)
+        return results
+
+
+meshResults = MeshResultCache()
@@ -1,106 +1,167 @@
+# Every check declares its component type ("nodes", "polygon", "edge",
+# "vertex" or "uv") and what it needs from the scene:
+#   "nodes"  - the UUIDs of the transforms
+#   "meshes" - the selection list of the mesh transforms
+#   "arrays" - the bulk topology arrays of modelChecker_arrays
+#   "uvs"    - the UV sets of modelChecker_uv
+#   "dag"    - the DAG snapshot of modelChecker_dag
+# Checks are registered from this table by modelChecker_registry.
+
 mcCommandsList = {
     "trailingNumbers": {
         "label": "Trailing Numbers",
         "category": "naming",
+        "type": "nodes",
+        "needs": "dag",
     },
     "duplicatedNames": {
         "label": "Duplicated Names",
         "category": "naming",
+        "type": "nodes",
+        "needs": "dag",
     },
     "shapeNames": {
         "label": "Shape Names",
         "category": "naming",
+        "type": "nodes",
+        "needs": "dag",
     },
     "namespaces": {
         "label": "Namespaces",
         "category": "naming",
+        "type": "nodes",
+        "needs": "dag",
     },
     "layers": {
         "label": "Layers",
         "category": "general",
+        "type": "nodes",
+        "needs": "nodes",
     },
     "history": {
         "label": "History",
         "category": "general",
+        "type": "nodes",
+        "needs": "nodes",
     },
     "shaders": {
         "label": "Shaders",
         "category": "general",
+        "type": "nodes",
+        "needs": "nodes",
     },
     "unfrozenTransforms": {
         "label": "Unfrozen Transforms",
         "category": "general",
+        "type": "nodes",
+        "needs": "nodes",
     },
     "uncenteredPivots": {
         "label": "Uncentered Pivots",
         "category": "general",
+        "type": "nodes",
+        "needs": "nodes",
     },
     "parentGeometry": {
         "label": "Parent Geometry",
         "category": "general",
+        "type": "nodes",
+        "needs": "nodes",
     },
     "emptyGroups": {
         "label": "Empty Groups",
         "category": "general",
+        "type": "nodes",
+        "needs": "nodes",
     },
     "triangles": {
         "label": "Triangles",
         "category": "topology",
+        "type": "polygon",
+        "needs": "arrays",
     },
     "ngons": {
         "label": "Ngons",
         "category": "topology",
+        "type": "polygon",
+        "needs": "arrays",
     },
     "openEdges": {
         "label": "Open Edges",
         "category": "topology",
+        "type": "edge",
+        "needs": "arrays",
     },
     "poles": {
         "label": "Poles",
         "category": "topology",
+        "type": "vertex",
+        "needs": "arrays",
     },
     "hardEdges": {
         "label": "Hard Edges",
         "category": "topology",
+        "type": "edge",
+        "needs": "arrays",
     },
     "lamina": {
         "label": "Lamina",
         "category": "topology",
+        "type": "polygon",
+        "needs": "arrays",
     },
     "zeroAreaFaces": {
         "label": "Zero Area Faces",
         "category": "topology",
+        "type": "polygon",
+        "needs": "arrays",
     },
     "zeroLengthEdges": {
         "label": "Zero Length Edges",
         "category": "topology",
+        "type": "edge",
+        "needs": "arrays",
     },
     "noneManifoldEdges": {
         "label": "None Manifold Edges",
         "category": "topology",
+        "type": "edge",
+        "needs": "arrays",
     },
     "starlike": {
         "label": "Starlike",
         "category": "topology",
+        "type": "polygon",
+        "needs": "meshes",
     },
     "selfPenetratingUVs": {
         "label": "Self Penetrating UVs",
         "category": "UVs",
+        "type": "polygon",
+        "needs": "uvs",
     },
     "missingUVs": {
         "label": "Missing UVs",
         "category": "UVs",
+        "type": "polygon",
+        "needs": "arrays",
     },
     "uvRange": {
         "label": "UV Range",
         "category": "UVs",
+        "type": "uv",
+        "needs": "uvs",
     },
     "crossBorder": {
         "label": "Cross Border",
         "category": "UVs",
+        "type": "polygon",
+        "needs": "uvs",
     },
     "onBorder": {
         "label": "On Border",
         "category": "UVs",
+        "type": "uv",
+        "needs": "uvs",
     },
 }
@@ -0,0 +1,106 @@
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+# UUID -> name resolution
+#
+# One bulk cmds.ls call resolves every node of the scene. The table is shared
+# by all checks and the report builder and rebuilt lazily after a node is
+# added, removed, renamed or reparented. Without registered callbacks the
+# table only lives for a single run (see beginRun).
+
+
+class NodeNameCache(object):
+    def __init__(self):
+        self._names = None
+        self._uuids = None
+        self._callbackIds = []
+
+    def _build(self):
+        names = cmds.ls(long=True) or []
+        uuids = cmds.ls(long=True, uuid=True) or []
+        self._names = {}
+        self._uuids = {}
+        # both calls list the nodes in the same order, instances share a UUID
+        # and resolve to their first path like cmds.ls(uuid) does
+        for uuid, name in zip(uuids, names):
+            self._names.setdefault(uuid, name)
+            self._uuids[name] = uuid
+
+    def invalidate(self, *args):
+        """
+        Drops the table, it is rebuilt on the next lookup
+        """
+        self._names = None
+        self._uuids = None
+
+    def beginRun(self):
+        """
+        Starts a check run, the table is rebuilt unless callbacks keep it up to date
+        """
+        if not self._callbackIds:
+            self.invalidate()
+
+    def name(self, uuid):
+        """
+        Returns the long name of the node with the given UUID
+
+        :param uuid: UUID of the node
+        :type uuid: str
+        :return: Long name of the node or None if the node does not exist
+        :rtype: str or None
+        """
+        if self._names is None:
+            self._build()
+        return self._names.get(uuid)
+
+    def names(self, uuids):
+        """
+        Returns the long names of the existing nodes among the given UUIDs
+
+        :param uuids: UUIDs of the nodes
+        :type uuids: list of str
+        :return: Long names in the order of uuids, missing nodes are skipped
+        :rtype: list of str
+        """
+        if self._names is None:
+            self._build()
+        return [self._names[uuid] for uuid in uuids if uuid in self._names]
+
+    def exists(self, uuid):
+        return self.name(uuid) is not None
+
+    def uuid(self, name):
+        """
+        Returns the UUID of the node with the given long name
+
+        :param name: long name of the node
+        :type name: str
+        :return: UUID of the node or None if the node does not exist
+        :rtype: str or None
+        """
+        if self._uuids is None:
+            self._build()
+        return self._uuids.get(name)
+
+    def registerCallbacks(self):
+        """
+        Keeps the table valid across runs by invalidating it on DAG changes
+        """
+        if self._callbackIds:
+            return
+        self._callbackIds = [
+            om.MDGMessage.addNodeAddedCallback(self.invalidate, "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(self.invalidate, "dependNode"),
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), self.invalidate),
+            om.MDagMessage.addAllDagChangesCallback(self.invalidate),
+        ]
+        self.invalidate()
+
+    def removeCallbacks(self):
+        if self._callbackIds:
+            om.MMessage.removeCallbacks(self._callbackIds)
+        self._callbackIds = []
+        self.invalidate()
+
+
+nameCache = NodeNameCache()
@@ -0,0 +1,47 @@
+import collections
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Parallel per-mesh evaluation
+#
+# The Maya API may only be used from the main thread, so the per-mesh data is
+# read there while it is produced, and only the pure NumPy predicates run in
+# worker threads (NumPy releases the GIL inside its kernels). Results are
+# handed back in input order, so merging them gives exactly the serial result.
+
+
+def defaultWorkers():
+    """
+    Returns the number of worker threads used for parallel checks
+
+    :rtype: int
+    """
+    return os.cpu_count() or 1
+
+
+def mapOrdered(function, items, workers=0):
+    """
+    Yields function(item) for every item, in the order of items
+
+    :param function: function run on every item, may run in a worker thread
+        and must not use the Maya API
+    :type function: callable
+    :param items: iterable of items, consumed on the calling thread, producing
+        an item may use the Maya API
+    :type items: iterable
+    :param workers: number of worker threads, 0 or 1 evaluates serially
+    :type workers: int
+    """
+    if workers <= 1:
+        for item in items:
+            yield function(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for item in items:
+            pending.append(pool.submit(function, item))
+            # bound the number of meshes held in memory
+            while len(pending) > 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,134 @@
+import contextlib
+import threading
+import time
+import tracemalloc
+
+# Per-check cost profiling
+#
+# The runner hands a CheckProfiler to the check backends, which measure every
+# check while it runs and count the meshes and components it processed.
+# Checks that share one pass over a mesh (the iterator scan, the up-front
+# extraction of the bulk arrays) split the time of that pass evenly. Peak memory is traced with tracemalloc, which
+# sees Python and NumPy allocations but not Maya's own, and slows the run
+# down, so it is optional. Blocks measured in worker threads only add their
+# wall time, the peak of tracemalloc is shared by all threads.
+
+
+def componentCount(fnMesh, type):
+    """
+    Returns the number of components of the given type of a mesh
+
+    :param fnMesh: function set of the mesh
+    :type fnMesh: om.MFnMesh
+    :param type: "polygon", "edge", "vertex" or "uv"
+    :type type: str
+    :rtype: int
+    """
+    if type == "polygon":
+        return fnMesh.numPolygons
+    if type == "edge":
+        return fnMesh.numEdges
+    if type == "vertex":
+        return fnMesh.numVertices
+    if type == "uv":
+        return fnMesh.numUVs()
+    return 0
+
+
+class CheckProfiler(object):
+    def __init__(self, traceMemory=False):
+        self.traceMemory = traceMemory
+        # check name -> {"seconds", "nodes", "meshes", "components", "peakMemory"}
+        self.stats = {}
+        self._startedTracing = False
+        self._lock = threading.Lock()
+
+    def _stats(self, check):
+        if check not in self.stats:
+            self.stats[check] = {
+                "seconds": 0.0,
+                "nodes": 0,
+                "meshes": 0,
+                "components": 0,
+                "peakMemory": None,
+            }
+        return self.stats[check]
+
+    def start(self):
+        if self.traceMemory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._startedTracing = True
+
+    def stop(self):
+        if self._startedTracing:
+            tracemalloc.stop()
+            self._startedTracing = False
+
+    @contextlib.contextmanager
+    def measure(self, checks):
+        """
+        Adds the wall time and peak memory of the block to the given checks,
+        the time is split evenly between them
+
+        :param checks: names of the checks that run in the block
+        :type checks: list of str
+        """
+        tracing = (
+            self.traceMemory
+            and tracemalloc.is_tracing()
+            and threading.current_thread() is threading.main_thread()
+        )
+        if tracing:
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.clear_traces()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = (time.perf_counter() - start) / max(len(checks), 1)
+            peak = tracemalloc.get_traced_memory()[1] - baseline if tracing else None
+            with self._lock:
+                for check in checks:
+                    stats = self._stats(check)
+                    stats["seconds"] += seconds
+                    if peak is not None:
+                        stats["peakMemory"] = max(stats["peakMemory"] or 0, peak)
+
+    def count(self, check, nodes=0, meshes=0, components=0):
+        with self._lock:
+            stats = self._stats(check)
+            stats["nodes"] += nodes
+            stats["meshes"] += meshes
+            stats["components"] += components
+
+    def profile(self, check):
+        """
+        Returns the profile of a check, zeros if it did not run
+
+        :rtype: dict
+        """
+        return dict(self._stats(check))
+
+
+def formatProfile(profile, type):
+    """
+    Returns a short description of a check profile
+
+    :param profile: profile of a check as returned by CheckProfiler.profile
+    :type profile: dict
+    :param type: component type of the check
+    :type type: str
+    :rtype: str
+    """
+    parts = ["{:.1f} ms".format(profile["seconds"] * 1000.0)]
+    if profile["meshes"]:
+        parts.append("{} meshes".format(profile["meshes"]))
+        parts.append("{} {}".format(profile["components"], type))
+    elif profile["nodes"]:
+        parts.append("{} nodes".format(profile["nodes"]))
+    if profile["peakMemory"] is not None:
+        parts.append("{:.1f} MB peak".format(profile["peakMemory"] / 1048576.0))
+    return ", ".join(parts)
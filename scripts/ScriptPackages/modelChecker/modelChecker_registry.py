@@ -0,0 +1,124 @@
+import modelChecker.modelChecker_arrays as mca
+import modelChecker.modelChecker_commands as mcc
+import modelChecker.modelChecker_dag as mcdag
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_uv as mcuv
+
+# Check registry
+#
+# Every check is registered with its component type and what it needs from
+# the scene (see modelChecker_list). The runner groups the checks by their
+# needs so each mesh is read once per backend: "arrays" and "uvs" checks are
+# predicates evaluated by modelChecker_arrays and modelChecker_uv, "dag"
+# checks are answered from the DAG snapshot of modelChecker_dag, "nodes"
+# and "meshes" checks are functions(nodes, SLMesh) returning
+# (type, {UUID: [... componentId]}).
+
+NEEDS = ("nodes", "meshes", "arrays", "uvs", "dag")
+
+
+class Check(object):
+    def __init__(self, name, type, needs, function=None):
+        self.name = name
+        self.type = type
+        self.needs = needs
+        # None runs modelChecker_commands.<name>
+        self.function = function
+
+    @property
+    def perMesh(self):
+        """Whether the result of a mesh only depends on that mesh"""
+        return self.needs in ("meshes", "arrays", "uvs")
+
+    def run(self, nodes, SLMesh):
+        if self.needs == "arrays":
+            return mca.arraySingle(self.name, SLMesh)
+        if self.needs == "uvs":
+            return mcuv.uvSingle(self.name, SLMesh)
+        if self.needs == "dag":
+            return mcdag.namingSingle(self.name, nodes)
+        function = self.function or getattr(mcc, self.name)
+        return function(nodes, SLMesh)
+
+
+checks = {
+    name: Check(name, command["type"], command["needs"])
+    for name, command in mcl.mcCommandsList.items()
+}
+
+
+def registerCheck(name, label, category, type, needs, function, allUVSets=False):
+    """
+    Adds a check to the registry and to mcCommandsList, the UI picks it up.
+    The batch mode runs every scene in a fresh worker process, pass the module
+    calling registerCheck with --register so the workers import it too
+
+    :param name: unique name of the check
+    :type name: str
+    :param label: label shown in the UI and the reports
+    :type label: str
+    :param category: category of the check, existing or new
+    :type category: str
+    :param type: component type of the errors, "nodes", "polygon", "edge",
+        "vertex" or "uv"
+    :type type: str
+    :param needs: one of NEEDS
+    :type needs: str
+    :param function: function(nodes, SLMesh) for "nodes" and "meshes" checks,
+        predicate(MeshArrays) for "arrays" checks, predicate(UVSet) for "uvs"
+        checks, returning the failing component ids as an array ("edge"
+        predicates return indices into MeshArrays.edgeVertices), and
+        function(list of (UUID, DagEntry)) for "dag" checks, returning the
+        failing UUIDs
+    :type function: callable
+    :param allUVSets: "uvs" checks only, run the predicate on every UV set
+        instead of the current one
+    :type allUVSets: bool
+    :return: the registered check
+    :rtype: Check
+    """
+    if needs not in NEEDS:
+        raise ValueError("needs must be one of {}, got {!r}".format(NEEDS, needs))
+    if needs == "arrays":
+        mca.ARRAY_CHECKS[name] = (type, function)
+        function = None
+    elif needs == "uvs":
+        mcuv.UV_CHECKS[name] = (type, function, allUVSets)
+        function = None
+    elif needs == "dag":
+        mcdag.NAMING_CHECKS[name] = function
+        function = None
+    mcl.mcCommandsList[name] = {
+        "label": label,
+        "category": category,
+        "type": type,
+        "needs": needs,
+    }
+    checks[name] = Check(name, type, needs, function)
+    return checks[name]
+
+
+def getCheck(name):
+    """
+    Returns the registered check with the given name
+
+    :param name: name of the check
+    :type name: str
+    :rtype: Check
+    """
+    if name not in checks:
+        raise KeyError("Unknown check: {}".format(name))
+    return checks[name]
+
+
+def checksByNeeds(commands, needs):
+    """
+    Returns the checks among commands that need the given data
+
+    :param commands: names of the checks
+    :type commands: list of str
+    :param needs: one of NEEDS
+    :type needs: str
+    :rtype: list of str
+    """
+    return [command for command in commands if getCheck(command).needs == needs]
@@ -0,0 +1,347 @@
+from functools import partial
+
+import numpy as np
+import maya.api.OpenMaya as om
+from PySide2 import QtCore, QtGui
+
+import modelChecker.modelChecker_names as mcn
+import modelChecker.modelChecker_profile as mcp
+
+# Report model
+#
+# The report is a tree over the raw {UUID: [... componentId]} results:
+# check -> failing node -> component ranges. Rows are only created when the
+# view asks for them, PAGE_SIZE rows at a time, and consecutive component ids
+# are compacted into one range (mesh.f[10:400]). Selecting rows builds one
+# MSelectionList with a single indexed component per mesh.
+
+PAGE_SIZE = 500
+
+FAILED_COLOR = "#9c4f4f"
+SUCCESS_COLOR = "#64a65a"
+
+COMPONENT_FORMATS = {
+    "uv": "map",
+    "vertex": "vtx",
+    "edge": "e",
+    "polygon": "f",
+}
+
+COMPONENT_TYPES = {
+    "uv": om.MFn.kMeshMapComponent,
+    "vertex": om.MFn.kMeshVertComponent,
+    "edge": om.MFn.kMeshEdgeComponent,
+    "polygon": om.MFn.kMeshPolygonComponent,
+}
+
+
+def compactRanges(ids):
+    """
+    Returns the ids as sorted ranges of consecutive ids
+
+    :param ids: component ids, in any order, duplicates allowed
+    :type ids: list of int
+    :return: (first, last) of every range, last is inclusive
+    :rtype: list of tuple of (int, int)
+    """
+    ids = np.unique(np.asarray(ids, dtype=np.int64))
+    if not len(ids):
+        return []
+    breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+    firsts = ids[np.concatenate([[0], breaks])]
+    lasts = ids[np.concatenate([breaks - 1, [len(ids) - 1]])]
+    return list(zip(firsts.tolist(), lasts.tolist()))
+
+
+def componentName(nodeName, type, first, last):
+    """
+    Returns the name of a range of components, like pCube1.f[10:400]
+
+    :param nodeName: name of the mesh transform
+    :type nodeName: str
+    :param type: component type, one of COMPONENT_FORMATS
+    :type type: str
+    :param first: first id of the range
+    :type first: int
+    :param last: last id of the range, inclusive
+    :type last: int
+    :rtype: str
+    """
+    if first == last:
+        return "{}.{}[{}]".format(nodeName, COMPONENT_FORMATS[type], first)
+    return "{}.{}[{}:{}]".format(nodeName, COMPONENT_FORMATS[type], first, last)
+
+
+def errorNames(errors):
+    """
+    Returns the names of the failing nodes or component ranges of a check result
+
+    :param errors: {"type": component type, "uuids": errors} of a check
+    :type errors: dict
+    :return: node names or compacted component names
+    :rtype: list of str
+    """
+    if errors["type"] == "nodes":
+        return mcn.nameCache.names(errors["uuids"])
+    names = []
+    for uuid, ids in errors["uuids"].items():
+        nodeName = mcn.nameCache.name(uuid)
+        if nodeName:
+            names.extend(
+                componentName(nodeName, errors["type"], first, last)
+                for first, last in compactRanges(ids)
+            )
+    return names
+
+
+def hasErrors(errors):
+    """
+    Returns whether a check result has errors on nodes that still exist
+
+    :param errors: {"type": component type, "uuids": errors} of a check
+    :type errors: dict
+    :rtype: bool
+    """
+    if errors["type"] == "nodes":
+        return any(mcn.nameCache.exists(uuid) for uuid in errors["uuids"])
+    return any(
+        len(ids) and mcn.nameCache.exists(uuid)
+        for uuid, ids in errors["uuids"].items()
+    )
+
+
+def errorSelection(errorsList):
+    """
+    Builds a selection list of the failing nodes and components
+
+    :param errorsList: {"type": component type, "uuids": errors} of checks,
+        component ids may be any sequence of ints (e.g. a range)
+    :type errorsList: list of dict
+    :rtype: om.MSelectionList
+    """
+    selection = om.MSelectionList()
+    for errors in errorsList:
+        if errors["type"] == "nodes":
+            for nodeName in mcn.nameCache.names(errors["uuids"]):
+                selection.add(nodeName)
+            continue
+        for uuid, ids in errors["uuids"].items():
+            nodeName = mcn.nameCache.name(uuid)
+            if not nodeName or not len(ids):
+                continue
+            nodeSelection = om.MSelectionList()
+            nodeSelection.add(nodeName)
+            dagPath = nodeSelection.getDagPath(0)
+            if dagPath.apiType() == om.MFn.kTransform:
+                dagPath.extendToShape()
+            fnComponent = om.MFnSingleIndexedComponent()
+            component = fnComponent.create(COMPONENT_TYPES[errors["type"]])
+            fnComponent.addElements(list(ids))
+            selection.add((dagPath, component), mergeWithExisting=True)
+    return selection
+
+
+def selectErrors(errorsList):
+    om.MGlobal.setActiveSelectionList(errorSelection(errorsList))
+
+
+class ReportItem(object):
+    """
+    One row of the report, its children are created on demand from expand
+    """
+
+    def __init__(self, parent, text, color=None, errors=None, expand=None):
+        self.parent = parent
+        self.row = len(parent.children) if parent is not None else 0
+        self.text = text
+        self.color = color
+        # {"type": component type, "uuids": errors} selected by this row
+        self.errors = errors
+        # callable returning the (text, color, errors, expand) of every child
+        self._expand = expand
+        self._specs = None
+        self.children = []
+
+    def hasChildren(self):
+        return self._expand is not None or bool(self._specs)
+
+    def specs(self):
+        if self._specs is None:
+            self._specs = self._expand() if self._expand is not None else []
+            self._expand = None
+        return self._specs
+
+
+def _componentSpecs(nodeName, type, uuid, ids):
+    return [
+        (
+            componentName(nodeName, type, first, last),
+            None,
+            {"type": type, "uuids": {uuid: range(first, last + 1)}},
+            None,
+        )
+        for first, last in compactRanges(ids)
+    ]
+
+
+def _nodeSpecs(uuids):
+    specs = []
+    for uuid in uuids:
+        nodeName = mcn.nameCache.name(uuid)
+        if nodeName:
+            specs.append((nodeName, None, {"type": "nodes", "uuids": [uuid]}, None))
+    return specs
+
+
+def _failureSpecs(errors, consolidated):
+    type = errors["type"]
+    if type == "nodes":
+        return _nodeSpecs(errors["uuids"])
+    specs = []
+    for uuid, ids in errors["uuids"].items():
+        nodeName = mcn.nameCache.name(uuid)
+        if not nodeName or not len(ids):
+            continue
+        word = "issues" if len(ids) > 1 else "issue"
+        expand = None
+        if not consolidated:
+            expand = partial(_componentSpecs, nodeName, type, uuid, ids)
+        specs.append(
+            (
+                "{} - {} {}".format(nodeName, len(ids), word),
+                FAILED_COLOR,
+                {"type": type, "uuids": {uuid: ids}},
+                expand,
+            )
+        )
+    return specs
+
+
+def reportSpecs(contextName, nodes, diagnostics, commandsList, consolidated):
+    """
+    Returns the top level rows of the report of a context
+
+    :param contextName: name of the context
+    :type contextName: str
+    :param nodes: UUIDs of the checked nodes
+    :type nodes: list of str
+    :param diagnostics: check name -> {"type": component type, "uuids": errors}
+    :type diagnostics: dict
+    :param commandsList: modelChecker_list.mcCommandsList
+    :type commandsList: dict
+    :param consolidated: only list the failing nodes, not their components
+    :type consolidated: bool
+    :return: (text, color, errors, expand) of every row
+    :rtype: list of tuple
+    """
+    plural = "" if len(nodes) == 1 else "s"
+    expand = None if consolidated or not nodes else partial(_nodeSpecs, nodes)
+    specs = [("Node{} checked: {}".format(plural, len(nodes)), None, None, expand)]
+    if not diagnostics:
+        message = "{} - No tests run in this context.".format(contextName)
+        specs.append((message, None, None, None))
+        return specs
+    for command in sorted(commandsList):
+        if command not in diagnostics:
+            continue
+        errors = diagnostics[command]
+        label = commandsList[command]["label"]
+        if "profile" in errors:
+            profile = mcp.formatProfile(errors["profile"], errors["type"])
+            label = "{}  ({})".format(label, profile)
+        if hasErrors(errors):
+            specs.append(
+                (
+                    "{} [ FAILED ]".format(label),
+                    FAILED_COLOR,
+                    errors,
+                    partial(_failureSpecs, errors, consolidated),
+                )
+            )
+        else:
+            specs.append(("{} [ SUCCESS ]".format(label), SUCCESS_COLOR, None, None))
+    return specs
+
+
+class ReportModel(QtCore.QAbstractItemModel):
+    """
+    Lazy, paginated tree model of a check report
+    """
+
+    def __init__(self, parent=None):
+        super(ReportModel, self).__init__(parent)
+        self._root = ReportItem(None, "")
+
+    def setSpecs(self, specs):
+        """
+        Replaces the report with new top level rows
+
+        :param specs: (text, color, errors, expand) of every row, see reportSpecs
+        :type specs: list of tuple
+        """
+        self.beginResetModel()
+        self._root = ReportItem(None, "", expand=lambda: specs)
+        self.endResetModel()
+        self.fetchMore(QtCore.QModelIndex())
+
+    def clear(self):
+        self.setSpecs([])
+
+    def item(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        item = self.item(parent)
+        if column != 0 or not 0 <= row < len(item.children):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, item.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.item(parent).children)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        return self.item(parent).hasChildren()
+
+    def canFetchMore(self, parent):
+        item = self.item(parent)
+        return item.hasChildren() and len(item.children) < len(item.specs())
+
+    def fetchMore(self, parent):
+        item = self.item(parent)
+        specs = item.specs()
+        first = len(item.children)
+        last = min(first + PAGE_SIZE, len(specs)) - 1
+        if last < first:
+            return
+        self.beginInsertRows(parent, first, last)
+        for text, color, errors, expand in specs[first : last + 1]:
+            item.children.append(ReportItem(item, text, color, errors, expand))
+        self.endInsertRows()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = index.internalPointer()
+        if role == QtCore.Qt.DisplayRole:
+            return item.text
+        if role == QtCore.Qt.ForegroundRole and item.color:
+            return QtGui.QBrush(QtGui.QColor(item.color))
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
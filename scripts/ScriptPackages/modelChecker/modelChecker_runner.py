@@ -0,0 +1,152 @@
+from functools import partial
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+import modelChecker.modelChecker_arrays as mca
+import modelChecker.modelChecker_dag as mcdag
+import modelChecker.modelChecker_incremental as mci
+import modelChecker.modelChecker_names as mcn
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_registry as mcreg
+import modelChecker.modelChecker_scan as mcs
+import modelChecker.modelChecker_uv as mcuv
+
+# Check runner shared by the UI and the headless batch mode
+
+DEFAULT_CAMERAS = {"|front", "|persp", "|top", "|side"}
+
+
+def getAllNodes():
+    """
+    Returns the UUIDs of all transforms in the scene except the default cameras
+
+    :return: UUIDs of the transforms
+    :rtype: list of str
+    """
+    allNodes = cmds.ls(transforms=True, long=True) or []
+    allUuids = cmds.ls(transforms=True, long=True, uuid=True) or []
+    return [
+        uuid for node, uuid in zip(allNodes, allUuids) if node not in DEFAULT_CAMERAS
+    ]
+
+
+def getMeshSelection(nodes):
+    """
+    Returns a selection list of the given transforms that have a mesh shape
+
+    :param nodes: UUIDs of the transforms
+    :type nodes: list of str
+    :return: selection list of the mesh transforms
+    :rtype: om.MSelectionList
+    """
+    SLMesh = om.MSelectionList()
+    # transforms with a mesh shape, resolved with one listRelatives call
+    meshShapes = cmds.ls(type="mesh", long=True)
+    meshParents = set()
+    if meshShapes:
+        meshParents.update(
+            cmds.listRelatives(meshShapes, parent=True, fullPath=True) or []
+        )
+    for nodeName in mcn.nameCache.names(nodes):
+        if nodeName in meshParents:
+            SLMesh.add(nodeName)
+    return SLMesh
+
+
+def runMeshChecks(commands, SLMesh, nodes=None, profiler=None, workers=0):
+    """
+    Runs the given checks on a selection list of meshes
+
+    :param commands: names of the checks
+    :type commands: list of str
+    :param SLMesh: selection list of the mesh transforms
+    :type SLMesh: om.MSelectionList
+    :param nodes: UUIDs of the transforms, passed to checks that work on nodes
+    :type nodes: list of str
+    :param profiler: collects the cost of every check
+    :type profiler: modelChecker_profile.CheckProfiler
+    :param workers: number of threads evaluating the array and UV checks,
+        0 runs serially
+    :type workers: int
+    :return: A dictionary of check name to a tuple of the component type and a dictionary of UUIDs to component IDs
+    :rtype: dict
+    """
+    profiler = profiler or mcp.CheckProfiler()
+    nodes = nodes or []
+    # topology and UV checks are answered from bulk arrays, the built-in
+    # iterator checks share one pass per mesh per component type and the
+    # naming checks one DAG traversal
+    arrayCommands = mcreg.checksByNeeds(commands, "arrays")
+    uvCommands = mcreg.checksByNeeds(commands, "uvs")
+    results = mca.arrayChecks(arrayCommands, SLMesh, profiler, workers)
+    results.update(mcuv.uvChecks(uvCommands, SLMesh, profiler, workers))
+    scanCommands = [
+        command
+        for command in mcreg.checksByNeeds(commands, "meshes")
+        if mcreg.getCheck(command).function is None
+    ]
+    results.update(mcs.scanMeshes(scanCommands, SLMesh, profiler))
+    dagCommands = mcreg.checksByNeeds(commands, "dag")
+    results.update(mcdag.namingChecks(dagCommands, nodes, profiler))
+    for command in commands:
+        if command in results:
+            continue
+        check = mcreg.getCheck(command)
+        with profiler.measure([command]):
+            results[command] = check.run(nodes, SLMesh)
+        if check.needs == "nodes":
+            profiler.count(command, nodes=len(nodes))
+        else:
+            profiler.count(command, meshes=SLMesh.length())
+    return results
+
+
+def commandToRun(commands, nodes, incremental=False, traceMemory=False, workers=0):
+    """
+    Runs the given checks on the given nodes
+
+    :param commands: names of the checks from modelChecker_list.mcCommandsList
+    :type commands: list of str
+    :param nodes: UUIDs of the transforms to check
+    :type nodes: list of str
+    :param incremental: reuse per-mesh results of meshes that did not change
+        since the last incremental run
+    :type incremental: bool
+    :param traceMemory: record the peak memory of every check (slower)
+    :type traceMemory: bool
+    :param workers: number of threads evaluating the array and UV checks,
+        0 runs serially, the results are the same
+    :type workers: int
+    :return: A dictionary of check name to {"type": component type, "uuids": errors,
+        "profile": cost of the check, see modelChecker_profile}
+    :rtype: dict
+    """
+    diagnostics = {}
+    mcn.nameCache.beginRun()
+    nodes = [node for node in nodes if mcn.nameCache.exists(node)]
+    SLMesh = getMeshSelection(nodes)
+    profiler = mcp.CheckProfiler(traceMemory)
+    profiler.start()
+    try:
+        if incremental:
+            meshCommands = [c for c in commands if mcreg.getCheck(c).perMesh]
+            runChecks = partial(runMeshChecks, profiler=profiler, workers=workers)
+            results = mci.meshResults.run(meshCommands, SLMesh, runChecks)
+            otherCommands = [c for c in commands if c not in results]
+            results.update(
+                runMeshChecks(otherCommands, SLMesh, nodes, profiler, workers)
+            )
+        else:
+            results = runMeshChecks(commands, SLMesh, nodes, profiler, workers)
+    finally:
+        profiler.stop()
+    for command in commands:
+        type, errors = results[command]
+        diagnostics[command] = {
+            "type": type,
+            "uuids": errors,
+            "profile": profiler.profile(command),
+        }
+    SLMesh.clear()
+    return diagnostics
@@ -0,0 +1,112 @@
+from collections import defaultdict
+
+import maya.api.OpenMaya as om
+
+import modelChecker.modelChecker_profile as mcp
+
+# Fused topology scan
+#
+# Every mesh is walked once per component type and all enabled predicates
+# are evaluated on each component. A feature (e.g. the vertex count of a
+# face) is queried once per component even if several checks use it.
+# Results follow the same (type, {UUID: [... componentId]}) contract as the
+# functions in modelChecker_commands.
+#
+# Checks that can be answered from the face vertex arrays run in
+# modelChecker_arrays and modelChecker_uv. Only checks that need a query the
+# arrays cannot give (isStarlike) are scanned here.
+
+COMPONENT_ITERATORS = {
+    "polygon": om.MItMeshPolygon,
+}
+
+COMPONENT_FEATURES = {
+    "polygon": {
+        "starlike": lambda it: it.isStarlike(),
+    },
+}
+
+# check name -> (component type, feature, test)
+SCAN_CHECKS = {
+    "starlike": ("polygon", "starlike", lambda value: value is False),
+}
+
+
+def scanMesh(dagPath, componentType, checks, results):
+    """
+    Walks the components of one mesh once and evaluates all given checks
+
+    :param dagPath: DAG path of the mesh
+    :type dagPath: om.MDagPath
+    :param componentType: a key of COMPONENT_ITERATORS
+    :type componentType: str
+    :param checks: names of checks in SCAN_CHECKS using this component type
+    :type checks: list of str
+    :param results: check name -> {UUID: [... componentId]}, filled in place
+    :type results: dict
+    """
+    uuid = om.MFnDependencyNode(dagPath.node()).uuid().asString()
+    features = COMPONENT_FEATURES[componentType]
+    getters = [
+        (feature, features[feature])
+        for feature in sorted({SCAN_CHECKS[check][1] for check in checks})
+    ]
+    tests = [
+        (results[check], SCAN_CHECKS[check][1], SCAN_CHECKS[check][2])
+        for check in checks
+    ]
+    it = COMPONENT_ITERATORS[componentType](dagPath)
+    while not it.isDone():
+        values = {feature: getter(it) for feature, getter in getters}
+        for errors, feature, test in tests:
+            if test(values[feature]):
+                errors[uuid].append(it.index())
+        it.next()
+
+
+def scanMeshes(commands, SLMesh, profiler=None):
+    """
+    Runs every scan-capable check in commands with one pass per mesh per component type
+
+    :param commands: names of the checks to run, unknown names are ignored
+    :type commands: list of str
+    :param SLMesh: selection list of the meshes to check
+    :type SLMesh: om.MSelectionList
+    :param profiler: collects the cost of every check
+    :type profiler: modelChecker_profile.CheckProfiler
+    :return: A dictionary of check name to a tuple of the component type and a dictionary of UUIDs to component IDs
+    :rtype: dict of (str, tuple of (str, dict of (str, list of int)))
+    """
+    profiler = profiler or mcp.CheckProfiler()
+    checks = [command for command in commands if command in SCAN_CHECKS]
+    results = {check: defaultdict(list) for check in checks}
+    checksByType = defaultdict(list)
+    for check in checks:
+        checksByType[SCAN_CHECKS[check][0]].append(check)
+
+    selIt = om.MItSelectionList(SLMesh)
+    while not selIt.isDone():
+        dagPath = selIt.getDagPath()
+        fnMesh = om.MFnMesh(dagPath)
+        for componentType, typeChecks in checksByType.items():
+            with profiler.measure(typeChecks):
+                scanMesh(dagPath, componentType, typeChecks, results)
+            components = mcp.componentCount(fnMesh, componentType)
+            for check in typeChecks:
+                profiler.count(check, meshes=1, components=components)
+        selIt.next()
+    return {check: (SCAN_CHECKS[check][0], results[check]) for check in checks}
+
+
+def scanSingle(check, SLMesh):
+    """
+    Runs a single scan check, used by the per-check functions in modelChecker_commands
+
+    :param check: name of a check in SCAN_CHECKS
+    :type check: str
+    :param SLMesh: selection list of the meshes to check
+    :type SLMesh: om.MSelectionList
+    :return: A tuple containing the component type and a dictionary of UUIDs to component IDs
+    :rtype: tuple of (str, dict of (str, list of int))
+    """
+    return scanMeshes([check], SLMesh)[check]
@@ -0,0 +1,243 @@
+import numpy as np
+
+# Mesh topology from face vertex arrays
+#
+# Everything here is derived with NumPy from the face vertex counts and
+# connects of a mesh (MFnMesh.getVertices), so it needs neither Maya nor one
+# API call per component, and runs in worker threads. Edges are the unique
+# vertex pairs of the face sides; their index is the position in
+# edgeVertices, MeshArrays maps it to Maya's edge id when results are
+# reported.
+
+ZERO_TOLERANCE = 0.00000001
+
+
+def pairKeys(first, second, numVertices):
+    """Order independent key of a vertex pair"""
+    return np.minimum(first, second) * numVertices + np.maximum(first, second)
+
+
+def nextCorners(counts):
+    """
+    Returns the index of the following corner of every face corner
+
+    :param counts: number of vertices of every face
+    :type counts: np.ndarray
+    :rtype: np.ndarray
+    """
+    starts = np.cumsum(counts) - counts
+    following = np.arange(1, counts.sum() + 1)
+    following[(starts + counts - 1)[counts > 0]] = starts[counts > 0]
+    return following
+
+
+def buildEdges(counts, connects, numVertices):
+    """
+    Returns the edges of a mesh as the unique vertex pairs of its face sides
+
+    :param counts: number of vertices of every face
+    :type counts: np.ndarray
+    :param connects: vertex ids of every face, concatenated
+    :type connects: np.ndarray
+    :param numVertices: number of vertices of the mesh
+    :type numVertices: int
+    :return: vertex ids of every edge (numEdges, 2), sorted by vertex pair, and
+        the edge of every face side (v[k], v[k + 1]), aligned with connects
+    :rtype: tuple of (np.ndarray, np.ndarray)
+    """
+    following = nextCorners(counts)
+    keys = pairKeys(connects, connects[following], numVertices)
+    _, firstSide, sideEdges = np.unique(keys, return_index=True, return_inverse=True)
+    edgeVertices = np.column_stack([connects[firstSide], connects[following[firstSide]]])
+    return edgeVertices.reshape(-1, 2), sideEdges.ravel()
+
+
+def matchEdges(edgeVertices, otherVertices, numVertices):
+    """
+    Returns the row of otherVertices with the vertex pair of every edge
+
+    :param edgeVertices: vertex ids of every edge (numEdges, 2)
+    :type edgeVertices: np.ndarray
+    :param otherVertices: vertex ids of the same edges in another order, e.g.
+        Maya's edges by edge id
+    :type otherVertices: np.ndarray
+    :param numVertices: number of vertices of the mesh
+    :type numVertices: int
+    :raises ValueError: if the two do not hold the same vertex pairs
+    :rtype: np.ndarray
+    """
+    edgeVertices = np.asarray(edgeVertices, dtype=np.int64).reshape(-1, 2)
+    otherVertices = np.asarray(otherVertices, dtype=np.int64).reshape(-1, 2)
+    if len(edgeVertices) != len(otherVertices):
+        raise ValueError(
+            "Expected {} edges, got {}".format(len(edgeVertices), len(otherVertices))
+        )
+    if not len(edgeVertices):
+        return np.zeros(0, dtype=np.int64)
+    keys = pairKeys(edgeVertices[:, 0], edgeVertices[:, 1], numVertices)
+    otherKeys = pairKeys(otherVertices[:, 0], otherVertices[:, 1], numVertices)
+    order = np.argsort(otherKeys)
+    position = np.searchsorted(otherKeys[order], keys)
+    match = order[np.minimum(position, len(order) - 1)]
+    # keys are unique, so with equal counts every other edge is matched once
+    if not np.array_equal(otherKeys[match], keys):
+        raise ValueError("Edges do not share the same vertex pairs")
+    return match
+
+
+class MeshTopology(object):
+    """
+    Face vertex arrays of a mesh and the topology derived from them
+    """
+
+    def __init__(self, counts, connects, numVertices, points=None):
+        self.numVertices = numVertices
+        self._cache = {
+            "counts": np.asarray(counts, dtype=np.int64),
+            "connects": np.asarray(connects, dtype=np.int64),
+        }
+        if points is not None:
+            self._cache["points"] = np.asarray(points, dtype=np.float64)
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def counts(self):
+        """Number of vertices of every face"""
+        return self._cache["counts"]
+
+    @property
+    def connects(self):
+        """Vertex ids of every face, concatenated"""
+        return self._cache["connects"]
+
+    @property
+    def points(self):
+        """Object space vertex positions, (numVertices, 3)"""
+        return self._cache["points"]
+
+    @property
+    def faceStarts(self):
+        """Offset of the first vertex of every face in connects"""
+        return self._get(
+            "faceStarts", lambda: np.cumsum(self.counts) - self.counts
+        )
+
+    def _buildEdges(self):
+        edgeVertices, faceEdges = buildEdges(
+            self.counts, self.connects, self.numVertices
+        )
+        self._cache["edgeVertices"] = edgeVertices
+        self._cache["faceEdges"] = faceEdges
+
+    @property
+    def edgeVertices(self):
+        """Vertex ids of every edge, (numEdges, 2)"""
+        if "edgeVertices" not in self._cache:
+            self._buildEdges()
+        return self._cache["edgeVertices"]
+
+    @property
+    def faceEdges(self):
+        """Edge of every face side, aligned with connects"""
+        if "faceEdges" not in self._cache:
+            self._buildEdges()
+        return self._cache["faceEdges"]
+
+    @property
+    def edgeFaceCounts(self):
+        """Number of faces connected to every edge"""
+        return self._get(
+            "edgeFaceCounts",
+            lambda: np.bincount(self.faceEdges, minlength=len(self.edgeVertices)),
+        )
+
+
+def faceAreas(arrays):
+    """
+    Area of every face as the sum of its fan triangles
+
+    :param arrays: mesh arrays
+    :type arrays: MeshTopology
+    :return: area of every face
+    :rtype: np.ndarray
+    """
+    counts = arrays.counts
+    triCounts = np.maximum(counts - 2, 0)
+    triFace = np.repeat(np.arange(len(counts)), triCounts)
+    firstTri = np.cumsum(triCounts) - triCounts
+    local = np.arange(len(triFace)) - np.repeat(firstTri, triCounts)
+    starts = arrays.faceStarts[triFace]
+    connects = arrays.connects
+    points = arrays.points
+    a = points[connects[starts]]
+    b = points[connects[starts + local + 1]]
+    c = points[connects[starts + local + 2]]
+    area = 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1)
+    return np.bincount(triFace, weights=area, minlength=len(counts))
+
+
+def triangles(arrays):
+    return np.flatnonzero(arrays.counts == 3)
+
+
+def ngons(arrays):
+    return np.flatnonzero(arrays.counts > 4)
+
+
+def lamina(arrays):
+    # faces built from the same set of vertices as another face
+    counts = arrays.counts
+    result = []
+    for count in np.unique(counts):
+        faces = np.flatnonzero(counts == count)
+        if len(faces) < 2:
+            continue
+        rows = arrays.connects[
+            arrays.faceStarts[faces][:, None] + np.arange(count)[None, :]
+        ]
+        rows.sort(axis=1)
+        _, inverse, occurrences = np.unique(
+            rows, axis=0, return_inverse=True, return_counts=True
+        )
+        result.append(faces[occurrences[inverse.ravel()] > 1])
+    if not result:
+        return np.zeros(0, dtype=np.int64)
+    return np.sort(np.concatenate(result))
+
+
+def zeroAreaFaces(arrays):
+    return np.flatnonzero(faceAreas(arrays) <= ZERO_TOLERANCE)
+
+
+def missingUVs(arrays):
+    return np.flatnonzero(arrays.uvCounts == 0)
+
+
+def hardEdges(arrays):
+    return np.flatnonzero(~arrays.edgeSmooth & (arrays.edgeFaceCounts != 1))
+
+
+def zeroLengthEdges(arrays):
+    edges = arrays.edgeVertices
+    points = arrays.points
+    length = np.linalg.norm(points[edges[:, 1]] - points[edges[:, 0]], axis=1)
+    return np.flatnonzero(length <= ZERO_TOLERANCE)
+
+
+def noneManifoldEdges(arrays):
+    return np.flatnonzero(arrays.edgeFaceCounts > 2)
+
+
+def openEdges(arrays):
+    return np.flatnonzero(arrays.edgeFaceCounts < 2)
+
+
+def poles(arrays):
+    valence = np.bincount(
+        arrays.edgeVertices.ravel(), minlength=arrays.numVertices
+    )
+    return np.flatnonzero(valence > 5)
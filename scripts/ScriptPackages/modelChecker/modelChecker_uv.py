@@ -0,0 +1,131 @@
+from collections import defaultdict
+
+import numpy as np
+import maya.api.OpenMaya as om
+
+import modelChecker.modelChecker_parallel as mcpar
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_uvGeometry as mcuvg
+
+# Vectorized UV analysis
+#
+# The UVs, the per-face UV ids of every UV set and the triangulation of the
+# faces are read once per mesh, the predicates in modelChecker_uvGeometry
+# answer the checks with NumPy. Results follow the same
+# (type, {UUID: [... componentId]}) contract as modelChecker_commands.
+#
+# Checks reporting UV ids use the current UV set, the UV ids of other sets
+# can not be selected as .map[] components. Checks reporting faces combine
+# all UV sets.
+
+
+def readUVSets(fnMesh, allSets=True):
+    """
+    Returns the UV sets of a mesh
+
+    :param fnMesh: function set of the mesh
+    :type fnMesh: om.MFnMesh
+    :param allSets: all UV sets, or only the current one
+    :type allSets: bool
+    :return: UV set name -> UV set
+    :rtype: dict of (str, modelChecker_uvGeometry.UVSet)
+    """
+    if allSets:
+        names = fnMesh.getUVSetNames()
+    else:
+        names = [fnMesh.currentUVSetName()]
+    # the triangulation is shared by all UV sets
+    triCounts, triCorners = fnMesh.getTriangleOffsets()
+    uvSets = {}
+    for name in names:
+        us, vs = fnMesh.getUVs(name)
+        uvCounts, uvIds = fnMesh.getAssignedUVs(name)
+        uvSets[name] = mcuvg.UVSet(
+            np.column_stack([np.array(us), np.array(vs)]),
+            uvCounts,
+            uvIds,
+            triCounts,
+            triCorners,
+        )
+    return uvSets
+
+
+# check name -> (component type, predicate, all UV sets)
+UV_CHECKS = {
+    "uvRange": ("uv", mcuvg.uvRange, False),
+    "onBorder": ("uv", mcuvg.onBorder, False),
+    "crossBorder": ("polygon", mcuvg.crossBorder, True),
+    "selfPenetratingUVs": ("polygon", mcuvg.selfPenetratingUVs, True),
+}
+
+
+def uvChecks(commands, SLMesh, profiler=None, workers=0):
+    """
+    Runs every UV check in commands, reading the UV sets of each mesh once
+
+    :param commands: names of the checks to run, unknown names are ignored
+    :type commands: list of str
+    :param SLMesh: selection list of the meshes to check
+    :type SLMesh: om.MSelectionList
+    :param profiler: collects the cost of every check
+    :type profiler: modelChecker_profile.CheckProfiler
+    :param workers: number of threads evaluating the predicates, 0 runs serially
+    :type workers: int
+    :return: A dictionary of check name to a tuple of the component type and a dictionary of UUIDs to component IDs
+    :rtype: dict of (str, tuple of (str, dict of (str, list of int)))
+    """
+    profiler = profiler or mcp.CheckProfiler()
+    checks = [command for command in commands if command in UV_CHECKS]
+    results = {check: defaultdict(list) for check in checks}
+    allSets = any(UV_CHECKS[check][2] for check in checks)
+
+    def meshes():
+        # the UV sets are read on the main thread
+        selIt = om.MItSelectionList(SLMesh)
+        while not selIt.isDone():
+            dagPath = selIt.getDagPath()
+            fnMesh = om.MFnMesh(dagPath)
+            uuid = om.MFnDependencyNode(dagPath.node()).uuid().asString()
+            current = fnMesh.currentUVSetName()
+            with profiler.measure(checks):
+                uvSets = readUVSets(fnMesh, allSets)
+            yield fnMesh, uuid, current, uvSets
+            selIt.next()
+
+    def evaluate(mesh):
+        fnMesh, uuid, current, uvSets = mesh
+        failed = {}
+        for check in checks:
+            predicate, useAllSets = UV_CHECKS[check][1], UV_CHECKS[check][2]
+            names = list(uvSets) if useAllSets else [current]
+            with profiler.measure([check]):
+                failedSets = [
+                    predicate(uvSets[name]) for name in names if name in uvSets
+                ]
+                failed[check] = (
+                    np.unique(np.concatenate(failedSets)) if failedSets else []
+                )
+        return fnMesh, uuid, failed
+
+    if checks:
+        for fnMesh, uuid, failed in mcpar.mapOrdered(evaluate, meshes(), workers):
+            for check in checks:
+                components = mcp.componentCount(fnMesh, UV_CHECKS[check][0])
+                profiler.count(check, meshes=1, components=components)
+                if len(failed[check]):
+                    results[check][uuid].extend(int(i) for i in failed[check])
+    return {check: (UV_CHECKS[check][0], results[check]) for check in checks}
+
+
+def uvSingle(check, SLMesh):
+    """
+    Runs a single UV check, used by the per-check functions in modelChecker_commands
+
+    :param check: name of a check in UV_CHECKS
+    :type check: str
+    :param SLMesh: selection list of the meshes to check
+    :type SLMesh: om.MSelectionList
+    :return: A tuple containing the component type and a dictionary of UUIDs to component IDs
+    :rtype: tuple of (str, dict of (str, list of int))
+    """
+    return uvChecks([check], SLMesh)[check]
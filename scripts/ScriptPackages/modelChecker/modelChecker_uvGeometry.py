@@ -0,0 +1,191 @@
+import numpy as np
+
+# UV geometry
+#
+# The predicates of the UV checks, on UV sets given as flat arrays so they
+# need no Maya and run in worker threads. Range and border checks are NumPy
+# masks, overlapping faces are found with a uniform grid (spatial hash) over
+# the triangles of the UV polygons and exact separating-axis triangle tests.
+# The polygons are split with Maya's own triangulation of the faces
+# (MFnMesh.getTriangleOffsets), fan triangles would leave concave polygons.
+
+BORDER_TOLERANCE = 0.00001
+# overlaps thinner than this fraction of the UV extent count as touching
+OVERLAP_TOLERANCE = 1e-9
+# upper bound of grid cells per triangle, larger triangles use coarser cells
+MAX_CELLS_PER_TRIANGLE = 64
+
+
+class UVSet(object):
+    """
+    UV positions, per-face UV ids and triangulation of one UV set of a mesh
+    """
+
+    def __init__(self, uvs, counts, ids, triCounts, triCorners):
+        """
+        :param uvs: UV positions (numUVs, 2)
+        :param counts: number of UVs of every face, 0 for faces without UVs
+        :param ids: UV ids of every face, concatenated
+        :param triCounts: number of triangles of every face
+        :param triCorners: face-relative corners of every triangle, concatenated
+            (MFnMesh.getTriangleOffsets)
+        """
+        self.uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.triCounts = np.asarray(triCounts, dtype=np.int64)
+        self.triCorners = np.asarray(triCorners, dtype=np.int64).reshape(-1, 3)
+
+
+def uvRange(uvSet):
+    u, v = uvSet.uvs[:, 0], uvSet.uvs[:, 1]
+    return np.flatnonzero((u < 0) | (u > 10) | (v < 0))
+
+
+def onBorder(uvSet):
+    uvs = uvSet.uvs
+    nearInteger = np.abs(np.trunc(uvs) - uvs) < BORDER_TOLERANCE
+    return np.flatnonzero(nearInteger[:, 0] | nearInteger[:, 1])
+
+
+def crossBorder(uvSet):
+    # faces whose UVs lie in more than one UV tile
+    faces = np.flatnonzero(uvSet.counts > 0)
+    if not len(faces):
+        return faces
+    uvs = uvSet.uvs[uvSet.ids]
+    tiles = np.where(uvs > 0, np.trunc(uvs), np.trunc(uvs) - 1)
+    starts = uvSet.starts[faces]
+    crosses = np.any(
+        np.minimum.reduceat(tiles, starts) != np.maximum.reduceat(tiles, starts),
+        axis=1,
+    )
+    return faces[crosses]
+
+
+def uvTriangles(uvSet):
+    """
+    Triangulates the UV polygons of every face with the triangles Maya uses
+    for the face, which stay inside concave polygons
+
+    :param uvSet: UV set
+    :type uvSet: UVSet
+    :return: (triangle corners (T, 3, 2), face id of every triangle (T,))
+    :rtype: tuple of np.ndarray
+    """
+    triFace = np.repeat(np.arange(len(uvSet.triCounts)), uvSet.triCounts)
+    corners = uvSet.triCorners
+    # faces without UVs in this set have no UV triangles
+    mapped = uvSet.counts[triFace] > 0
+    triFace, corners = triFace[mapped], corners[mapped]
+    ids = uvSet.ids[uvSet.starts[triFace][:, None] + corners]
+    return uvSet.uvs[ids], triFace
+
+
+def candidatePairs(lower, upper):
+    """
+    Returns the pairs of triangles whose bounding boxes share a grid cell
+
+    :param lower: lower bounding box corner of every triangle (T, 2)
+    :type lower: np.ndarray
+    :param upper: upper bounding box corner of every triangle (T, 2)
+    :type upper: np.ndarray
+    :return: (first, second) triangle indices with first < second
+    :rtype: tuple of np.ndarray
+    """
+    numTris = len(lower)
+    extent = upper - lower
+    origin = lower.min(axis=0)
+    # about one triangle per cell, coarser if big triangles cover too many cells
+    cellSize = max(float(np.median(extent.max(axis=1))), 1e-12)
+    while True:
+        cellLower = np.floor((lower - origin) / cellSize).astype(np.int64)
+        cellUpper = np.floor((upper - origin) / cellSize).astype(np.int64)
+        spans = cellUpper - cellLower + 1
+        cellCounts = spans[:, 0] * spans[:, 1]
+        total = cellCounts.sum()
+        if cellCounts.max() <= MAX_CELLS_PER_TRIANGLE or total <= 4 * numTris:
+            break
+        cellSize *= 2.0
+    # one entry per (triangle, covered cell)
+    tri = np.repeat(np.arange(numTris), cellCounts)
+    firstCell = np.cumsum(cellCounts) - cellCounts
+    local = np.arange(len(tri)) - np.repeat(firstCell, cellCounts)
+    cellX = cellLower[tri, 0] + local % spans[tri, 0]
+    cellY = cellLower[tri, 1] + local // spans[tri, 0]
+    keys = cellX * (int(cellUpper[:, 1].max()) + 1) + cellY
+    order = np.lexsort((tri, keys))
+    keys, tri = keys[order], tri[order]
+    first, second = [], []
+    offset = 1
+    while offset < len(keys):
+        same = keys[offset:] == keys[:-offset]
+        if not same.any():
+            break
+        first.append(tri[:-offset][same])
+        second.append(tri[offset:][same])
+        offset += 1
+    if not first:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+    pairKeys = np.unique(np.minimum(first, second) * numTris + np.maximum(first, second))
+    return pairKeys // numTris, pairKeys % numTris
+
+
+def trianglesOverlap(a, b, tolerance):
+    """
+    Exact separating axis test of 2D triangle pairs, touching triangles do not overlap
+
+    :param a: first triangles (P, 3, 2)
+    :type a: np.ndarray
+    :param b: second triangles (P, 3, 2)
+    :type b: np.ndarray
+    :param tolerance: minimum overlap along every axis
+    :type tolerance: float
+    :return: overlap flag of every pair
+    :rtype: np.ndarray
+    """
+    overlap = np.ones(len(a), dtype=bool)
+    for tri in (a, b):
+        for i in range(3):
+            edge = tri[:, (i + 1) % 3] - tri[:, i]
+            axis = np.stack([-edge[:, 1], edge[:, 0]], axis=1)
+            length = np.linalg.norm(axis, axis=1)
+            axis = axis / np.where(length > 0, length, 1.0)[:, None]
+            projA = np.einsum("pkj,pj->pk", a, axis)
+            projB = np.einsum("pkj,pj->pk", b, axis)
+            separated = (projA.max(axis=1) <= projB.min(axis=1) + tolerance) | (
+                projB.max(axis=1) <= projA.min(axis=1) + tolerance
+            )
+            overlap &= ~separated
+    return overlap
+
+
+def selfPenetratingUVs(uvSet):
+    # faces whose UV polygon overlaps the UV polygon of another face
+    triangles, triFace = uvTriangles(uvSet)
+    if len(triangles) < 2:
+        return np.zeros(0, dtype=np.int64)
+    edges = np.stack(
+        [triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]], axis=1
+    )
+    area = 0.5 * np.abs(
+        edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0]
+    )
+    lower = triangles.min(axis=1)
+    upper = triangles.max(axis=1)
+    scale = float((upper.max(axis=0) - lower.min(axis=0)).max())
+    tolerance = OVERLAP_TOLERANCE * max(scale, 1.0)
+    # degenerate triangles can not overlap anything
+    valid = np.flatnonzero(area > tolerance * tolerance)
+    if len(valid) < 2:
+        return np.zeros(0, dtype=np.int64)
+    first, second = candidatePairs(lower[valid], upper[valid])
+    first, second = valid[first], valid[second]
+    otherFace = triFace[first] != triFace[second]
+    first, second = first[otherFace], second[otherFace]
+    hits = trianglesOverlap(triangles[first], triangles[second], tolerance)
+    return np.unique(np.concatenate([triFace[first[hits]], triFace[second[hits]]]))
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import modelChecker.modelChecker_batch as mcb
+
+
+def test_importWithoutGui():
+    # a fresh interpreter, like mayapy -m and every spawn worker
+    code = (
+        "import sys\n"
+        "import modelChecker.modelChecker_batch as mcb\n"
+        "assert callable(mcb.main) and callable(mcb.checkScene)\n"
+        "assert 'modelChecker.modelChecker_UI' not in sys.modules\n"
+        "assert 'PySide2' not in sys.modules\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_helpDoesNotNeedMaya():
+    try:
+        mcb.main(["--help"])
+    except SystemExit as e:
+        assert e.code == 0
+
+
+def test_resolveProfile():
+    assert mcb.resolveProfile("all") == list(mcb.mcl.mcCommandsList)
+    commands = mcb.resolveProfile("trailingNumbers")
+    assert commands == ["trailingNumbers"]
+
+
+def test_reportNamesAreUnique():
+    names = mcb.reportNames(["/a/rock.mb", "/b/rock.mb", "/b/tree.ma"])
+    assert sorted(names.values()) == ["rock", "rock_2", "tree"]
+
+
+def test_registerModulesAreImported(tmp_path, monkeypatch):
+    # stands in for a module calling registerCheck, which needs Maya
+    (tmp_path / "studioChecks.py").write_text(
+        "import modelChecker.modelChecker_list as mcl\n"
+        "mcl.mcCommandsList['studioCheck'] = {\n"
+        "    'label': 'Studio', 'category': 'studio', 'type': 'nodes', 'needs': 'nodes'\n"
+        "}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(mcb.mcl, "mcCommandsList", dict(mcb.mcl.mcCommandsList))
+    mcb.importRegistrations(["studioChecks"])
+    assert mcb.resolveProfile("studio") == ["studioCheck"]
@@ -0,0 +1,29 @@
+import random
+import time
+
+import modelChecker.modelChecker_benchmark as mcbench
+import modelChecker.modelChecker_parallel as mcpar
+
+
+def test_mapOrderedKeepsOrder():
+    def slow(item):
+        time.sleep(random.random() * 0.002)
+        return item * item
+
+    items = list(range(100))
+    assert list(mcpar.mapOrdered(slow, items, 8)) == [item * item for item in items]
+
+
+def test_threadedPredicatesMatchSerial():
+    meshes = [mcbench.gridMesh(size, seed) for seed, size in enumerate([3, 10, 25] * 6)]
+    serial = mcbench.runChecks(meshes, 0)
+    assert any(result["zeroLengthEdges"] for result in serial)
+    assert any(result["hardEdges"] for result in serial)
+    for workers in (2, 4, 16):
+        fresh = [mcbench.gridMesh(size, seed) for seed, size in enumerate([3, 10, 25] * 6)]
+        assert mcbench.runChecks(fresh, workers) == serial
+
+
+def test_benchmarkRuns():
+    results = mcbench.run(meshCount=4, gridSize=10, workerCounts=(2,))
+    assert [workers for workers, _ in results] == [0, 2]
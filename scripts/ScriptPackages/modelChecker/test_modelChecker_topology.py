@@ -0,0 +1,174 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import modelChecker.modelChecker_topology as mct
+
+
+def makeMesh(faces, points=None):
+    counts = [len(face) for face in faces]
+    connects = [vertex for face in faces for vertex in face]
+    numVertices = max(connects) + 1
+    if points is None:
+        points = np.random.default_rng(len(faces)).normal(size=(numVertices, 3))
+    return mct.MeshTopology(counts, connects, numVertices, points)
+
+
+def cube():
+    return makeMesh(
+        [
+            [0, 1, 3, 2],
+            [2, 3, 5, 4],
+            [4, 5, 7, 6],
+            [6, 7, 1, 0],
+            [1, 7, 5, 3],
+            [6, 0, 2, 4],
+        ]
+    )
+
+
+def plane(size=3):
+    row = size + 1
+    return makeMesh(
+        [
+            [y * row + x, y * row + x + 1, (y + 1) * row + x + 1, (y + 1) * row + x]
+            for y in range(size)
+            for x in range(size)
+        ]
+    )
+
+
+def fin():
+    # three quads sharing the edge (0, 1)
+    return makeMesh([[0, 1, 2, 3], [1, 0, 4, 5], [0, 1, 6, 7]])
+
+
+def fan(sides=6):
+    # triangles around vertex 0, a pole for more than 5 sides
+    return makeMesh(
+        [[0, i + 1, (i + 1) % sides + 1] for i in range(sides)]
+    )
+
+
+def sideFaces(mesh):
+    """Faces of every vertex pair, like the edge iterator sees them"""
+    faces = Counter()
+    starts = np.cumsum(mesh.counts) - mesh.counts
+    for start, count in zip(starts, mesh.counts):
+        face = mesh.connects[start : start + count].tolist()
+        for k in range(count):
+            faces[frozenset((face[k], face[(k + 1) % count]))] += 1
+    return faces
+
+
+def pairs(mesh, edges):
+    return {frozenset(mesh.edgeVertices[edge].tolist()) for edge in edges}
+
+
+def test_buildEdgesMatchesFaceSides():
+    for mesh in (cube(), plane(), fin(), fan()):
+        faces = sideFaces(mesh)
+        assert pairs(mesh, range(len(mesh.edgeVertices))) == set(faces)
+        assert len(mesh.edgeVertices) == len(faces)
+        # every face side is matched to the edge with its vertex pair
+        following = mct.nextCorners(mesh.counts)
+        sides = np.sort(
+            np.column_stack([mesh.connects, mesh.connects[following]]), axis=1
+        )
+        np.testing.assert_array_equal(
+            np.sort(mesh.edgeVertices[mesh.faceEdges], axis=1), sides
+        )
+        counts = {
+            frozenset(edge): count
+            for edge, count in zip(mesh.edgeVertices.tolist(), mesh.edgeFaceCounts)
+        }
+        assert counts == dict(faces)
+
+
+def test_cube():
+    mesh = cube()
+    assert len(mesh.edgeVertices) == 12
+    assert not len(mct.openEdges(mesh))
+    assert not len(mct.noneManifoldEdges(mesh))
+    assert not len(mct.poles(mesh))
+    assert not len(mct.triangles(mesh))
+    assert not len(mct.lamina(mesh))
+
+
+def test_openPlane():
+    mesh = plane(3)
+    faces = sideFaces(mesh)
+    assert len(mesh.edgeVertices) == 24
+    expected = {edge for edge, count in faces.items() if count < 2}
+    assert len(expected) == 12
+    assert pairs(mesh, mct.openEdges(mesh)) == expected
+    assert not len(mct.noneManifoldEdges(mesh))
+
+
+def test_noneManifold():
+    mesh = fin()
+    assert pairs(mesh, mct.noneManifoldEdges(mesh)) == {frozenset((0, 1))}
+    assert len(mct.openEdges(mesh)) == len(mesh.edgeVertices) - 1
+
+
+def test_poles():
+    assert mct.poles(fan(6)).tolist() == [0]
+    assert not len(mct.poles(fan(5)))
+
+
+def test_hardEdges():
+    mesh = plane(2)
+    mesh.edgeSmooth = np.zeros(len(mesh.edgeVertices), dtype=bool)
+    # border edges are never reported as hard
+    assert pairs(mesh, mct.hardEdges(mesh)) == {
+        edge for edge, count in sideFaces(mesh).items() if count == 2
+    }
+
+
+def test_zeroLengthAndArea():
+    points = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [1, 1, 0]], float)
+    mesh = makeMesh([[0, 1, 2, 3], [1, 4, 2]], points)
+    assert pairs(mesh, mct.zeroLengthEdges(mesh)) == {frozenset((2, 4))}
+    assert mct.zeroAreaFaces(mesh).tolist() == [1]
+    np.testing.assert_allclose(mct.faceAreas(mesh), [1.0, 0.0])
+
+
+def test_lamina():
+    mesh = makeMesh([[0, 1, 2, 3], [3, 2, 1, 0], [0, 1, 4]])
+    assert mct.lamina(mesh).tolist() == [0, 1]
+    assert mct.triangles(mesh).tolist() == [2]
+
+
+def test_matchEdges():
+    mesh = cube()
+    rng = np.random.default_rng(3)
+    # Maya's edges in another order, some with the vertices swapped
+    mayaIds = rng.permutation(len(mesh.edgeVertices))
+    mayaEdges = np.empty_like(mesh.edgeVertices)
+    mayaEdges[mayaIds] = mesh.edgeVertices
+    mayaEdges[::3] = mayaEdges[::3, ::-1]
+    match = mct.matchEdges(mesh.edgeVertices, mayaEdges, mesh.numVertices)
+    np.testing.assert_array_equal(match, mayaIds)
+
+
+def test_matchEdgesMismatch():
+    mesh = cube()
+    edges = mesh.edgeVertices
+    with pytest.raises(ValueError):
+        mct.matchEdges(edges, edges[1:], mesh.numVertices)
+    other = edges.copy()
+    other[0] = other[1]
+    with pytest.raises(ValueError):
+        mct.matchEdges(edges, other, mesh.numVertices)
+    other[0] = [0, 7]
+    with pytest.raises(ValueError):
+        mct.matchEdges(edges, other, mesh.numVertices)
+
+
+def test_meshWithoutFaces():
+    mesh = mct.MeshTopology([], [], 4, np.zeros((4, 3)))
+    assert mesh.edgeVertices.shape == (0, 2)
+    assert not len(mct.matchEdges(mesh.edgeVertices, np.zeros((0, 2)), 4))
+    assert not len(mct.openEdges(mesh))
+    assert not len(mct.poles(mesh))
@@ -0,0 +1,104 @@
+import itertools
+
+import numpy as np
+
+import modelChecker.modelChecker_uvGeometry as mcuvg
+
+
+def makeUVSet(faces, uvs, triangles=None):
+    """UV set with one UV per face corner, fan triangulated unless given"""
+    counts = [len(face) for face in faces]
+    if triangles is None:
+        triangles = [[(0, k + 1, k + 2) for k in range(count - 2)] for count in counts]
+    return mcuvg.UVSet(
+        uvs,
+        counts,
+        [uv for face in faces for uv in face],
+        [len(tris) for tris in triangles],
+        [corner for tris in triangles for tri in tris for corner in tri],
+    )
+
+
+def randomTriangles(count, seed):
+    rng = np.random.default_rng(seed)
+    centers = rng.random((count, 1, 2)) * 4.0
+    return centers + rng.normal(0, 0.15, (count, 3, 2))
+
+
+def test_concaveFaceUsesMayaTriangulation():
+    # a dart with the reflex corner 3, and a small triangle in its notch
+    uvs = [[0, 0], [2, 1], [0, 2], [0.5, 1], [0.05, 0.9], [0.3, 1.0], [0.05, 1.1]]
+    faces = [[0, 1, 2, 3], [4, 5, 6]]
+    fan = makeUVSet(faces, uvs)
+    assert mcuvg.selfPenetratingUVs(fan).tolist() == [0, 1]
+    # Maya splits the dart at the reflex corner
+    maya = makeUVSet(faces, uvs, [[(3, 0, 1), (3, 1, 2)], [(0, 1, 2)]])
+    assert not len(mcuvg.selfPenetratingUVs(maya))
+    triangles, triFace = mcuvg.uvTriangles(maya)
+    np.testing.assert_allclose(triangles[0], [[0.5, 1], [0, 0], [2, 1]])
+    assert triFace.tolist() == [0, 0, 1]
+
+
+def test_facesWithoutUVsHaveNoTriangles():
+    uvSet = mcuvg.UVSet(
+        [[0, 0], [1, 0], [0, 1]], [3, 0, 3], [0, 1, 2, 0, 1, 2], [1, 1, 1],
+        [0, 1, 2] * 3,
+    )
+    _, triFace = mcuvg.uvTriangles(uvSet)
+    assert triFace.tolist() == [0, 2]
+    assert mcuvg.selfPenetratingUVs(uvSet).tolist() == [0, 2]
+
+
+def test_candidatePairsMatchBruteForce():
+    for seed in range(5):
+        triangles = randomTriangles(300, seed)
+        lower, upper = triangles.min(axis=1), triangles.max(axis=1)
+        first, second = mcuvg.candidatePairs(lower, upper)
+        found = set(zip(first.tolist(), second.tolist()))
+        assert all(a < b for a, b in found)
+        expected = {
+            (a, b)
+            for a, b in itertools.combinations(range(len(triangles)), 2)
+            if np.all(lower[a] <= upper[b]) and np.all(lower[b] <= upper[a])
+        }
+        assert expected <= found
+
+
+def test_trianglesOverlap():
+    base = np.array([[0, 0], [1, 0], [0, 1]], float)
+    others = np.array(
+        [
+            [[0.2, 0.2], [0.8, 0.1], [0.1, 0.8]],  # inside
+            [[0.4, 0.4], [1.5, 0.4], [0.4, 1.5]],  # overlapping corner
+            [[1, 0], [0, 1], [1, 1]],  # shares the diagonal edge
+            [[2, 2], [3, 2], [2, 3]],  # apart
+            [[0.6, 0.6], [2, 0.6], [0.6, 2]],  # bounding boxes overlap only
+        ]
+    )
+    result = mcuvg.trianglesOverlap(np.repeat(base[None], len(others), 0), others, 1e-9)
+    assert result.tolist() == [True, True, False, False, False]
+
+
+def test_selfPenetratingMatchesBruteForce():
+    triangles = randomTriangles(200, 7)
+    faces = [[3 * i, 3 * i + 1, 3 * i + 2] for i in range(len(triangles))]
+    uvSet = makeUVSet(faces, triangles.reshape(-1, 2))
+    pairs = list(itertools.combinations(range(len(triangles)), 2))
+    first, second = np.array(pairs).T
+    hits = mcuvg.trianglesOverlap(triangles[first], triangles[second], 1e-9)
+    expected = np.unique(np.concatenate([first[hits], second[hits]]))
+    assert len(expected)
+    np.testing.assert_array_equal(mcuvg.selfPenetratingUVs(uvSet), expected)
+
+
+def test_rangeAndBorderMasks():
+    uvs = [[0.5, 0.5], [-0.1, 0.5], [10.5, 0.5], [0.5, -0.2], [1.0, 0.3], [0.3, 2.000001]]
+    uvSet = makeUVSet([[0, 1, 2], [3, 4, 5]], uvs)
+    assert mcuvg.uvRange(uvSet).tolist() == [1, 2, 3]
+    assert mcuvg.onBorder(uvSet).tolist() == [4, 5]
+
+
+def test_crossBorder():
+    uvs = [[0.1, 0.1], [0.9, 0.1], [0.5, 0.9], [0.9, 0.1], [1.2, 0.1], [1.1, 0.5]]
+    uvSet = makeUVSet([[0, 1, 2], [3, 4, 5], [4, 5, 4]], uvs)
+    assert mcuvg.crossBorder(uvSet).tolist() == [1]
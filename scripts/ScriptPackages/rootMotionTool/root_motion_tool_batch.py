@@ -0,0 +1,311 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   root_motion_tool_batch.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   根动画批处理，在 mayapy 中无界面运行
+
+每个场景在一个工作进程中打开、转换并另存到输出目录，同时为每个动画写一份
+JSON 报告（轨迹长度、最大速度、耗时等），所有动画的汇总写入 summary.json:
+
+    mayapy -m rootMotionTool.root_motion_tool_batch clips/ \\
+        --root root_ctrl --pelvis pelvis_ctrl --ik foot_L_ik,foot_R_ik \\
+        --axes tx,tz,ry --output converted --workers 8
+
+--smoothing、--forward-axis 和 --feet 对应 Inplace_to_RootMotion 的轨迹平滑、
+胯部朝向和脚着地检测。
+
+控制器名称不带命名空间，会在场景的所有命名空间中查找。
+任何动画转换失败时退出码为 1。
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from AnimUtils import anim_matrix
+from rootMotionTool import root_motion_tool_engine as engine
+
+SCENE_EXTENSIONS = (".ma", ".mb")
+# 转换模式
+MODES = ("root_motion", "inplace")
+# 胯部朝向轴
+FORWARD_AXES = ("x", "y", "z", "-x", "-y", "-z")
+
+
+def collect_scenes(patterns: list) -> list:
+    """把文件、文件夹和通配符展开为排序后的场景文件列表，"**" 会递归查找"""
+    scenes = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*")
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith(SCENE_EXTENSIONS):
+                scenes.add(os.path.abspath(path))
+    return sorted(scenes)
+
+
+def parse_axes(axes: str) -> list:
+    """把 "tx,tz,ry" 形式的通道列表转换为 tx, ty, tz, rx, ry, rz 掩码"""
+    tokens = {token.strip() for token in axes.split(",") if token.strip()}
+    unknown = tokens - set(anim_matrix.CHANNELS)
+    if unknown:
+        raise ValueError(f"Unknown axes: {sorted(unknown)}")
+    return [channel in tokens for channel in anim_matrix.CHANNELS]
+
+
+def output_names(scenes: list) -> dict:
+    """为每个场景生成不重复的输出文件名（不带扩展名）"""
+    names = {}
+    used = set()
+    for scene in scenes:
+        base = os.path.splitext(os.path.basename(scene))[0]
+        name, index = base, 1
+        while name in used:
+            index += 1
+            name = f"{base}_{index}"
+        used.add(name)
+        names[scene] = name
+    return names
+
+
+def _init_worker():
+    import maya.standalone
+
+    maya.standalone.initialize(name="python")
+
+
+def find_node(name: str) -> str:
+    """在场景的所有命名空间中查找唯一的变换节点
+
+    Raises:
+        ValueError: 找不到节点或找到多个节点.
+    """
+    import maya.cmds as cmds
+
+    nodes = cmds.ls(name, recursive=True, type="transform", long=True) or []
+    if not nodes:
+        raise ValueError(f"'{name}' does not exist in the scene.")
+    if len(nodes) > 1:
+        raise ValueError(f"'{name}' is ambiguous: {nodes}")
+    return nodes[0]
+
+
+def convert_scene(scene_path: str, output_path: str, spec: dict) -> dict:
+    """打开场景，转换动画并另存，在工作进程中运行
+
+    Args:
+        scene_path (str): 场景文件路径
+        output_path (str): 转换后场景的保存路径
+        spec (dict): 转换参数，见 main
+
+    Returns:
+        dict: 该动画的报告
+    """
+    import maya.cmds as cmds
+    import numpy as np
+    import pymel.core as pm
+
+    from rootMotionTool import root_motion_tool_logic as logic
+
+    report = {"file": scene_path, "output": None, "error": None}
+    start = time.time()
+    try:
+        cmds.file(scene_path, open=True, force=True, prompt=False)
+        report["open_seconds"] = time.time() - start
+        root = pm.PyNode(find_node(spec["root"]))
+        pelvis = pm.PyNode(find_node(spec["pelvis"]))
+        ik_ctrls = [pm.PyNode(find_node(name)) for name in spec["ik"]]
+        feet = [pm.PyNode(find_node(name)) for name in spec["feet"]]
+
+        convert_start = time.time()
+        if spec["mode"] == "root_motion":
+            logic.Inplace_to_RootMotion(
+                root,
+                pelvis,
+                *spec["mask"],
+                ik_ctrls,
+                smoothing=spec["smoothing"],
+                forward_axis=spec["forward_axis"],
+                foot_ctrl_list=feet,
+                foot_speed=spec["foot_speed"],
+            )
+        else:
+            logic.RootMotion_to_Inplace(root, pelvis, ik_ctrls)
+        report["convert_seconds"] = time.time() - convert_start
+
+        # 在转换结果上采样根骨骼轨迹
+        first = np.floor(pm.findKeyframe(pelvis, which="first"))
+        last = np.ceil(pm.findKeyframe(pelvis, which="last"))
+        frames = np.arange(first, last + 1, dtype=np.float64)
+        root_world = logic.sample_world_matrices([root], frames)[0][0]
+        report.update(engine.trajectory_stats(root_world, logic.scene_fps()))
+        report["frame_range"] = [float(first), float(last)]
+
+        cmds.file(rename=output_path)
+        file_type = "mayaAscii" if output_path.lower().endswith(".ma") else "mayaBinary"
+        cmds.file(save=True, force=True, type=file_type)
+        report["output"] = output_path
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["duration"] = time.time() - start
+    return report
+
+
+def write_json(data, path: str):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def run_batch(scenes: list, spec: dict, output_dir: str, workers=None) -> list:
+    """转换所有场景，每个工作进程一次处理一个场景
+
+    Args:
+        scenes (list): 场景文件路径
+        spec (dict): 转换参数，见 main
+        output_dir (str): 转换后场景和报告的输出目录
+        workers (int): 工作进程数量，0 时在当前进程中运行，默认为 CPU 核数
+
+    Returns:
+        list: 每个场景的报告，顺序与 scenes 相同
+    """
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    if workers is None:
+        workers = min(len(scenes), multiprocessing.cpu_count())
+
+    reports = {}
+    names = output_names(scenes)
+
+    def output_path(scene):
+        extension = os.path.splitext(scene)[1]
+        return os.path.join(output_dir, names[scene] + extension)
+
+    def finish(report):
+        reports[report["file"]] = report
+        write_json(report, os.path.join(output_dir, names[report["file"]] + ".json"))
+        if report["error"]:
+            print(f"[FAILED] {report['file']}: {report['error']}")
+        else:
+            print(
+                f"[OK] {report['file']} ({report['duration']:.1f}s, "
+                f"length {report['trajectory_length']:.1f}, "
+                f"max velocity {report['max_velocity']:.1f}/s)"
+            )
+
+    if workers <= 0:
+        _init_worker()
+        for scene in scenes:
+            finish(convert_scene(scene, output_path(scene), spec))
+    else:
+        # 每个工作进程拥有独立的 Maya 会话，使用 spawn 避免复制已初始化的会话
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker
+        ) as pool:
+            futures = {
+                pool.submit(convert_scene, scene, output_path(scene), spec): scene
+                for scene in scenes
+            }
+            for future in as_completed(futures):
+                try:
+                    finish(future.result())
+                except Exception as e:
+                    finish(
+                        {
+                            "file": futures[future],
+                            "output": None,
+                            "error": f"{type(e).__name__}: {e}",
+                            "duration": 0.0,
+                        }
+                    )
+    return [reports[scene] for scene in scenes]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="root_motion_tool_batch",
+        description="Convert animation scenes between in-place and root motion",
+    )
+    parser.add_argument("scenes", nargs="+", help="scene files, directories or globs")
+    parser.add_argument("--root", required=True, help="root control name")
+    parser.add_argument("--pelvis", required=True, help="pelvis control name")
+    parser.add_argument(
+        "--ik", default="", help="comma separated IK control names to keep in place"
+    )
+    parser.add_argument(
+        "--axes",
+        default="tx,tz,ry",
+        help="comma separated root motion channels (default: tx,tz,ry)",
+    )
+    parser.add_argument(
+        "--smoothing",
+        type=float,
+        default=0.0,
+        help="root trajectory smoothing in frames (default: 0, no smoothing)",
+    )
+    parser.add_argument(
+        "--forward-axis",
+        default=None,
+        choices=FORWARD_AXES,
+        help="pelvis axis pointing forward, like z or -x, drives the root heading",
+    )
+    parser.add_argument(
+        "--feet",
+        default="",
+        help="comma separated foot names, the root holds while all feet are planted",
+    )
+    parser.add_argument(
+        "--foot-speed",
+        type=float,
+        default=10.0,
+        help="speed below which a foot is planted, in scene length units "
+        "(the linear unit saved in the scene) per second (default: 10)",
+    )
+    parser.add_argument("--mode", choices=MODES, default="root_motion")
+    parser.add_argument("--output", default="root_motion_output")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes, 0 runs in this process (default: cpu count)",
+    )
+    args = parser.parse_args(argv)
+
+    scenes = collect_scenes(args.scenes)
+    if not scenes:
+        parser.error("No .ma/.mb files found")
+    try:
+        mask = parse_axes(args.axes)
+    except ValueError as e:
+        parser.error(str(e))
+    spec = {
+        "mode": args.mode,
+        "root": args.root,
+        "pelvis": args.pelvis,
+        "ik": [name.strip() for name in args.ik.split(",") if name.strip()],
+        "mask": mask,
+        "smoothing": args.smoothing,
+        "forward_axis": args.forward_axis,
+        "feet": [name.strip() for name in args.feet.split(",") if name.strip()],
+        "foot_speed": args.foot_speed,
+    }
+    start = time.time()
+    reports = run_batch(scenes, spec, args.output, args.workers)
+    write_json(reports, os.path.join(args.output, "summary.json"))
+    failed = [report for report in reports if report["error"]]
+    print(
+        f"{len(reports) - len(failed)}/{len(reports)} scenes converted "
+        f"in {time.time() - start:.1f}s"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
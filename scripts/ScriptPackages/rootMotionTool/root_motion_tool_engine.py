@@ -0,0 +1,208 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   root_motion_tool_engine.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   根动画转换的 numpy 计算内核，不依赖Maya。
+
+矩阵均为 Maya 的行向量约定 (world = local @ parentWorld)，形状为 (帧数, 4, 4)。
+矩阵和欧拉角的通用计算位于 AnimUtils.anim_matrix。
+"""
+
+import numpy as np
+
+from AnimUtils.anim_matrix import continuous_euler, inverse, row_scale
+
+# 根骨骼轨迹使用的旋转顺序 (zxy)，Y 轴最后作用，ry 即为世界空间朝向
+TRAJECTORY_ORDER = 2
+
+
+def root_trajectory(
+    root_world: np.ndarray,
+    pelvis_world: np.ndarray,
+    mask,
+) -> tuple:
+    """计算新的根骨骼世界空间轨迹
+
+    等同于根定位器以保持偏移的点约束和方向约束跟随胯部，
+    未启用的通道保持在第一帧的数值。
+
+    Args:
+        root_world (np.ndarray): 根控制器每帧的世界矩阵
+        pelvis_world (np.ndarray): 胯控制器每帧的世界矩阵
+        mask (list[bool]): tx, ty, tz, rx, ry, rz 是否转换为根动画
+
+    Returns:
+        tuple: (位移 (N, 3), 旋转 (N, 3) 弧度，TRAJECTORY_ORDER 旋转顺序)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    root_rotation = root_world[:, :3, :3] / row_scale(root_world)[:, :, None]
+    pelvis_rotation = pelvis_world[:, :3, :3] / row_scale(pelvis_world)[:, :, None]
+    # 点约束: 保持第一帧的世界位移偏移
+    offset = root_world[0, 3, :3] - pelvis_world[0, 3, :3]
+    translate = pelvis_world[:, 3, :3] + offset
+    # 方向约束: R_root = R_offset @ R_pelvis
+    # Y 轴最后作用的连续欧拉角，转身超过 90 度时 ry 也不会翻转
+    rotation_offset = root_rotation[0] @ pelvis_rotation[0].T
+    first_rotate = continuous_euler(root_rotation[:1], TRAJECTORY_ORDER)[0]
+    rotate = continuous_euler(
+        rotation_offset @ pelvis_rotation, TRAJECTORY_ORDER, first_rotate
+    )
+    # 未启用的通道保持第一帧的数值
+    translate[:, ~mask[:3]] = root_world[0, 3, :3][~mask[:3]]
+    rotate[:, ~mask[3:]] = first_rotate[~mask[3:]]
+    return translate, rotate
+
+def smooth(values: np.ndarray, sigma: float) -> np.ndarray:
+    """沿帧方向做高斯低通滤波，两端按首尾的趋势奇对称延长，保持首尾帧的数值
+
+    Args:
+        values (np.ndarray): 每帧的数值 (N,) 或 (N, C)
+        sigma (float): 高斯核的标准差，单位为帧，小于等于 0 时不滤波
+
+    Returns:
+        np.ndarray: 滤波后的数值
+    """
+    if sigma <= 0 or len(values) < 2:
+        return values.copy()
+    radius = int(np.ceil(3.0 * sigma))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+    kernel /= kernel.sum()
+    pad = [(radius, radius)] + [(0, 0)] * (values.ndim - 1)
+    padded = np.pad(values, pad, mode="reflect", reflect_type="odd")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, len(kernel), axis=0)
+    return windows @ kernel
+
+def hip_heading(pelvis_world: np.ndarray, forward_axis: str = "z") -> np.ndarray:
+    """由胯部的朝向轴估计每帧绕世界 Y 轴的朝向角度 (N,)，弧度
+
+    Args:
+        pelvis_world (np.ndarray): 胯控制器每帧的世界矩阵
+        forward_axis (str): 胯部指向角色前方的轴，"x"/"y"/"z"，可加 "-" 前缀
+
+    Returns:
+        np.ndarray: 连续（已消除跳变）的朝向角度，+Z 方向为 0
+    """
+    sign = -1.0 if forward_axis.startswith("-") else 1.0
+    forward = sign * pelvis_world[:, "xyz".index(forward_axis[-1]), :3]
+    # 投影到地面 (XZ 平面)，绕 Y 轴旋转 θ 会把 +Z 变为 (sinθ, 0, cosθ)
+    return np.unwrap(np.arctan2(forward[:, 0], forward[:, 2]))
+
+def foot_contacts(foot_world: list, fps: float, speed: float) -> np.ndarray:
+    """根据脚的速度检测每帧是否着地
+
+    Args:
+        foot_world (list): 每只脚每帧的世界矩阵
+        fps (float): 场景帧率
+        speed (float): 低于这个速度的脚视为着地，单位为 foot_world 的长度单位/秒
+
+    Returns:
+        np.ndarray: 着地状态 (脚数量, N)
+    """
+    contacts = []
+    for world in foot_world:
+        step = np.linalg.norm(np.diff(world[:, 3, :3], axis=0), axis=1) * fps
+        # 每帧速度取前后两段的较小值，第一帧和最后一帧沿用相邻段
+        velocity = np.minimum(np.r_[step[:1], step], np.r_[step, step[-1:]])
+        contacts.append(velocity < speed)
+    return np.array(contacts)
+
+def extract_trajectory(
+    root_world: np.ndarray,
+    pelvis_world: np.ndarray,
+    mask,
+    sigma: float = 0.0,
+    forward_axis: str = None,
+    foot_world: list = None,
+    fps: float = 30.0,
+    foot_speed: float = 10.0,
+) -> tuple:
+    """计算平滑的根骨骼世界空间轨迹
+
+    在 root_trajectory 的基础上:
+    1. forward_axis 不为 None 时，Y 轴旋转改为胯部朝向轴投影到地面的朝向，
+       不再跟随胯部的左右摆动，X/Z 轴旋转保持第一帧的数值.
+    2. 对启用的位移和旋转通道做高斯低通滤波.
+    3. 指定脚时，所有脚都着地的帧（原地站立、重心摆动）根骨骼不移动，
+       只在真正移动的帧累加位移.
+
+    Args:
+        root_world (np.ndarray): 根控制器每帧的世界矩阵
+        pelvis_world (np.ndarray): 胯控制器每帧的世界矩阵
+        mask (list[bool]): tx, ty, tz, rx, ry, rz 是否转换为根动画
+        sigma (float): 平滑强度，高斯核标准差，单位为帧
+        forward_axis (str): 胯部指向前方的轴，如 "z"、"-x"
+        foot_world (list): 每只脚每帧的世界矩阵
+        fps (float): 场景帧率
+        foot_speed (float): 脚着地的速度阈值，单位为 foot_world 的长度单位/秒
+
+    Returns:
+        tuple: (位移 (N, 3), 旋转 (N, 3) 弧度，TRAJECTORY_ORDER 旋转顺序)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    translate, rotate = root_trajectory(root_world, pelvis_world, mask)
+    if forward_axis is not None:
+        first_rotate = rotate[0].copy()
+        rotate[:] = first_rotate
+        if mask[4]:
+            heading = hip_heading(pelvis_world, forward_axis)
+            rotate[:, 1] = first_rotate[1] + heading - heading[0]
+    translate[:, mask[:3]] = smooth(translate[:, mask[:3]], sigma)
+    rotate[:, mask[3:]] = smooth(rotate[:, mask[3:]], sigma)
+    if foot_world:
+        planted = foot_contacts(foot_world, fps, foot_speed).all(axis=0)
+        # 两帧都处于站立状态时这一段不移动
+        moving = ~(planted[1:] & planted[:-1])
+        steps = np.diff(translate, axis=0) * moving[:, None]
+        translate = translate[0] + np.vstack([np.zeros(3), np.cumsum(steps, axis=0)])
+    return translate, rotate
+
+def compensate(
+    world: np.ndarray,
+    parent_world: np.ndarray,
+    root_world: np.ndarray,
+    new_root_world: np.ndarray,
+    under_root: bool,
+) -> np.ndarray:
+    """计算控制器在根骨骼改变后保持世界变换所需的局部矩阵
+
+    Args:
+        world (np.ndarray): 控制器原来每帧的世界矩阵
+        parent_world (np.ndarray): 控制器父对象原来每帧的世界矩阵
+        root_world (np.ndarray): 根控制器原来每帧的世界矩阵
+        new_root_world (np.ndarray): 根控制器新的世界矩阵
+        under_root (bool): 控制器是否位于根控制器层级之下
+
+    Returns:
+        np.ndarray: 控制器新的局部矩阵
+    """
+    if under_root:
+        # 父对象相对根骨骼的矩阵不变
+        parent_world = parent_world @ inverse(root_world) @ new_root_world
+    return world @ inverse(parent_world)
+
+def trajectory_stats(root_world: np.ndarray, fps: float) -> dict:
+    """根骨骼轨迹的统计数据，用于批处理报告
+
+    Args:
+        root_world (np.ndarray): 根骨骼每帧的世界矩阵
+        fps (float): 场景帧率
+
+    Returns:
+        dict: 轨迹长度、起止点位移、最大速度（长度单位/秒）和最大角速度（弧度/秒）
+    """
+    positions = root_world[:, 3, :3]
+    steps = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+    rotation = root_world[:, :3, :3] / row_scale(root_world)[:, :, None]
+    # 相邻两帧相对旋转的角度
+    relative = np.einsum("nij,nkj->nik", rotation[1:], rotation[:-1])
+    cos_angle = (np.trace(relative, axis1=1, axis2=2) - 1.0) / 2.0
+    angles = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+    return {
+        "frames": len(root_world),
+        "trajectory_length": float(steps.sum()),
+        "displacement": float(np.linalg.norm(positions[-1] - positions[0])),
+        "max_velocity": float(steps.max() * fps) if len(steps) else 0.0,
+        "max_angular_velocity": float(angles.max() * fps) if len(angles) else 0.0,
+    }
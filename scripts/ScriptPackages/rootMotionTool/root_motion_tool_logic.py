@@ -9,10 +9,22 @@
 """
 
 import math
+import numpy as np
 import pymel.core as pm
 import pymel.core.nodetypes as nt
 import pymel.core.datatypes as dt
 
+from AnimUtils import anim_matrix
+from AnimUtils.anim_utils import (
+    get_dag_path,
+    linear_factor,
+    node_channels,
+    sample_world_matrices,
+    scene_fps,
+    write_channel_keys,
+)
+from rootMotionTool import root_motion_tool_engine as engine
+
 
 def pin_ctrl_anim(ctrl_list=None) -> list:
     """钉住选定控制器使其父对象的变换不会影响到选定控制器
@@ -75,13 +87,31 @@ def Inplace_to_RootMotion(
     ry: bool = False,
     rz: bool = False,
     ik_ctrl_list=None,
+    smoothing: float = 0.0,
+    forward_axis: str = None,
+    foot_ctrl_list=None,
+    foot_speed: float = 10.0,
 ):
     """
     在maya中转换原地动画为根动画.
 
+    原理：
+    1. 在一次时间循环中采样根、胯和IK控制器每帧的世界矩阵.
+    2. 用numpy计算根骨骼新的轨迹（等同于保持偏移的点约束和方向约束）.
+    3. 计算根骨骼层级下的控制器保持世界变换所需的局部变换.
+    4. 一次性写入所有动画曲线，不创建定位器和约束，也不重复烘焙.
+
     Args:
-                    root_name (str): 根骨骼名称.
-                    pelvis_name (str): 胯骨骼名称
+                    root_ctrl (str): 根骨骼名称.
+                    pelvis_ctrl (str): 胯骨骼名称
+                    tx, ty, tz, rx, ry, rz (bool): 需要转换为根动画的通道
+                    ik_ctrl_list (list): 需要保持世界变换的IK控制器
+                    smoothing (float): 根骨骼轨迹的平滑强度，单位为帧，0 不平滑
+                    forward_axis (str): 胯部指向前方的轴，如 "z"、"-x"，
+                        指定时根骨骼的Y轴旋转使用胯部朝向，不跟随胯部摆动
+                    foot_ctrl_list (list): 脚的控制器或骨骼，指定时所有脚都着地的帧
+                        根骨骼不移动
+                    foot_speed (float): 脚着地的速度阈值，场景长度单位（如厘米、米）/秒
 
     Raises:
                     ValueError: 如果对象不存在.
@@ -95,89 +125,60 @@ def Inplace_to_RootMotion(
     # 获取动画时间范围
     first_frame = math.floor(pm.findKeyframe(pelvis_ctrl, which="first"))
     last_frame = math.ceil(pm.findKeyframe(pelvis_ctrl, which="last"))
-    pm.currentTime(first_frame)
-    with pm.UndoChunk():
-        # 创建定位器
-        loc_root = pm.spaceLocator(name="loc_root")
-        loc_pelvis = pm.spaceLocator(name="loc_pelvis")
+    frames = np.arange(first_frame, last_frame + 1, dtype=np.float64)
+    ctrl_list = [pelvis_ctrl] + list(ik_ctrl_list or [])
 
-        try:
-            # 控制器约束定位器
-            loc_root_constr = pm.parentConstraint(root_ctrl, loc_root)
-            loc_pelvis_constr = pm.parentConstraint(pelvis_ctrl, loc_pelvis)
-
-            # 烘焙定位器动画
-            pm.bakeResults(
-                loc_root,
-                loc_pelvis,
-                time=(first_frame, last_frame),
-                sparseAnimCurveBake=True,
-            )
-
-            # 删除约束节点
-            pm.delete(loc_root_constr, loc_pelvis_constr)
-            # 钉住pelvis控制器和IK控制器
-            loc_list = pin_ctrl_anim([pelvis_ctrl] + (ik_ctrl_list or []))
-
-            # 胯定位器分别用点约束和方向约束约束根定位器
-            loc_point_contr = pm.pointConstraint(
-                loc_pelvis, loc_root, maintainOffset=True
-            )
-            loc_orient_contr = pm.orientConstraint(
-                loc_pelvis, loc_root, maintainOffset=True
-            )
-
-            # 烘焙动画
-            pm.bakeResults(
-                loc_root,
-                time=(first_frame, last_frame),
-                sparseAnimCurveBake=True,
-                minimizeRotation=True,
-            )
-            # 删除约束节点
-            pm.delete(loc_point_contr, loc_orient_contr)
-
-            # 执行欧拉过滤器防止跳变
-            pm.filterCurve(loc_root, filter="euler")
-            # 根据根动画所需属性修改跟定位器动画
-            if not tx:
-                loc_root.translateX.disconnect()
-                pm.setKeyframe(loc_root.translateX)
-            if not ty:
-                loc_root.translateY.disconnect()
-                pm.setKeyframe(loc_root.translateY)
-            if not tz:
-                loc_root.translateZ.disconnect()
-                pm.setKeyframe(loc_root.translateZ)
-            if not rx:
-                loc_root.rotateX.disconnect()
-                pm.setKeyframe(loc_root.rotateX)
-            if not ry:
-                loc_root.rotateY.disconnect()
-                pm.setKeyframe(loc_root.rotateY)
-            if not rz:
-                loc_root.rotateZ.disconnect()
-                pm.setKeyframe(loc_root.rotateZ)
-
-            # 定位器约束骨骼
-            jnt_root_constr = pm.parentConstraint(loc_root, root_ctrl)
-
-            # 烘焙最终动画到骨骼
-            pm.bakeResults(
-                root_ctrl,
-                time=(first_frame, last_frame),
-                sparseAnimCurveBake=True,
-            )
-            # 删除约束节点
-            pm.delete(jnt_root_constr)
-            ctrl_list = [pelvis_ctrl] + (ik_ctrl_list or [])
-
-            bake_pined_anim(ctrl_list, loc_list, first_frame, last_frame)
-            # 执行欧拉过滤器
-            pm.filterCurve(root_ctrl, filter="euler")
-        finally:
-            # 清理定位器
-            pm.delete([obj for obj in [loc_root, loc_pelvis] if pm.objExists(obj)])
+    foot_ctrl_list = list(foot_ctrl_list or [])
+
+    # 一次采样所有控制器和脚的世界矩阵
+    world, parent = sample_world_matrices(
+        [root_ctrl] + ctrl_list + foot_ctrl_list, frames
+    )
+    root_world, root_parent = world[0], parent[0]
+    foot_world = world[len(ctrl_list) + 1 :]
+
+    # 计算根骨骼新的世界矩阵，保持原来的缩放
+    # 世界矩阵的位移为内部单位厘米，脚的速度阈值使用场景长度单位，
+    # 位移换算为场景单位后再检测着地
+    translate, rotate = engine.extract_trajectory(
+        root_world,
+        world[1],
+        [tx, ty, tz, rx, ry, rz],
+        sigma=smoothing,
+        forward_axis=forward_axis,
+        foot_world=[foot * linear_factor() for foot in foot_world],
+        fps=scene_fps(),
+        foot_speed=foot_speed,
+    )
+    new_root_world = anim_matrix.compose(
+        translate,
+        anim_matrix.euler_to_matrix(rotate, engine.TRAJECTORY_ORDER),
+        anim_matrix.row_scale(root_world),
+    )
+    root_local = new_root_world @ anim_matrix.inverse(root_parent)
+
+    # 只有根骨骼层级下的控制器需要补偿，位于其他补偿控制器之下的控制器
+    # 其父对象世界变换不变，局部变换也不需要修改
+    root_path = get_dag_path(root_ctrl).fullPathName() + "|"
+    ctrl_paths = [get_dag_path(ctrl).fullPathName() for ctrl in ctrl_list]
+    compensated = []
+    for i, ctrl in enumerate(ctrl_list, start=1):
+        path = ctrl_paths[i - 1]
+        if not path.startswith(root_path):
+            continue
+        if any(path.startswith(other + "|") for other in ctrl_paths):
+            continue
+        local = engine.compensate(
+            world[i], parent[i], root_world, new_root_world, True
+        )
+        compensated.append((ctrl, local))
+
+    with pm.UndoChunk():
+        write_channel_keys(
+            root_ctrl, node_channels(root_ctrl, root_local, frames[0]), frames
+        )
+        for ctrl, local in compensated:
+            write_channel_keys(ctrl, node_channels(ctrl, local, frames[0]), frames)
 
 
 def RootMotion_to_Inplace(
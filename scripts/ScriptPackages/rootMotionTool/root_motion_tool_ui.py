@@ -64,6 +64,27 @@ class RootMotionTool(QtWidgets.QDialog):
         self.rz_label = QtWidgets.QLabel("Rotate Z: ")
         self.rz_checkBox = QtWidgets.QCheckBox()
 
+        self.smoothing_label = QtWidgets.QLabel("Smoothing (frames): ")
+        self.smoothing_spinBox = QtWidgets.QDoubleSpinBox()
+        self.smoothing_spinBox.setRange(0.0, 30.0)
+        self.smoothing_spinBox.setSingleStep(0.5)
+        self.heading_label = QtWidgets.QLabel("Heading: ")
+        self.heading_comboBox = QtWidgets.QComboBox()
+        # 第一项使用胯部的方向约束，其他项为胯部指向前方的轴
+        self.heading_comboBox.addItems(
+            ["Pelvis Orient", "x", "y", "z", "-x", "-y", "-z"]
+        )
+        self.foot_ctrls_label = QtWidgets.QLabel("Foot Ctrls: ")
+        self.foot_ctrls_btn = QtWidgets.QPushButton("Load Foot Ctrls")
+        self.foot_ctrls_list = QtWidgets.QListWidget()
+        self.foot_speed_label = QtWidgets.QLabel("Planted Speed: ")
+        self.foot_speed_spinBox = QtWidgets.QDoubleSpinBox()
+        self.foot_speed_spinBox.setRange(0.0, 1000.0)
+        self.foot_speed_spinBox.setValue(10.0)
+        self.foot_speed_spinBox.setToolTip(
+            "Speed below which a foot is planted, in scene length units per second"
+        )
+
         self.inplace_to_rootmotion_btn = QtWidgets.QPushButton("Inplace To Rootmotion")
         self.rootmotion_to_inplace_btn = QtWidgets.QPushButton("Rootmotion To Inplace")
 
@@ -106,11 +127,32 @@ class RootMotionTool(QtWidgets.QDialog):
         axis_grp = QtWidgets.QGroupBox("Root Motion Axis")
         axis_grp.setLayout(axis_layout)
 
+        smoothing_layout = QtWidgets.QHBoxLayout()
+        smoothing_layout.addWidget(self.smoothing_label)
+        smoothing_layout.addWidget(self.smoothing_spinBox)
+        smoothing_layout.addWidget(self.heading_label)
+        smoothing_layout.addWidget(self.heading_comboBox)
+
+        foot_speed_layout = QtWidgets.QHBoxLayout()
+        foot_speed_layout.addWidget(self.foot_speed_label)
+        foot_speed_layout.addWidget(self.foot_speed_spinBox)
+
+        trajectory_layout = QtWidgets.QVBoxLayout()
+        trajectory_layout.addLayout(smoothing_layout)
+        trajectory_layout.addWidget(self.foot_ctrls_label)
+        trajectory_layout.addWidget(self.foot_ctrls_list)
+        trajectory_layout.addWidget(self.foot_ctrls_btn)
+        trajectory_layout.addLayout(foot_speed_layout)
+
+        trajectory_grp = QtWidgets.QGroupBox("Root Trajectory")
+        trajectory_grp.setLayout(trajectory_layout)
+
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.addLayout(root_obj_layout)
         main_layout.addLayout(pelvis_obj_layout)
         main_layout.addLayout(ik_ctrls_layout)
         main_layout.addWidget(axis_grp)
+        main_layout.addWidget(trajectory_grp)
         main_layout.addWidget(self.inplace_to_rootmotion_btn)
         main_layout.addWidget(self.rootmotion_to_inplace_btn)
 
@@ -118,6 +160,7 @@ class RootMotionTool(QtWidgets.QDialog):
         self.root_obj_btn.clicked.connect(self.on_root_obj_btn)
         self.pelvis_obj_btn.clicked.connect(self.on_pelvis_obj_btn)
         self.ik_ctrls_btn.clicked.connect(self.on_ik_ctrls_list)
+        self.foot_ctrls_btn.clicked.connect(self.on_foot_ctrls_list)
         self.inplace_to_rootmotion_btn.clicked.connect(
             self.on_inplace_to_rootmotion_btn
         )
@@ -150,6 +193,15 @@ class RootMotionTool(QtWidgets.QDialog):
         obj_name_List = [obj.name() for obj in select_obj]
         self.ik_ctrls_list.addItems(obj_name_List)
 
+    @QtCore.Slot()
+    def on_foot_ctrls_list(self):
+        self.foot_ctrls_list.clear()
+        select_obj = pm.selected()
+        if not select_obj:
+            pm.warning("Please select foot ctrls")
+        obj_name_List = [obj.name() for obj in select_obj]
+        self.foot_ctrls_list.addItems(obj_name_List)
+
     @QtCore.Slot()
     def on_inplace_to_rootmotion_btn(self):
         root_ctrl = nt.Transform(self.root_obj_line.text())
@@ -165,8 +217,28 @@ class RootMotionTool(QtWidgets.QDialog):
             for i in range(self.ik_ctrls_list.count())
             if self.ik_ctrls_list.item(i) is not None
         ]
+        foot_ctrl_list = [
+            pm.PyNode(self.foot_ctrls_list.item(i).text())
+            for i in range(self.foot_ctrls_list.count())
+            if self.foot_ctrls_list.item(i) is not None
+        ]
+        forward_axis = None
+        if self.heading_comboBox.currentIndex() > 0:
+            forward_axis = self.heading_comboBox.currentText()
         Inplace_to_RootMotion(
-            root_ctrl, pelvis_ctrl, tx, ty, tz, rx, ry, rz, ik_ctrl_list
+            root_ctrl,
+            pelvis_ctrl,
+            tx,
+            ty,
+            tz,
+            rx,
+            ry,
+            rz,
+            ik_ctrl_list,
+            smoothing=self.smoothing_spinBox.value(),
+            forward_axis=forward_axis,
+            foot_ctrl_list=foot_ctrl_list,
+            foot_speed=self.foot_speed_spinBox.value(),
         )
 
     @QtCore.Slot()
@@ -0,0 +1,124 @@
+# -*- encoding: utf-8 -*-
+
+"""
+@File    :   test_root_motion_tool_engine.py
+@Author  :   Charles Tian
+@Contact :   tianchao0533@gmail.com
+@Desc    :   根动画计算内核的测试，不依赖Maya。
+"""
+
+import numpy as np
+import pytest
+
+from AnimUtils import anim_matrix
+from rootMotionTool import root_motion_tool_engine as engine
+
+
+def yaw_turn(frames: int, end_angle: float) -> np.ndarray:
+    """绕世界 Y 轴从 0 转到 end_angle 的胯部矩阵"""
+    angles = np.zeros((frames, 3))
+    angles[:, 1] = np.linspace(0.0, end_angle, frames)
+    positions = np.column_stack(
+        [np.zeros(frames), np.full(frames, 90.0), np.linspace(0, 50, frames)]
+    )
+    return anim_matrix.compose(positions, anim_matrix.euler_to_matrix(angles))
+
+
+def assert_continuous(angles: np.ndarray, limit: float = 0.2):
+    assert np.abs(np.diff(angles, axis=0)).max() < limit
+
+
+def test_root_trajectory_heading_turns_180():
+    frames = 91
+    pelvis = yaw_turn(frames, np.pi)
+    root = anim_matrix.compose(np.zeros((frames, 3)), np.repeat(np.eye(3)[None], frames, 0))
+    translate, rotate = engine.root_trajectory(
+        root, pelvis, [True, False, True, False, True, False]
+    )
+    np.testing.assert_allclose(rotate[:, 1], np.linspace(0.0, np.pi, frames), atol=1e-9)
+    np.testing.assert_allclose(rotate[:, [0, 2]], 0.0, atol=1e-9)
+    np.testing.assert_allclose(translate[:, 1], 0.0)
+
+
+def test_root_trajectory_full_mask_follows_pelvis():
+    frames = 121
+    pelvis = yaw_turn(frames, 1.5 * np.pi)
+    # 加上前后倾斜，旋转不只绕 Y 轴
+    tilt = np.zeros((frames, 3))
+    tilt[:, 0] = 0.3 * np.sin(np.linspace(0, 6, frames))
+    pelvis[:, :3, :3] = anim_matrix.euler_to_matrix(tilt) @ pelvis[:, :3, :3]
+    root = anim_matrix.compose(np.zeros((frames, 3)), np.repeat(np.eye(3)[None], frames, 0))
+    translate, rotate = engine.root_trajectory(root, pelvis, [True] * 6)
+    assert_continuous(rotate)
+    new_root = anim_matrix.euler_to_matrix(rotate, engine.TRAJECTORY_ORDER)
+    # 第一帧的偏移为单位矩阵，根骨骼旋转与胯部一致
+    np.testing.assert_allclose(new_root, pelvis[:, :3, :3], atol=1e-9)
+    np.testing.assert_allclose(translate, pelvis[:, 3, :3] - pelvis[0, 3, :3])
+
+
+def test_compensate_keeps_world():
+    frames = 30
+    pelvis = yaw_turn(frames, 2.0)
+    root = anim_matrix.compose(np.zeros((frames, 3)), np.repeat(np.eye(3)[None], frames, 0))
+    translate, rotate = engine.root_trajectory(root, pelvis, [True, False, True, False, True, False])
+    new_root = anim_matrix.compose(translate, anim_matrix.euler_to_matrix(rotate, engine.TRAJECTORY_ORDER))
+    local = engine.compensate(pelvis, root, root, new_root, True)
+    np.testing.assert_allclose(local @ new_root, pelvis, atol=1e-9)
+
+
+def test_smooth_keeps_ends_and_lines():
+    values = np.column_stack([np.linspace(0, 10, 40), np.linspace(5, -5, 40)])
+    np.testing.assert_allclose(engine.smooth(values, 3.0), values, atol=1e-9)
+    noisy = values + np.random.default_rng(0).normal(0, 0.5, values.shape)
+    result = engine.smooth(noisy, 2.0)
+    np.testing.assert_allclose(result[[0, -1]], noisy[[0, -1]], atol=1e-9)
+    assert np.abs(np.diff(result, 2, axis=0)).max() < np.abs(np.diff(noisy, 2, axis=0)).max()
+
+
+def test_foot_contacts_speed_units():
+    # 每帧 0.05 单位，30 帧/秒时为 1.5 单位/秒
+    foot = anim_matrix.compose(
+        np.column_stack([np.r_[np.zeros(10), np.arange(1, 11) * 0.05], np.zeros((20, 2))]),
+        np.repeat(np.eye(3)[None], 20, 0),
+    )
+    contacts = engine.foot_contacts([foot], 30.0, 1.0)[0]
+    assert contacts[:10].all() and not contacts[10:].any()
+    assert engine.foot_contacts([foot], 30.0, 2.0).all()
+
+
+def test_extract_trajectory_heading_and_smoothing_past_90():
+    frames = 121
+    pelvis = yaw_turn(frames, 1.5 * np.pi)
+    # 胯部左右摆动
+    sway = np.zeros((frames, 3))
+    sway[:, 1] = 0.2 * np.sin(np.linspace(0, 12, frames))
+    pelvis[:, :3, :3] = anim_matrix.euler_to_matrix(sway) @ pelvis[:, :3, :3]
+    root = anim_matrix.compose(np.zeros((frames, 3)), np.repeat(np.eye(3)[None], frames, 0))
+    mask = [True, False, True, False, True, False]
+
+    _, rotate = engine.extract_trajectory(root, pelvis, mask, sigma=3.0)
+    assert_continuous(rotate)
+    assert rotate[-1, 1] == pytest.approx(1.5 * np.pi + sway[-1, 1])
+
+    _, rotate = engine.extract_trajectory(root, pelvis, mask, forward_axis="z")
+    np.testing.assert_allclose(
+        rotate[:, 1], np.linspace(0.0, 1.5 * np.pi, frames) + sway[:, 1], atol=1e-9
+    )
+    np.testing.assert_allclose(rotate[:, [0, 2]], 0.0, atol=1e-9)
+
+
+def test_extract_trajectory_holds_while_feet_planted():
+    frames = 40
+    positions = np.zeros((frames, 3))
+    positions[:, 0] = np.where(np.arange(frames) < 20, 0.0, np.arange(frames) - 19.0)
+    positions[:20, 2] = 0.3 * np.sin(np.arange(20))  # 站立时重心摆动
+    pelvis = anim_matrix.compose(positions, np.repeat(np.eye(3)[None], frames, 0))
+    root = anim_matrix.compose(np.zeros((frames, 3)), np.repeat(np.eye(3)[None], frames, 0))
+    foot = pelvis.copy()
+    foot[:20, 3, :3] = 0.0
+    translate, _ = engine.extract_trajectory(
+        root, pelvis, [True, False, True, False, True, False],
+        foot_world=[foot], fps=30.0, foot_speed=5.0,
+    )
+    np.testing.assert_allclose(translate[:20], 0.0, atol=1e-9)
+    assert (np.diff(translate[20:, 0]) > 0).all()
@@ -8,10 +8,28 @@
 @Desc    :   使用矩阵节点实现空间切换，性能更好，不能直接应用于骨骼，可能导致引擎内动画无效。
 """
 
+import numpy as np
+from maya.api import OpenMaya as om
+import maya.cmds as cmds
 import pymel.core as pm
 import pymel.core.nodetypes as nt
 import pymel.core.datatypes as dt
 
+from AnimUtils import anim_matrix
+from AnimUtils.anim_utils import (
+    angle_factor,
+    linear_factor,
+    node_channels,
+    sample_matrix_plugs,
+    scene_fps,
+    write_channel_keys,
+)
+
+# 缩放通道名称，与 anim_matrix.row_scale 的列一一对应
+SCALE_CHANNELS = ("sx", "sy", "sz")
+# 空间切换需要写入的变换通道
+TRANSFORM_CHANNELS = anim_matrix.CHANNELS + SCALE_CHANNELS
+
 
 def addSpaceSwitching(
     target_node: nt.Transform,
@@ -149,6 +167,195 @@ def seamless_space_switch(
             return
 
 
+def get_plug(plug_name: str) -> om.MPlug:
+    """由属性名称获取 MPlug"""
+    selection = om.MSelectionList()
+    selection.add(plug_name)
+    return selection.getPlug(0)
+
+
+def space_matrix_plug(target_node, space_index: int) -> str:
+    """获取目标节点某个空间的偏移父矩阵来源属性
+
+    即 addSpaceSwitching 创建的 multMatrix 节点的 matrixSum，
+    切换到该空间后 offsetParentMatrix 等于它的数值。
+
+    Raises:
+        ValueError: 目标节点没有使用矩阵空间切换，或空间不存在.
+    """
+    blend_nodes = cmds.listConnections(
+        f"{target_node}.offsetParentMatrix",
+        source=True,
+        destination=False,
+        type="blendMatrix",
+    )
+    if not blend_nodes:
+        raise ValueError(f"'{target_node}' has no blendMatrix space switch.")
+    sources = cmds.listConnections(
+        f"{blend_nodes[0]}.target[{space_index}].targetMatrix",
+        source=True,
+        destination=False,
+        plugs=True,
+    )
+    if not sources:
+        raise ValueError(f"'{target_node}' has no space with index {space_index}.")
+    return sources[0]
+
+
+def merge_ranges(ranges: list) -> list:
+    """合并重叠或相邻的帧范围，返回排序后的 [(start, end), ...]"""
+    merged = []
+    for start, end in sorted((min(r), max(r)) for r in ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def range_key_times(target_node, switch_attribute: str, start, end, sparse: bool):
+    """一个帧范围内需要写入关键帧的时间
+
+    稀疏模式使用变换通道和切换属性已有关键帧的时间，并加上范围的首尾帧，
+    密集模式使用范围内的每一帧。
+    """
+    if not sparse:
+        return np.arange(start, end + 1, dtype=np.float64)
+    attrs = [f"{target_node}.{channel}" for channel in TRANSFORM_CHANNELS]
+    attrs.append(f"{target_node}.{switch_attribute}")
+    times = cmds.keyframe(attrs, query=True, time=(start, end), timeChange=True)
+    return np.unique(np.r_[float(start), float(end), times or []])
+
+
+def hold_keys(target_node, switch_attribute: str, times: list):
+    """在范围外侧插入关键帧，保持范围外的动画不变
+
+    已有动画曲线时插入的关键帧不改变曲线形状。
+    """
+    for channel in TRANSFORM_CHANNELS + (switch_attribute,):
+        attr = f"{target_node}.{channel}"
+        if not cmds.getAttr(attr, settable=True):
+            continue
+        animated = cmds.keyframe(attr, query=True, keyframeCount=True)
+        for time in times:
+            cmds.setKeyframe(attr, time=(time, time), insert=bool(animated))
+
+
+def refit_tangents(target_node, channels: dict, frames, key_times):
+    """按密集采样的曲线斜率设置稀疏关键帧的切线，保持曲线形状
+
+    切线角度按 Maya 的约定使用秒和内部单位（厘米、弧度）计算。
+
+    Args:
+        target_node: 控制器
+        channels (dict): 通道名称 -> 范围内每个采样帧的数值（界面单位）
+        frames (np.ndarray): 采样帧
+        key_times (np.ndarray): 关键帧时间
+    """
+    fps = scene_fps()
+    units = {"t": linear_factor(), "r": angle_factor(), "s": 1.0}
+    for channel, values in channels.items():
+        attr = f"{target_node}.{channel}"
+        if len(frames) < 2 or not cmds.getAttr(attr, settable=True):
+            continue
+        slopes = np.interp(key_times, frames, np.gradient(values, frames))
+        angles = np.degrees(np.arctan(slopes * fps / units[channel[0]]))
+        for time, angle in zip(key_times, angles):
+            cmds.keyTangent(
+                attr,
+                time=(time, time),
+                inTangentType="fixed",
+                outTangentType="fixed",
+                inAngle=angle,
+                outAngle=angle,
+            )
+
+
+def switch_spaces(switch_list: list, sparse: bool = True):
+    """同时为多个控制器在多个帧范围内执行无缝空间切换
+
+    原理：
+    1. 确定每个控制器每个范围需要写入关键帧的时间，稀疏模式保留动画师原有的
+       关键帧间距，密集模式每帧一个关键帧.
+    2. 用 MDGContext 在一次时间循环中采样所有需要的帧（稀疏模式也会采样范围内
+       的每一帧用于拟合切线），不移动时间线.
+    3. 由 world = local * offsetParent * parent 直接解出新空间下的局部矩阵，
+       分解为 TRS 通道并写入动画曲线，稀疏模式再按采样的斜率重设切线.
+    4. 在每个范围的前一帧和后一帧插入关键帧，范围外的动画和空间保持不变.
+
+    所有修改在一个撤销块中。假设 UseTranslate/UseRotate/UseScale 均为 1（默认值）。
+
+    Args:
+        switch_list (list): [(target_node, switch_attribute, new_space_index,
+            [(start_frame, end_frame), ...]), ...]
+        sparse (bool): 只在已有关键帧的时间写入关键帧
+    """
+    jobs = []
+    sampled = set()
+    plugs = []
+    for target_node, switch_attribute, new_space_index, ranges in switch_list:
+        ranges = merge_ranges(ranges)
+        key_times = [
+            range_key_times(target_node, switch_attribute, start, end, sparse)
+            for start, end in ranges
+        ]
+        for (start, end), times in zip(ranges, key_times):
+            sampled.update(times.tolist())
+            sampled.update(range(int(np.ceil(start)), int(np.floor(end)) + 1))
+        plugs.append(get_plug(f"{target_node}.worldMatrix[0]"))
+        plugs.append(get_plug(f"{target_node}.parentMatrix[0]"))
+        plugs.append(get_plug(space_matrix_plug(target_node, new_space_index)))
+        jobs.append((target_node, switch_attribute, new_space_index, ranges, key_times))
+
+    # 一次时间循环采样所有控制器在所有范围内的矩阵
+    frames = np.array(sorted(sampled), dtype=np.float64)
+    samples = sample_matrix_plugs(plugs, frames)
+
+    with pm.UndoChunk():
+        # 先插入范围外侧的关键帧，此时曲线还未被修改
+        for target_node, switch_attribute, _, ranges, _ in jobs:
+            outside = [start - 1 for start, _ in ranges]
+            outside += [end + 1 for _, end in ranges]
+            hold_keys(target_node, switch_attribute, outside)
+
+        for i, job in enumerate(jobs):
+            target_node, switch_attribute, new_space_index, ranges, key_times = job
+            world, parent, space = samples[3 * i : 3 * i + 3]
+            local = world @ anim_matrix.inverse(space @ parent)
+            channels = node_channels(target_node, local, frames[0])
+            channels.update(zip(SCALE_CHANNELS, anim_matrix.row_scale(local).T))
+            for (start, end), times in zip(ranges, key_times):
+                inside = (frames >= start) & (frames <= end)
+                index = np.searchsorted(frames, times)
+                keys = {name: values[index] for name, values in channels.items()}
+                keys[switch_attribute] = np.full(len(times), float(new_space_index))
+                write_channel_keys(target_node, keys, times)
+                if sparse:
+                    refit_tangents(
+                        target_node,
+                        {name: values[inside] for name, values in channels.items()},
+                        frames[inside],
+                        times,
+                    )
+
+
+def bake_spaces(switch_list: list, start_frame: int, end_frame: int):
+    """在指定帧范围内同时烘焙多个控制器的空间切换，每帧一个关键帧
+
+    Args:
+        switch_list (list): [(target_node, switch_attribute, new_space_index), ...]
+        start_frame (int): 开始帧
+        end_frame (int): 结束帧
+    """
+    switch_spaces(
+        [
+            (target_node, switch_attribute, new_space_index, [(start_frame, end_frame)])
+            for target_node, switch_attribute, new_space_index in switch_list
+        ],
+        sparse=False,
+    )
+
+
 def bake_space(
     target_node: nt.Transform,
     switch_attribute: str,
@@ -164,29 +371,11 @@ def bake_space(
         start_frame (int): 开始帧
         end_frame (int): 结束帧
     """
-    # 采集每一帧的世界矩阵
-    world_matrix_list: list[dt.Matrix] = []
-    for frame in range(start_frame, end_frame + 1):
-        pm.currentTime(frame)
-        world_matrix = target_node.getMatrix(worldSpace=True)
-        world_matrix_list.append(world_matrix)
-    # 切换空间并应用采集到的矩阵
-    with pm.UndoChunk():
-        for i in range(start_frame, end_frame + 1):
-            pm.currentTime(i)
-            try:
-                # 切换空间
-                target_node.attr(switch_attribute).set(new_space_index)
-                # 获取矩阵列表索引
-                matrix_index = i - start_frame
-                # 设置世界矩阵
-                target_node.setMatrix(world_matrix_list[matrix_index], worldSpace=True)
-                # 为变换和切换属性设置关键帧
-                pm.setKeyframe(target_node, attribute="translate")
-                pm.setKeyframe(target_node, attribute="rotate")
-                pm.setKeyframe(target_node, attribute="scale")
-                pm.setKeyframe(target_node, attribute=switch_attribute)
-            except Exception as e:
-                pm.warning(
-                    f"无法设置属性 '{switch_attribute}' 为 {new_space_index}。错误: {e}"
-                )
+    try:
+        bake_spaces(
+            [(target_node, switch_attribute, new_space_index)], start_frame, end_frame
+        )
+    except Exception as e:
+        pm.warning(
+            f"无法设置属性 '{switch_attribute}' 为 {new_space_index}。错误: {e}"
+        )
@@ -13,7 +13,7 @@ import pymel.core as pm
 from spaceSwitchTool.space_switch_tool_matrix import (
     addSpaceSwitching,
     seamless_space_switch,
-    bake_space,
+    switch_spaces,
 )
 
 
@@ -233,6 +233,10 @@ class SwitchSpases(QtWidgets.QWidget):
         self.end_frame_spin.setMinimum(-10000)
         self.end_frame_spin.setMaximum(10000)
         self.end_frame_spin.setSingleStep(1)
+        self.sparse_keys_checkBox = QtWidgets.QCheckBox("Sparse Keys")
+        self.sparse_keys_checkBox.setToolTip(
+            "Only key the existing key times instead of every frame"
+        )
         self.bake_space_btn = QtWidgets.QPushButton("Bake_Space")
         self.bake_space_btn.setStyleSheet("background-color: darkgray;")
 
@@ -270,6 +274,7 @@ class SwitchSpases(QtWidgets.QWidget):
         frame_layout.addWidget(self.end_frame_spin)
         bake_layout = QtWidgets.QVBoxLayout()
         bake_layout.addLayout(frame_layout)
+        bake_layout.addWidget(self.sparse_keys_checkBox)
         bake_layout.addWidget(self.bake_space_btn)
         bake_grp = QtWidgets.QGroupBox("Bake")
         bake_grp.setLayout(bake_layout)
@@ -331,9 +336,14 @@ class SwitchSpases(QtWidgets.QWidget):
         start_frame = self.start_frame_spin.value()
         end_frame = self.end_frame_spin.value()
 
-        bake_space(
-            target_node, switch_attribute, new_space_index, start_frame, end_frame
-        )
+        try:
+            frame_range = (start_frame, end_frame)
+            switch_spaces(
+                [(target_node, switch_attribute, new_space_index, [frame_range])],
+                sparse=self.sparse_keys_checkBox.isChecked(),
+            )
+        except Exception as e:
+            pm.warning(e)
 
 
 class SpaceSwitchingTool(QtWidgets.QDialog):